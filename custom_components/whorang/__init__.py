@@ -1,20 +1,25 @@
 """The WhoRang AI Doorbell integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.const import ATTR_AREA_ID, ATTR_DEVICE_ID, CONF_HOST, CONF_PORT, Platform
+from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.components.http import StaticPathConfig
 
 from .api_client import WhoRangAPIClient, WhoRangConnectionError
 from .const import (
     DOMAIN,
+    ATTR_CONFIG_ENTRY_ID,
     CONF_API_KEY,
     CONF_UPDATE_INTERVAL,
     CONF_ENABLE_WEBSOCKET,
@@ -41,11 +46,22 @@ from .const import (
     SERVICE_GET_UNKNOWN_FACES,
     SERVICE_DELETE_FACE,
     SERVICE_GET_FACE_SIMILARITIES,
+    SERVICE_CLUSTER_UNKNOWN_FACES,
+    SERVICE_BULK_FACE_OPERATION,
+    SERVICE_PROFILE,
+    DATA_PROFILE_SESSION,
+    EVENT_FACE_CLUSTERS_UPDATED,
+    EVENT_MERGE_PROGRESS,
+    STORAGE_VERSION,
+    STORAGE_KEY_MERGE_CHECKPOINTS,
     EVENT_FACE_LABELED,
     EVENT_PERSON_CREATED,
     EVENT_UNKNOWN_FACE_DETECTED,
 )
 from .coordinator import WhoRangDataUpdateCoordinator
+from .bulk_operations import BulkOperationRunner
+from .face_clustering import cluster_faces
+from .profiler import async_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -114,21 +130,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Test connection
     try:
-        if not await api_client.validate_connection():
-            raise ConfigEntryNotReady("Unable to connect to WhoRang system")
+        connected = await api_client.validate_connection()
     except WhoRangConnectionError as err:
+        await api_client.close()
         raise ConfigEntryNotReady(f"Error connecting to WhoRang: {err}") from err
+    if not connected:
+        await api_client.close()
+        raise ConfigEntryNotReady("Unable to connect to WhoRang system")
 
-    # Create coordinator
+    # Create coordinator, it hands the client to the backend hub, which
+    # closes it when another entry already uses the same backend
     coordinator = WhoRangDataUpdateCoordinator(
         hass,
         api_client,
         update_interval=update_interval,
         enable_websocket=enable_websocket,
+        config_entry=entry,
     )
+    api_client = coordinator.api_client
 
     # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_restore_statistics()
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Release the hub, a retry creates a new coordinator
+        await coordinator.async_shutdown()
+        raise
 
     # Set up coordinator
     await coordinator.async_setup()
@@ -188,6 +216,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         
         # Remove from hass data
         hass.data[DOMAIN].pop(entry.entry_id)
+        
+        # Services are shared by all entries, remove them with the last one
+        if not any(
+            isinstance(other, WhoRangDataUpdateCoordinator) for other in hass.data[DOMAIN].values()
+        ):
+            for service in list(hass.services.async_services().get(DOMAIN, {})):
+                hass.services.async_remove(DOMAIN, service)
 
     return unload_ok
 
@@ -199,6 +234,8 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     # Get the coordinator for this entry
     coordinator = hass.data[DOMAIN].get(entry.entry_id)
     if coordinator and isinstance(coordinator, WhoRangDataUpdateCoordinator):
+        coordinator.async_invalidate_options()
+        
         # Update coordinator settings based on new options
         update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
         enable_websocket = entry.options.get(CONF_ENABLE_WEBSOCKET, True)
@@ -222,8 +259,44 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
         await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _resolve_target_coordinators(
+    hass: HomeAssistant, data: Dict[str, Any]
+) -> Dict[str, WhoRangDataUpdateCoordinator]:
+    """Return the coordinators targeted by entry, device or area, all if untargeted."""
+    coordinators = {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+        if isinstance(coordinator, WhoRangDataUpdateCoordinator)
+    }
+    entry_ids = set(data.get(ATTR_CONFIG_ENTRY_ID) or [])
+    device_ids = data.get(ATTR_DEVICE_ID) or []
+    area_ids = set(data.get(ATTR_AREA_ID) or [])
+    if not (entry_ids or device_ids or area_ids):
+        return coordinators
+
+    device_registry = dr.async_get(hass)
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        if device:
+            entry_ids.update(device.config_entries)
+    if area_ids:
+        for entry_id in coordinators:
+            for device in dr.async_entries_for_config_entry(device_registry, entry_id):
+                if device.area_id in area_ids:
+                    entry_ids.add(entry_id)
+
+    return {
+        entry_id: coordinator
+        for entry_id, coordinator in coordinators.items()
+        if entry_id in entry_ids
+    }
+
+
 async def _async_register_services(hass: HomeAssistant) -> None:
     """Register integration services."""
+    # Services act on every loaded entry, they are registered with the first
+    if hass.services.has_service(DOMAIN, SERVICE_PROCESS_DOORBELL_EVENT):
+        return
     
     async def trigger_analysis_service(call) -> None:
         """Handle trigger analysis service call."""
@@ -420,8 +493,12 @@ async def _async_register_services(hass: HomeAssistant) -> None:
             except Exception as err:
                 _LOGGER.error("Failed to test Ollama connection: %s", err)
 
-    async def process_doorbell_event_service(call) -> None:
-        """Handle process doorbell event service call with intelligent automation settings."""
+    async def process_doorbell_event_service(call) -> Dict[str, Any]:
+        """Handle process doorbell event service call with intelligent automation settings.
+
+        The event goes to the targeted entries only (all if no target is
+        given), processed concurrently, and per-entry results are returned.
+        """
         _LOGGER.info("=== DOORBELL EVENT SERVICE CALLED ===")
         _LOGGER.info("Service call data: %s", call.data)
         
@@ -438,53 +515,31 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         
         if not image_url:
             _LOGGER.error("Image URL is required for processing doorbell event")
-            return
-            
-        # Get coordinators from hass data
-        coordinators_data = hass.data.get(DOMAIN, {})
-        if not coordinators_data:
-            _LOGGER.error("No WhoRang coordinators found in hass data")
-            return
+            return {"results": {}}
         
-        coordinators = [
-            coordinator for coordinator in coordinators_data.values()
-            if isinstance(coordinator, WhoRangDataUpdateCoordinator)
-        ]
+        targets = _resolve_target_coordinators(hass, call.data)
+        if not targets:
+            _LOGGER.error("No WhoRang config entries match the service call target")
+            return {"results": {}}
         
-        if not coordinators:
-            _LOGGER.error("No WhoRangDataUpdateCoordinator instances found")
-            return
+        # Provide default AI message if none provided (backend will do AI analysis)
+        if not ai_message:
+            ai_message = "Analyzing visitor at front door..."
+            _LOGGER.info("No AI message provided, using default. Backend will perform AI analysis using configured template.")
         
-        # Process the doorbell event for each coordinator
-        for coordinator in coordinators:
+        if not ai_title:
+            ai_title = "Doorbell Alert"
+            _LOGGER.info("No AI title provided, using default.")
+        
+        async def process_for_coordinator(coordinator: WhoRangDataUpdateCoordinator) -> Dict[str, Any]:
+            """Process the doorbell event through one coordinator."""
+            started = time.perf_counter()
             try:
-                _LOGGER.info("Processing doorbell event through coordinator")
-                
-                # Get intelligent automation configuration from config entry
-                config_entry = None
-                for entry_id, coord in coordinators_data.items():
-                    if coord == coordinator:
-                        # Find the config entry for this coordinator
-                        for entry in hass.config_entries.async_entries(DOMAIN):
-                            if entry.entry_id == entry_id:
-                                config_entry = entry
-                                break
-                        break
-                
-                automation_config = {}
-                if config_entry:
-                    automation_config = config_entry.options.get("intelligent_automation", {})
+                # Get intelligent automation configuration from the coordinator's entry
+                automation_config = coordinator.automation_config
+                if automation_config:
                     _LOGGER.info("Using intelligent automation config: %s", automation_config)
                 
-                # Provide default AI message if none provided (backend will do AI analysis)
-                if not ai_message:
-                    ai_message = "Analyzing visitor at front door..."
-                    _LOGGER.info("No AI message provided, using default. Backend will perform AI analysis using configured template.")
-                
-                if not ai_title:
-                    ai_title = "Doorbell Alert"
-                    _LOGGER.info("No AI title provided, using default.")
-                
                 # Log the configured AI template for debugging
                 if automation_config.get("ai_prompt_template"):
                     template_name = automation_config.get("ai_prompt_template", "professional")
@@ -509,47 +564,63 @@ async def _async_register_services(hass: HomeAssistant) -> None:
                 # Process through coordinator
                 success = await coordinator.async_process_doorbell_event(event_data)
                 
-                if success:
-                    _LOGGER.info("Successfully processed doorbell event with image: %s", image_url)
-                    
-                    # Force immediate coordinator refresh to update all entities
-                    _LOGGER.info("Triggering coordinator refresh to update entities")
-                    await coordinator.async_request_refresh()
-                    
-                    # Fire Home Assistant event for automations
-                    hass.bus.async_fire("whorang_doorbell_event", {
-                        "image_url": image_url,
-                        "ai_message": ai_message,
-                        "ai_title": ai_title,
-                        "weather_data": {
-                            "temperature": weather_temp,
-                            "humidity": weather_humidity,
-                            "condition": weather_condition,
-                            "wind_speed": wind_speed,
-                            "pressure": pressure
-                        },
-                        "timestamp": event_data["timestamp"],
-                        "source": "service_call",
-                        "automation_config": automation_config
-                    })
-                    
-                    # Handle intelligent notifications if configured
-                    await _handle_intelligent_notifications(
-                        hass, automation_config, image_url, ai_message or ai_title
-                    )
-                    
-                    # Handle media playback if configured
-                    await _handle_intelligent_media(
-                        hass, automation_config, image_url, ai_message or ai_title
-                    )
-                    
-                else:
+                if not success:
                     _LOGGER.error("Failed to process doorbell event with image: %s", image_url)
-                    
+                    return {"success": False, "error": "Backend processing failed"}
+                
+                _LOGGER.info("Successfully processed doorbell event with image: %s", image_url)
+                
+                # Request a coordinator refresh to update all entities
+                await coordinator.async_request_refresh()
+                
+                # Fire Home Assistant event for automations
+                hass.bus.async_fire("whorang_doorbell_event", {
+                    "config_entry_id": coordinator.config_entry.entry_id,
+                    "image_url": image_url,
+                    "ai_message": ai_message,
+                    "ai_title": ai_title,
+                    "weather_data": {
+                        "temperature": weather_temp,
+                        "humidity": weather_humidity,
+                        "condition": weather_condition,
+                        "wind_speed": wind_speed,
+                        "pressure": pressure
+                    },
+                    "timestamp": event_data["timestamp"],
+                    "source": "service_call",
+                    "automation_config": automation_config
+                })
+                
+                # Handle intelligent notifications if configured
+                await _handle_intelligent_notifications(
+                    hass, automation_config, image_url, ai_message or ai_title
+                )
+                
+                # Handle media playback if configured
+                await _handle_intelligent_media(
+                    hass, automation_config, image_url, ai_message or ai_title
+                )
+                
+                return {"success": True}
+                
             except Exception as err:
                 _LOGGER.error("Error processing doorbell event: %s", err, exc_info=True)
+                return {"success": False, "error": str(err)}
+            finally:
+                _LOGGER.debug("Doorbell event for %s took %.0f ms",
+                              coordinator.config_entry.entry_id, (time.perf_counter() - started) * 1000)
+        
+        # Each backend analyses the event independently, so run them side by side
+        outcomes = await asyncio.gather(
+            *(process_for_coordinator(coordinator) for coordinator in targets.values())
+        )
+        results = {
+            entry_id: {"title": coordinator.config_entry.title, **outcome}
+            for (entry_id, coordinator), outcome in zip(targets.items(), outcomes)
+        }
         
         _LOGGER.info("=== DOORBELL EVENT SERVICE COMPLETED ===")
+        return {"results": results}
 
     async def _handle_intelligent_notifications(
         hass: HomeAssistant, 
@@ -642,12 +713,12 @@ async def _async_register_services(hass: HomeAssistant) -> None:
 
     async def batch_label_faces_service(call) -> None:
         """Handle batch label faces service call."""
-        face_ids = call.data.get("face_ids", [])
         person_name = call.data.get("person_name")
         create_person = call.data.get("create_person", True)
+        cluster_id = call.data.get("cluster_id")
         
-        if not face_ids or not person_name:
-            _LOGGER.error("Face IDs list and person name are required for batch labeling faces")
+        if not person_name or not (call.data.get("face_ids") or cluster_id):
+            _LOGGER.error("Face IDs list (or cluster ID) and person name are required for batch labeling faces")
             return
             
         # Get all coordinators
@@ -657,6 +728,15 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         ]
         
         for coordinator in coordinators:
+            face_ids = list(call.data.get("face_ids", []))
+            if cluster_id is not None:
+                clusters = (coordinator.data or {}).get("face_clusters", {}).get("clusters", [])
+                cluster = next((c for c in clusters if c["cluster_id"] == cluster_id), None)
+                if cluster is None:
+                    _LOGGER.error("Face cluster %s not found, run cluster_unknown_faces first", cluster_id)
+                    continue
+                face_ids.extend(face_id for face_id in cluster["face_ids"] if face_id not in face_ids)
+
             try:
                 result = await coordinator.api_client.batch_label_faces(face_ids, person_name, create_person)
                 labeled_count = result.get("labeled_count", 0)
@@ -821,6 +901,179 @@ async def _async_register_services(hass: HomeAssistant) -> None:
             except Exception as err:
                 _LOGGER.error("Error getting face similarities for %s: %s", face_id, err)
 
+    async def cluster_unknown_faces_service(call) -> Dict[str, Any]:
+        """Handle cluster unknown faces service call.
+
+        Every entry clusters the unknown faces of its backend, the result
+        of each is returned under its entry id.
+        """
+        similarity_threshold = call.data.get("similarity_threshold", 0.6)
+        min_cluster_size = call.data.get("min_cluster_size", 2)
+        max_faces = call.data.get("max_faces", 500)
+        quality_threshold = call.data.get("quality_threshold", 0.0)
+
+        # Get all coordinators
+        coordinators = [
+            coordinator for coordinator in hass.data[DOMAIN].values()
+            if isinstance(coordinator, WhoRangDataUpdateCoordinator)
+        ]
+
+        results: Dict[str, Any] = {}
+        for coordinator in coordinators:
+            entry_id = coordinator.config_entry.entry_id
+            try:
+                unknown_faces = await coordinator.api_client.get_all_unassigned_faces(
+                    max_faces=max_faces,
+                    quality_threshold=quality_threshold,
+                )
+
+                # Clustering is CPU bound, keep it off the event loop
+                result = await hass.async_add_executor_job(
+                    cluster_faces, unknown_faces, similarity_threshold, min_cluster_size
+                )
+                result["timestamp"] = datetime.now().isoformat()
+
+                _LOGGER.info(
+                    "Clustered %d unknown faces into %d clusters in %.1f ms",
+                    result["clustered_faces"], result["cluster_count"], result["duration_ms"]
+                )
+
+                # Update coordinator data with clusters
+                if coordinator.data is None:
+                    coordinator.data = {}
+                coordinator.data["face_clusters"] = result
+                coordinator.async_set_updated_data(coordinator.data)
+
+                # Fire event for automations
+                hass.bus.async_fire(EVENT_FACE_CLUSTERS_UPDATED, {
+                    "cluster_count": result["cluster_count"],
+                    "clustered_faces": result["clustered_faces"],
+                    "clusters": [
+                        {
+                            "cluster_id": cluster["cluster_id"],
+                            "size": cluster["size"],
+                            "representative_face_id": cluster["representative_face_id"],
+                        }
+                        for cluster in result["clusters"]
+                    ],
+                    "timestamp": result["timestamp"]
+                })
+
+                results[entry_id] = {"title": coordinator.config_entry.title, **result}
+
+            except Exception as err:
+                _LOGGER.error("Error clustering unknown faces: %s", err)
+                results[entry_id] = {
+                    "title": coordinator.config_entry.title,
+                    "success": False,
+                    "error": str(err),
+                }
+
+        return {"results": results}
+
+    async def bulk_face_operation_service(call) -> Dict[str, Any]:
+        """Handle bulk face operation service call.
+
+        Every entry runs the operation on its backend, the summary of each
+        is returned under its entry id.
+        """
+        operation = call.data["operation"]
+        face_ids = call.data["face_ids"]
+        person_name = call.data.get("person_name")
+        person_id = call.data.get("person_id")
+
+        if operation == "label" and not person_name:
+            _LOGGER.error("Person name is required for bulk labeling faces")
+            return {"results": {}}
+        if operation == "assign" and not person_id:
+            _LOGGER.error("Person ID is required for bulk assigning faces")
+            return {"results": {}}
+
+        # Get all coordinators
+        coordinators = [
+            coordinator for coordinator in hass.data[DOMAIN].values()
+            if isinstance(coordinator, WhoRangDataUpdateCoordinator)
+        ]
+
+        results: Dict[str, Any] = {}
+        for coordinator in coordinators:
+            entry_id = coordinator.config_entry.entry_id
+            api_client = coordinator.api_client
+            try:
+                target_person_id = person_id
+                if operation == "label":
+                    # Resolve the person once so concurrent items don't each create it
+                    known_persons = await api_client.get_known_persons()
+                    target_person_id = next(
+                        (p["id"] for p in known_persons if p.get("name", "").lower() == person_name.lower()),
+                        None
+                    )
+                    if target_person_id is None:
+                        person = await api_client.create_person(person_name)
+                        target_person_id = person.get("id") or person.get("person", {}).get("id")
+                    if target_person_id is None:
+                        _LOGGER.error("Could not create person %s for bulk labeling", person_name)
+                        results[entry_id] = {
+                            "title": coordinator.config_entry.title,
+                            "success": False,
+                            "error": f"Could not create person {person_name}",
+                        }
+                        continue
+
+                if operation == "delete":
+                    async def run_operation(face_id: int) -> bool:
+                        return await api_client.delete_face(face_id)
+                else:
+                    async def run_operation(face_id: int) -> bool:
+                        return await api_client.assign_face_to_person(face_id, target_person_id)
+
+                runner = BulkOperationRunner(
+                    max_concurrency=call.data.get("max_concurrency", 4),
+                    rate_limit=call.data.get("rate_limit"),
+                )
+                summary = await runner.async_run(face_ids, run_operation)
+                summary["operation"] = operation
+                if target_person_id is not None:
+                    summary["person_id"] = target_person_id
+
+                _LOGGER.info(
+                    "Bulk %s of %d faces finished: %d succeeded, %d failed in %.0f ms",
+                    operation, summary["total"], summary["succeeded"], summary["failed"], summary["duration_ms"]
+                )
+
+                if summary["succeeded"]:
+                    await coordinator.async_request_refresh()
+                    if operation != "delete":
+                        hass.bus.async_fire(EVENT_FACE_LABELED, {
+                            "face_ids": [r["item"] for r in summary["results"] if r["success"]],
+                            "person_id": target_person_id,
+                            "person_name": person_name,
+                            "labeled_count": summary["succeeded"],
+                            "timestamp": datetime.now().isoformat()
+                        })
+
+                results[entry_id] = {"title": coordinator.config_entry.title, **summary}
+
+            except Exception as err:
+                _LOGGER.error("Error running bulk %s of faces: %s", operation, err)
+                results[entry_id] = {
+                    "title": coordinator.config_entry.title,
+                    "success": False,
+                    "error": str(err),
+                }
+
+        return {"results": results}
+
+    async def profile_service(call) -> Dict[str, Any]:
+        """Handle profile service call."""
+        if DATA_PROFILE_SESSION in hass.data:
+            raise HomeAssistantError("A WhoRang profiling session is already running")
+
+        # Another active profiler fails the call, see async_profile
+        duration = call.data["duration"]
+        _LOGGER.info("Profiling WhoRang hot paths for %s seconds", duration)
+        return await async_profile(hass, duration, call.data["top"], call.data["sort"])
+
     # Person Management Services
 
     async def update_person_service(call) -> None:
@@ -889,36 +1142,90 @@ async def _async_register_services(hass: HomeAssistant) -> None:
             except Exception as err:
                 _LOGGER.error("Error getting person details for %s: %s", person_id, err)
 
-    async def merge_persons_service(call) -> None:
-        """Handle merge persons service call."""
+    merge_checkpoint_store = Store(hass, STORAGE_VERSION, STORAGE_KEY_MERGE_CHECKPOINTS)
+
+    async def merge_persons_service(call) -> Dict[str, Any]:
+        """Handle merge persons service call.
+
+        Every entry merges the persons on its backend, the result of each
+        is returned under its entry id.
+        """
         source_person_id = call.data.get("source_person_id")
         target_person_id = call.data.get("target_person_id")
+        batch_size = call.data.get("batch_size", 50)
+        max_concurrency = call.data.get("max_concurrency", 4)
         
         if not source_person_id or not target_person_id:
             _LOGGER.error("Both source and target person IDs are required for merging persons")
-            return
+            return {"results": {}}
             
         if source_person_id == target_person_id:
             _LOGGER.error("Source and target person IDs cannot be the same")
-            return
+            return {"results": {}}
             
         # Get all coordinators
         coordinators = [
             coordinator for coordinator in hass.data[DOMAIN].values()
             if isinstance(coordinator, WhoRangDataUpdateCoordinator)
         ]
+
+        # Faces already moved by an interrupted merge are skipped on retry
+        checkpoints: Dict[str, Any] = await merge_checkpoint_store.async_load() or {}
         
+        results: Dict[str, Any] = {}
         for coordinator in coordinators:
+            entry_id = coordinator.config_entry.entry_id
+            checkpoint_key = f"{coordinator.api_client.base_url}|{source_person_id}->{target_person_id}"
+
+            def report_progress(completed_face_ids, total, key=checkpoint_key) -> None:
+                """Checkpoint merged faces and report progress."""
+                checkpoints[key] = {
+                    "completed_face_ids": completed_face_ids,
+                    "total": total,
+                    "updated": datetime.now().isoformat(),
+                }
+                merge_checkpoint_store.async_delay_save(lambda: checkpoints, 1)
+                hass.bus.async_fire(EVENT_MERGE_PROGRESS, {
+                    "source_person_id": source_person_id,
+                    "target_person_id": target_person_id,
+                    "completed": len(completed_face_ids),
+                    "total": total,
+                    "timestamp": datetime.now().isoformat()
+                })
+
             try:
-                success = await coordinator.api_client.merge_persons(source_person_id, target_person_id)
-                if success:
-                    _LOGGER.info("Successfully merged person %s into person %s", source_person_id, target_person_id)
+                result = await coordinator.api_client.merge_persons(
+                    source_person_id,
+                    target_person_id,
+                    batch_size=batch_size,
+                    max_concurrency=max_concurrency,
+                    completed_face_ids=checkpoints.get(checkpoint_key, {}).get("completed_face_ids"),
+                    progress_callback=report_progress,
+                )
+                results[entry_id] = {"title": coordinator.config_entry.title, **result}
+                if result.get("success"):
+                    _LOGGER.info(
+                        "Successfully merged person %s into person %s (%d faces, %s)",
+                        source_person_id, target_person_id, result.get("faces_moved", 0), result.get("method")
+                    )
+                    if checkpoints.pop(checkpoint_key, None) is not None:
+                        await merge_checkpoint_store.async_save(checkpoints)
                     await coordinator.async_request_refresh()
                 else:
-                    _LOGGER.error("Failed to merge person %s into person %s", source_person_id, target_person_id)
+                    _LOGGER.error(
+                        "Failed to merge person %s into person %s, %d faces moved so far: %s",
+                        source_person_id, target_person_id, result.get("faces_moved", 0), result.get("errors")
+                    )
                     
             except Exception as err:
                 _LOGGER.error("Error merging persons %s -> %s: %s", source_person_id, target_person_id, err)
+                results[entry_id] = {
+                    "title": coordinator.config_entry.title,
+                    "success": False,
+                    "error": str(err),
+                }
+
+        return {"results": results}
 
     # Register services
     hass.services.async_register(
@@ -1022,7 +1329,11 @@ async def _async_register_services(hass: HomeAssistant) -> None:
             vol.Optional("weather_condition"): str,
             vol.Optional("wind_speed"): vol.Any(vol.Coerce(float), str),  # Allow templates
             vol.Optional("pressure"): vol.Any(vol.Coerce(float), str),  # Allow templates
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [str]),
+            vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [str]),
+            vol.Optional(ATTR_AREA_ID): vol.All(cv.ensure_list, [str]),
         }),
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
     # Register face management services
@@ -1041,7 +1352,8 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         SERVICE_BATCH_LABEL_FACES,
         batch_label_faces_service,
         schema=vol.Schema({
-            vol.Required("face_ids"): [int],
+            vol.Optional("face_ids"): [int],
+            vol.Optional("cluster_id"): vol.All(int, vol.Range(min=1)),
             vol.Required("person_name"): str,
             vol.Optional("create_person", default=True): bool,
         }),
@@ -1088,6 +1400,46 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         }),
     )
 
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CLUSTER_UNKNOWN_FACES,
+        cluster_unknown_faces_service,
+        schema=vol.Schema({
+            vol.Optional("similarity_threshold", default=0.6): vol.All(vol.Coerce(float), vol.Range(min=0.3, max=0.99)),
+            vol.Optional("min_cluster_size", default=2): vol.All(int, vol.Range(min=2, max=50)),
+            vol.Optional("max_faces", default=500): vol.All(int, vol.Range(min=2, max=2000)),
+            vol.Optional("quality_threshold", default=0.0): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_FACE_OPERATION,
+        bulk_face_operation_service,
+        schema=vol.Schema({
+            vol.Required("operation"): vol.In(["label", "assign", "delete"]),
+            vol.Required("face_ids"): vol.All([int], vol.Length(min=1, max=5000)),
+            vol.Optional("person_name"): str,
+            vol.Optional("person_id"): int,
+            vol.Optional("max_concurrency", default=4): vol.All(int, vol.Range(min=1, max=32)),
+            vol.Optional("rate_limit"): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=1000)),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        profile_service,
+        schema=vol.Schema({
+            vol.Optional("duration", default=60): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+            vol.Optional("top", default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+            vol.Optional("sort", default="cumulative"): vol.In(["cumulative", "tottime", "calls"]),
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+
     # Register person management services
     hass.services.async_register(
         DOMAIN,
@@ -1116,5 +1468,8 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         schema=vol.Schema({
             vol.Required("source_person_id"): int,
             vol.Required("target_person_id"): int,
+            vol.Optional("batch_size", default=50): vol.All(int, vol.Range(min=1, max=500)),
+            vol.Optional("max_concurrency", default=4): vol.All(int, vol.Range(min=1, max=16)),
         }),
+        supports_response=SupportsResponse.OPTIONAL,
     )
@@ -0,0 +1,216 @@
+"""Local AI usage statistics for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from datetime import date
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import STORAGE_KEY_AI_USAGE, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds covered by the rolling latency window
+ROLLING_WINDOW = 3600
+# Daily buckets kept, enough to cover the current and previous month
+DAILY_BUCKETS = 62
+MONTHLY_BUCKETS = 12
+SAVE_DELAY = 30
+
+
+def _empty_counter() -> Dict[str, float]:
+    """Return an empty per-provider counter."""
+    return {"cost": 0.0, "requests": 0, "processing_time": 0.0}
+
+
+class AIUsageAggregator:
+    """Aggregate AI cost and latency from analysis events as they arrive.
+
+    Every completed analysis is added to per-provider counters in a daily
+    and a monthly bucket and to a rolling window used for recent latency,
+    so the cost sensors update without polling the backend. The backend
+    usage endpoints are only used now and then to reconcile: they cover
+    analyses missed while disconnected, so reconciling raises the local
+    counters to the backend's totals but never lowers them.
+    """
+
+    def __init__(self, hass: HomeAssistant, storage_suffix: Optional[str] = None) -> None:
+        """Initialize the aggregator."""
+        self.hass = hass
+        key = f"{STORAGE_KEY_AI_USAGE}.{storage_suffix}" if storage_suffix else STORAGE_KEY_AI_USAGE
+        self._store = Store(hass, STORAGE_VERSION, key)
+        # Bucket key ("2025-01-31" or "2025-01") -> provider -> counter
+        self._daily: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._monthly: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # (monotonic time, provider, processing time) of recent analyses
+        self._window: Deque[Tuple[float, str, float]] = deque()
+        self._monthly_limit = 0.0
+        self._last_reconcile: Optional[str] = None
+        self._recorded = 0
+
+    async def async_load(self) -> None:
+        """Restore the buckets from storage."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        self._daily = data.get("daily", {})
+        self._monthly = data.get("monthly", {})
+        self._monthly_limit = data.get("monthly_limit", 0.0)
+        self._last_reconcile = data.get("last_reconcile")
+
+    @staticmethod
+    def _bucket_keys(day: Optional[date] = None) -> Tuple[str, str]:
+        """Return the daily and monthly bucket keys of a day, today by default."""
+        day = day or dt_util.now().date()
+        return day.isoformat(), day.isoformat()[:7]
+
+    def async_record(
+        self,
+        provider: Optional[str],
+        cost_usd: Optional[float],
+        processing_time: Optional[float] = None,
+    ) -> None:
+        """Add a completed analysis to the counters."""
+        provider = provider or "unknown"
+        cost = float(cost_usd or 0)
+        processing = float(processing_time or 0)
+        day_key, month_key = self._bucket_keys()
+
+        for buckets, key in ((self._daily, day_key), (self._monthly, month_key)):
+            counter = buckets.setdefault(key, {}).setdefault(provider, _empty_counter())
+            counter["cost"] += cost
+            counter["requests"] += 1
+            counter["processing_time"] += processing
+
+        now = time.monotonic()
+        self._window.append((now, provider, processing))
+        self._prune(now)
+        self._recorded += 1
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def async_reconcile(self, backend_usage: Dict[str, Any]) -> None:
+        """Raise the local counters to the totals reported by the backend."""
+        day_key, month_key = self._bucket_keys()
+        today = self._daily.setdefault(day_key, {})
+        month = self._monthly.setdefault(month_key, {})
+        for provider_data in backend_usage.get("providers", []):
+            provider = provider_data.get("provider", "unknown")
+            counter = today.setdefault(provider, _empty_counter())
+            month_counter = month.setdefault(provider, _empty_counter())
+            requests = provider_data.get("requests", 0) or 0
+            if requests > counter["requests"]:
+                processing_time = float(provider_data.get("avg_processing_time", 0) or 0) * requests
+                month_counter["requests"] += requests - counter["requests"]
+                month_counter["processing_time"] += processing_time - counter["processing_time"]
+                counter["requests"] = requests
+                counter["processing_time"] = processing_time
+            cost = float(provider_data.get("cost", 0) or 0)
+            if cost > counter["cost"]:
+                month_counter["cost"] += cost - counter["cost"]
+                counter["cost"] = cost
+
+        budget = backend_usage.get("budget", {})
+        self._monthly_limit = float(budget.get("monthly_limit", 0) or self._monthly_limit)
+        # The backend only reports the month total, the difference is kept
+        # under a separate provider so per-provider counts stay accurate
+        missing = float(budget.get("monthly_spent", 0) or 0) - self._total(month)["cost"]
+        if missing > 0:
+            month.setdefault("unattributed", _empty_counter())["cost"] += missing
+
+        self._last_reconcile = dt_util.now().isoformat()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _prune(self, now: float) -> None:
+        """Drop expired window entries and old buckets."""
+        while self._window and now - self._window[0][0] > ROLLING_WINDOW:
+            self._window.popleft()
+        for buckets, keep in ((self._daily, DAILY_BUCKETS), (self._monthly, MONTHLY_BUCKETS)):
+            if len(buckets) > keep:
+                for key in sorted(buckets)[:-keep]:
+                    del buckets[key]
+
+    @staticmethod
+    def _total(bucket: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Sum the provider counters of a bucket."""
+        total = _empty_counter()
+        for counter in bucket.values():
+            for field in total:
+                total[field] += counter[field]
+        return total
+
+    @property
+    def usage_stats(self) -> Dict[str, Any]:
+        """Return the statistics in the format of the backend usage endpoint."""
+        self._prune(time.monotonic())
+        day_key, month_key = self._bucket_keys()
+        today = self._daily.get(day_key, {})
+        month = self._monthly.get(month_key, {})
+        today_total = self._total(today)
+        month_total = self._total(month)
+
+        recent: Dict[str, list] = {}
+        for _, provider, processing in self._window:
+            recent.setdefault(provider, []).append(processing)
+
+        providers = []
+        for provider in sorted(set(today) | set(month)):
+            day_counter = today.get(provider, _empty_counter())
+            month_counter = month.get(provider, _empty_counter())
+            recent_times = recent.get(provider)
+            providers.append({
+                "provider": provider,
+                "cost": day_counter["cost"],
+                "requests": day_counter["requests"],
+                "avg_processing_time": (
+                    day_counter["processing_time"] / day_counter["requests"]
+                    if day_counter["requests"] else 0
+                ),
+                "recent_avg_processing_time": (
+                    sum(recent_times) / len(recent_times) if recent_times else 0
+                ),
+                "monthly_cost": month_counter["cost"],
+                "monthly_requests": month_counter["requests"],
+            })
+
+        return {
+            "total_cost": today_total["cost"],
+            "total_requests": today_total["requests"],
+            "providers": providers,
+            "budget": {
+                "monthly_limit": self._monthly_limit,
+                "monthly_spent": month_total["cost"],
+                "remaining": max(self._monthly_limit - month_total["cost"], 0),
+            },
+            "today": {"cost": today_total["cost"], "requests": today_total["requests"]},
+            "month": {"cost": month_total["cost"], "requests": month_total["requests"]},
+            "period": "today",
+            "source": "local",
+            "last_reconcile": self._last_reconcile,
+        }
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the buckets in storage format."""
+        return {
+            "daily": self._daily,
+            "monthly": self._monthly,
+            "monthly_limit": self._monthly_limit,
+            "last_reconcile": self._last_reconcile,
+        }
+
+    async def async_flush(self) -> None:
+        """Write the buckets to storage immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get aggregator statistics."""
+        return {
+            "analyses_recorded": self._recorded,
+            "window_size": len(self._window),
+            "daily_buckets": len(self._daily),
+            "last_reconcile": self._last_reconcile,
+        }
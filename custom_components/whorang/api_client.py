@@ -6,7 +6,7 @@ import json
 import logging
 import ssl
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 
@@ -21,6 +21,7 @@ from .const import (
     API_OPENAI,
     DEFAULT_TIMEOUT,
 )
+from .person_merge import async_merge_persons
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +38,10 @@ class WhoRangAuthError(WhoRangAPIError):
     """Exception to indicate an authentication error."""
 
 
+class WhoRangRouteNotFoundError(WhoRangAPIError):
+    """Exception to indicate the backend has no such endpoint."""
+
+
 class WhoRangAPIClient:
     """API client for WhoRang system."""
 
@@ -149,8 +154,11 @@ class WhoRangAPIClient:
                 ) as response:
                     if response.status == 401:
                         raise WhoRangAuthError("Authentication failed")
-                    elif response.status == 404:
-                        raise WhoRangAPIError(f"Endpoint not found: {endpoint}")
+                    elif response.status == 405 or (
+                        response.status == 404 and response.content_type != "application/json"
+                    ):
+                        # Unknown routes get the web framework's page, not a JSON error
+                        raise WhoRangRouteNotFoundError(f"Endpoint not found: {endpoint}")
                     elif response.status >= 400:
                         error_text = await response.text()
                         raise WhoRangAPIError(
@@ -918,39 +926,20 @@ class WhoRangAPIClient:
             _LOGGER.error("Failed to get person details for %s: %s", person_id, err)
             return {}
 
-    async def merge_persons(self, source_id: int, target_id: int) -> bool:
-        """Merge two person entries."""
-        try:
-            # This would need to be implemented in the backend
-            # For now, we'll simulate it by transferring faces and deleting the source
-            
-            # Get source person faces
-            source_details = await self.get_person_details(source_id)
-            source_faces = source_details.get("faces", [])
-            
-            # Get target person details
-            target_details = await self.get_person_details(target_id)
-            target_name = target_details.get("name", "Unknown")
-            
-            # Transfer each face from source to target
-            success_count = 0
-            for face in source_faces:
-                face_id = face.get("id")
-                if face_id:
-                    if await self.label_face_with_name(face_id, target_name):
-                        success_count += 1
-            
-            # If all faces transferred successfully, delete the source person
-            if success_count == len(source_faces) and success_count > 0:
-                # Delete source person (this would remove the person entry)
-                delete_response = await self._request("DELETE", f"/api/persons/{source_id}")
-                return delete_response.get("success", False)
-            
-            return success_count > 0
-            
-        except Exception as err:
-            _LOGGER.error("Failed to merge persons %s -> %s: %s", source_id, target_id, err)
-            return False
+    async def merge_persons(
+        self,
+        source_id: int,
+        target_id: int,
+        batch_size: int = 50,
+        max_concurrency: int = 4,
+        completed_face_ids: Optional[List[int]] = None,
+        progress_callback: Optional[Callable[[List[int], int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Merge the source person into the target person."""
+        return await async_merge_persons(
+            self, self._request, WhoRangRouteNotFoundError, source_id, target_id,
+            batch_size, max_concurrency, completed_face_ids, progress_callback
+        )
 
     async def delete_face(self, face_id: int) -> bool:
         """Delete a detected face."""
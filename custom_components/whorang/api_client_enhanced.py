@@ -6,8 +6,9 @@ import json
 import logging
 import ssl
 import os
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 
@@ -20,15 +21,26 @@ from .const import (
     API_FACES_PERSONS,
     API_DETECTED_FACES,
     API_OPENAI,
+    CORRELATION_ID_HEADER,
     DEFAULT_TIMEOUT,
 )
+from .person_merge import async_merge_persons
+from .request_metrics import RequestMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
+# Responses to a snapshot upload meaning the backend cannot take uploads at all
+UPLOAD_UNSUPPORTED_STATUSES = (404, 405, 413, 415)
+
 
 class WhoRangAPIError(Exception):
     """Exception to indicate a general API error."""
 
+    def __init__(self, *args: Any, status: Optional[int] = None) -> None:
+        """Initialize the error with the HTTP status of the response, if any."""
+        super().__init__(*args)
+        self.status = status
+
 
 class WhoRangConnectionError(WhoRangAPIError):
     """Exception to indicate a connection error."""
@@ -38,6 +50,10 @@ class WhoRangAuthError(WhoRangAPIError):
     """Exception to indicate an authentication error."""
 
 
+class WhoRangRouteNotFoundError(WhoRangAPIError):
+    """Exception to indicate the backend has no such endpoint."""
+
+
 class WhoRangAPIClientEnhanced:
     """Enhanced API client for WhoRang system with automatic deployment detection."""
     
@@ -79,6 +95,11 @@ class WhoRangAPIClientEnhanced:
         self._close_session = False
         self._ssl_context = None
         self._discovered_url = None
+        # Cleared when the backend rejects a multipart snapshot upload
+        self._snapshot_upload_supported = True
+        # Request metrics, only recorded while someone enabled them
+        self.request_metrics: Optional[RequestMetrics] = None
+        self._request_metrics_users = 0
         
         # Determine backend URL using priority order
         self.base_url = self._determine_backend_url(backend_url, host, port)
@@ -224,6 +245,8 @@ class WhoRangAPIClientEnhanced:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, tuple[str, bytes, str]]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """Make an API request with automatic backend discovery and retry logic."""
         last_exception = None
@@ -237,7 +260,7 @@ class WhoRangAPIClientEnhanced:
                         raise WhoRangConnectionError("No accessible WhoRang backend found")
                 
                 # Make the request
-                return await self._request(method, endpoint, data, params)
+                return await self._request(method, endpoint, data, params, files, headers)
                 
             except (WhoRangConnectionError, aiohttp.ClientError) as e:
                 last_exception = e
@@ -247,6 +270,8 @@ class WhoRangAPIClientEnhanced:
                 self._discovered_url = None
                 
                 if attempt < self.retry_attempts - 1:
+                    if self.request_metrics:
+                        self.request_metrics.record_retry(method, endpoint)
                     await asyncio.sleep(1)  # Brief delay before retry
                     continue
                 else:
@@ -264,43 +289,133 @@ class WhoRangAPIClientEnhanced:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, tuple[str, bytes, str]]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
-        """Make an API request."""
+        """Make an API request.
+
+        When files are given (field -> (filename, bytes, content type)) the
+        request is sent as multipart form data with data as form fields.
+        """
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        if files:
+            # Let aiohttp set the multipart content type and boundary
+            headers.pop("Content-Type", None)
+            body: Any = self._build_form_data(data, files)
+            # Approximate, the multipart boundaries are not counted
+            bytes_out = sum(len(content) for _, content, _ in files.values())
+        else:
+            # Serialized here rather than by aiohttp so its size is known
+            body = json.dumps(data).encode() if data is not None else None
+            bytes_out = len(body) if body else 0
         
         session = await self._get_session()
+        metrics = self.request_metrics
+        started = time.perf_counter()
+        status = None
         
         try:
             async def make_request():
+                nonlocal status
                 async with session.request(
                     method,
                     url,
                     headers=headers,
-                    json=data,
                     params=params,
+                    data=body,
                 ) as response:
+                    status = response.status
                     if response.status == 401:
                         raise WhoRangAuthError("Authentication failed")
-                    elif response.status == 404:
-                        raise WhoRangAPIError(f"Endpoint not found: {endpoint}")
+                    elif response.status == 405 or (
+                        response.status == 404 and response.content_type != "application/json"
+                    ):
+                        # Unknown routes get the web framework's page, not a JSON error
+                        raise WhoRangRouteNotFoundError(
+                            f"Endpoint not found: {endpoint}", status=response.status
+                        )
                     elif response.status >= 400:
                         error_text = await response.text()
                         raise WhoRangAPIError(
-                            f"API error {response.status}: {error_text}"
+                            f"API error {response.status}: {error_text}", status=response.status
                         )
                     
-                    if response.content_type == "application/json":
-                        return await response.json()
-                    else:
-                        return {"data": await response.read()}
+                    content = await response.read()
+                    if response.content_type != "application/json":
+                        return {"data": content}, len(content), 0.0
+                    decode_started = time.perf_counter()
+                    result = json.loads(content) if content.strip() else None
+                    return result, len(content), (time.perf_counter() - decode_started) * 1000
             
-            return await asyncio.wait_for(make_request(), timeout=self.timeout)
+            result, bytes_in, decode_ms = await asyncio.wait_for(make_request(), timeout=self.timeout)
                         
         except asyncio.TimeoutError as err:
+            if metrics:
+                self._record_request_error(metrics, method, endpoint, "timeout", started, bytes_out)
             raise WhoRangConnectionError("Request timeout") from err
         except aiohttp.ClientError as err:
+            if metrics:
+                self._record_request_error(metrics, method, endpoint, type(err).__name__, started, bytes_out)
             raise WhoRangConnectionError(f"Connection error: {err}") from err
+        except Exception as err:
+            if metrics:
+                error_class = f"http_{status}" if status and status >= 400 else type(err).__name__
+                self._record_request_error(metrics, method, endpoint, error_class, started, bytes_out)
+            raise
+        
+        if metrics:
+            metrics.record(
+                method, endpoint, (time.perf_counter() - started) * 1000, bytes_out, bytes_in, decode_ms
+            )
+        return result
+
+    @staticmethod
+    def _record_request_error(
+        metrics: RequestMetrics,
+        method: str,
+        endpoint: str,
+        error_class: str,
+        started: float,
+        bytes_out: int,
+    ) -> None:
+        """Record a failed request in the metrics."""
+        metrics.record_error(
+            method, endpoint, error_class, (time.perf_counter() - started) * 1000, bytes_out
+        )
+
+    def enable_request_metrics(self) -> RequestMetrics:
+        """Start recording request metrics, kept until every user disabled them."""
+        self._request_metrics_users += 1
+        if self.request_metrics is None:
+            self.request_metrics = RequestMetrics()
+        return self.request_metrics
+
+    def disable_request_metrics(self) -> None:
+        """Stop recording request metrics once no user needs them."""
+        self._request_metrics_users = max(self._request_metrics_users - 1, 0)
+        if not self._request_metrics_users:
+            self.request_metrics = None
+
+    @staticmethod
+    def _build_form_data(
+        fields: Optional[Dict[str, Any]], files: Dict[str, tuple[str, bytes, str]]
+    ) -> aiohttp.FormData:
+        """Build multipart form data from plain fields and file parts."""
+        form = aiohttp.FormData()
+        for key, value in (fields or {}).items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            form.add_field(key, str(value))
+        for field, (filename, content, content_type) in files.items():
+            form.add_field(field, content, filename=filename, content_type=content_type)
+        return form
 
     async def get_health(self) -> Dict[str, Any]:
         """Get system health status."""
@@ -414,11 +529,28 @@ class WhoRangAPIClientEnhanced:
             _LOGGER.error("Failed to get stats: %s", err)
             raise
 
-    async def process_doorbell_event(self, payload: Dict[str, Any]) -> bool:
+    async def process_doorbell_event(
+        self, payload: Dict[str, Any], image_data: Optional[bytes] = None
+    ) -> bool:
         """Process a complete doorbell event with image and context data.
         
         This replaces the original rest_command.doorbell_webhook functionality.
+        When image_data is given the snapshot is uploaded with the event so the
+        backend does not have to download it from image_url.
+        """
+        return await self.submit_doorbell_event(payload, image_data) is not None
+
+    async def submit_doorbell_event(
+        self, payload: Dict[str, Any], image_data: Optional[bytes] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Submit a doorbell event, returning the backend response or None on failure.
+
+        A correlation_id in the payload is also sent as the X-Correlation-ID
+        header so the backend can tag its logs and WebSocket events with it.
         """
+        headers = None
+        if payload.get("correlation_id"):
+            headers = {CORRELATION_ID_HEADER: payload["correlation_id"]}
         try:
             # Extract automation config if provided
             automation_config = payload.get("automation_config", {})
@@ -438,7 +570,27 @@ class WhoRangAPIClientEnhanced:
                            automation_config.get("ai_prompt_template", "professional"))
             
             # Send the doorbell event to the backend webhook endpoint
-            response = await self._request_with_discovery("POST", "/api/webhook/doorbell", data=enhanced_payload)
+            response = None
+            if image_data and self._snapshot_upload_supported:
+                try:
+                    response = await self.upload_doorbell_event(enhanced_payload, image_data, headers=headers)
+                except WhoRangAPIError as err:
+                    if isinstance(err, WhoRangRouteNotFoundError) or err.status in UPLOAD_UNSUPPORTED_STATUSES:
+                        # An older backend without working multipart support,
+                        # do not pay for the upload on every ring
+                        self._snapshot_upload_supported = False
+                        _LOGGER.warning(
+                            "Backend does not accept snapshot uploads, sending image URLs from now on: %s", err
+                        )
+                    else:
+                        # Transient or specific to this event, try uploading again next time
+                        _LOGGER.warning("Snapshot upload failed, falling back to image URL: %s", err)
+                except Exception as err:
+                    _LOGGER.warning("Snapshot upload failed, falling back to image URL: %s", err)
+            if response is None:
+                response = await self._request_with_discovery(
+                    "POST", "/api/webhook/doorbell", data=enhanced_payload, headers=headers
+                )
             
             # Check if the request was successful
             # The webhook returns the created event object, so check for visitor_id
@@ -452,15 +604,35 @@ class WhoRangAPIClientEnhanced:
                 _LOGGER.info("Successfully processed doorbell event with image: %s", 
                            payload.get("image_url", "unknown"))
                 _LOGGER.debug("Backend response: %s", response)
-            else:
-                _LOGGER.error("Backend rejected doorbell event: %s", 
-                            response.get("message", "Unknown error"))
-                
-            return success
+                return response
+            
+            _LOGGER.error("Backend rejected doorbell event: %s", 
+                        response.get("message", "Unknown error"))
+            return None
             
         except Exception as err:
             _LOGGER.error("Failed to process doorbell event: %s", err)
-            return False
+            return None
+
+    async def upload_doorbell_event(
+        self,
+        payload: Dict[str, Any],
+        image_data: bytes,
+        filename: str = "doorbell_snapshot.jpg",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Upload snapshot bytes to the doorbell webhook as multipart with the event metadata."""
+        fields = {
+            key: value for key, value in payload.items()
+            if key not in ("automation_config", "image_url", "image_download_url")
+        }
+        return await self._request_with_discovery(
+            "POST",
+            "/api/webhook/doorbell",
+            data=fields,
+            files={"image": (filename, image_data, "image/jpeg")},
+            headers=headers,
+        )
 
     async def get_system_info(self) -> Dict[str, Any]:
         """Get comprehensive system information."""
@@ -685,6 +857,26 @@ class WhoRangAPIClientEnhanced:
             _LOGGER.error("Failed to get latest image: %s", err)
             return None
 
+    async def get_image_bytes(self, image_url: str) -> Optional[bytes]:
+        """Download an image by backend path or absolute URL."""
+        try:
+            if image_url.startswith("/"):
+                response = await self._request_with_discovery("GET", image_url)
+                data = response.get("data")
+                return data if isinstance(data, bytes) else None
+            
+            session = await self._get_session()
+            async with session.get(
+                image_url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    _LOGGER.debug("Failed to download image %s: HTTP %s", image_url, response.status)
+                    return None
+                return await response.read()
+        except Exception as err:
+            _LOGGER.error("Failed to download image %s: %s", image_url, err)
+            return None
+
     async def get_ai_usage_stats(self, days: int = 1) -> Dict[str, Any]:
         """Get AI usage statistics from the backend."""
         try:
@@ -1089,6 +1281,175 @@ class WhoRangAPIClientEnhanced:
                 "last_updated": datetime.now().isoformat()
             }
 
+    async def get_unassigned_faces(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        quality_threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """Get unknown faces requiring labeling."""
+        try:
+            params = {
+                "limit": limit,
+                "offset": offset,
+                "quality_threshold": quality_threshold
+            }
+            response = await self._request_with_discovery("GET", f"{API_DETECTED_FACES}/unassigned", params=params)
+            return response.get("faces", [])
+        except Exception as e:
+            _LOGGER.error("Failed to get unassigned faces: %s", e)
+            return []
+
+    async def get_all_unassigned_faces(
+        self,
+        max_faces: int = 500,
+        quality_threshold: float = 0.0,
+        page_size: int = 200,
+    ) -> List[Dict[str, Any]]:
+        """Get unknown faces page by page, up to max_faces.
+
+        Paging follows the backend's hasMore flag, a short page does not
+        mean the end as the backend may cap the page size. Without
+        pagination info paging stops at the first empty page.
+        """
+        faces: List[Dict[str, Any]] = []
+        while len(faces) < max_faces:
+            params = {
+                "limit": min(page_size, max_faces - len(faces)),
+                "offset": len(faces),
+                "quality_threshold": quality_threshold
+            }
+            try:
+                response = await self._request_with_discovery("GET", f"{API_DETECTED_FACES}/unassigned", params=params)
+            except Exception as e:
+                _LOGGER.error("Failed to get unassigned faces at offset %d: %s", len(faces), e)
+                break
+            page = response.get("faces", [])
+            faces.extend(page)
+            if not page or not (response.get("pagination") or {}).get("hasMore", True):
+                break
+        return faces
+
+    async def batch_label_faces(self, face_ids: List[int], person_name: str, create_person: bool = True) -> Dict[str, Any]:
+        """Label multiple faces with the same person name."""
+        try:
+            data = {
+                "face_ids": face_ids,
+                "person_name": person_name,
+                "create_person": create_person
+            }
+            response = await self._request_with_discovery("POST", "/api/faces/batch-label", data=data)
+            return response.get("data", {
+                "labeled_count": 0,
+                "total_requested": len(face_ids),
+                "results": []
+            })
+        except Exception as e:
+            _LOGGER.error("Failed to batch label faces %s with name %s: %s", face_ids, person_name, e)
+            return {
+                "labeled_count": 0,
+                "total_requested": len(face_ids),
+                "results": [],
+                "error": str(e)
+            }
+
+    async def assign_face_to_person(self, face_id: int, person_id: int) -> bool:
+        """Assign a face to an existing person."""
+        try:
+            data = {"personId": person_id}
+            response = await self._request_with_discovery("POST", f"{API_DETECTED_FACES}/{face_id}/assign", data=data)
+            return response.get("success", False) or "message" in response
+        except Exception as e:
+            _LOGGER.error("Failed to assign face %s to person %s: %s", face_id, person_id, e)
+            return False
+
+    async def label_face_with_name(self, face_id: int, person_name: str) -> bool:
+        """Label a face by creating a new person or finding existing one."""
+        try:
+            # First, try to find existing person with this name
+            known_persons = await self.get_known_persons()
+            existing_person = None
+            
+            for person in known_persons:
+                if person.get("name", "").lower() == person_name.lower():
+                    existing_person = person
+                    break
+            
+            if existing_person:
+                # Assign to existing person
+                return await self.assign_face_to_person(face_id, existing_person["id"])
+            else:
+                # Create new person and assign face
+                return await self.create_person_from_face(face_id, person_name)
+                
+        except Exception as e:
+            _LOGGER.error("Failed to label face %s with name %s: %s", face_id, person_name, e)
+            return False
+
+    async def create_person_from_face(self, face_id: int, person_name: str, description: str = "") -> bool:
+        """Create a new person and assign the face to them."""
+        try:
+            # Create the person first
+            person_response = await self.create_person(person_name, description)
+            
+            if person_response.get("success", False):
+                # Get the created person ID
+                person_id = person_response.get("person", {}).get("id")
+                if person_id:
+                    # Assign the face to the new person
+                    return await self.assign_face_to_person(face_id, person_id)
+            
+            return False
+        except Exception as e:
+            _LOGGER.error("Failed to create person from face %s: %s", face_id, e)
+            return False
+
+    async def delete_face(self, face_id: int) -> bool:
+        """Delete a detected face."""
+        try:
+            response = await self._request_with_discovery("DELETE", f"{API_DETECTED_FACES}/{face_id}")
+            return response.get("success", False) or "message" in response
+        except Exception as e:
+            _LOGGER.error("Failed to delete face %s: %s", face_id, e)
+            return False
+
+    async def get_person_faces(self, person_id: int) -> List[Dict[str, Any]]:
+        """Get all faces assigned to a specific person."""
+        try:
+            response = await self._request_with_discovery("GET", f"{API_DETECTED_FACES}/person/{person_id}")
+            return response.get("faces", [])
+        except Exception as e:
+            _LOGGER.error("Failed to get faces for person %s: %s", person_id, e)
+            return []
+
+    async def bulk_assign_faces(self, face_ids: List[int], person_id: int) -> Dict[str, Any]:
+        """Bulk assign multiple faces to a person."""
+        try:
+            data = {
+                "faceIds": face_ids,
+                "personId": person_id
+            }
+            response = await self._request_with_discovery("POST", f"{API_DETECTED_FACES}/bulk-assign", data=data)
+            return response
+        except Exception as e:
+            _LOGGER.error("Failed to bulk assign faces %s to person %s: %s", face_ids, person_id, e)
+            return {"success": False, "error": str(e)}
+
+    async def merge_persons(
+        self,
+        source_id: int,
+        target_id: int,
+        batch_size: int = 50,
+        max_concurrency: int = 4,
+        completed_face_ids: Optional[List[int]] = None,
+        progress_callback: Optional[Callable[[List[int], int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Merge the source person into the target person."""
+        return await async_merge_persons(
+            self, self._request_with_discovery, WhoRangRouteNotFoundError, source_id, target_id,
+            batch_size, max_concurrency, completed_face_ids, progress_callback
+        )
+
     # Add properties for backward compatibility
     @property
     def host(self) -> str:
@@ -3,14 +3,19 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, List, Optional, TypeVar
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.template import Template
 
+from .weather_context import WeatherContextProvider
+
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class AutomationEngine:
     """Coordinates doorbell detection, camera snapshots, and AI analysis."""
@@ -21,11 +26,15 @@ class AutomationEngine:
         self.coordinator = coordinator
         self._doorbell_detector = None
         self._camera_manager = None
+        self._weather = None
         self._config = {}
         self._events_processed = 0
         self._successful_events = 0
         self._failed_events = 0
         self._last_event_time = None
+        self._last_stage_timings: Dict[str, float] = {}
+        self._stage_totals_ms: Dict[str, float] = {}
+        self._stage_counts: Dict[str, int] = {}
         
     async def async_setup(self, config: Dict[str, Any]) -> None:
         """Set up the automation engine with configuration."""
@@ -43,6 +52,10 @@ class AutomationEngine:
         self._camera_manager = CameraManager(self.hass, self.coordinator)
         await self._camera_manager.async_setup(self._config)
         
+        # Keep the weather context current so doorbell events only read it
+        self._weather = WeatherContextProvider(self.hass, self._config.get("weather_entity"))
+        self._weather.async_start()
+        
         # Store references in coordinator for access from other components
         self.coordinator._automation_engine = self
         self.coordinator._doorbell_detector = self._doorbell_detector
@@ -52,13 +65,32 @@ class AutomationEngine:
 
     async def async_shutdown(self) -> None:
         """Shutdown the automation engine."""
+        if self._weather:
+            self._weather.async_stop()
+        
         if self._doorbell_detector:
             await self._doorbell_detector.async_shutdown()
         
+        if self._camera_manager:
+            await self._camera_manager.async_shutdown()
+        
         _LOGGER.info("Automation engine shutdown complete")
 
     async def handle_doorbell_event(self, event_data: Dict[str, Any]) -> None:
-        """Handle a doorbell trigger event and coordinate the response."""
+        """Handle a doorbell trigger event and coordinate the response.
+
+        The snapshot is captured first. As soon as it exists, entities are
+        updated and events fired while the backend submission runs in
+        parallel, so notifications never wait for AI processing.
+        """
+        pipeline_started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        backend_task = None
+        # Continue the trace started at the trigger, or start one for direct calls
+        trace = self.coordinator.traces.get(event_data.get("correlation_id"))
+        if trace is None:
+            trace = self.coordinator.traces.start("automation", event_data.get("doorbell_entity"))
+            event_data["correlation_id"] = trace.correlation_id
         try:
             self._events_processed += 1
             self._last_event_time = datetime.now()
@@ -68,21 +100,38 @@ class AutomationEngine:
             
             _LOGGER.info("Processing doorbell event: %s -> %s", doorbell_entity, camera_entity)
             
-            # Step 1: Capture camera snapshot if camera is available
+            # Stage 1: Capture camera snapshot if camera is available
             snapshot_info = None
             if camera_entity and self._camera_manager:
-                snapshot_info = await self._capture_doorbell_snapshot(camera_entity, event_data)
+                snapshot_info = await self._timed_stage(
+                    timings, "capture", self._capture_doorbell_snapshot(camera_entity, event_data)
+                )
+                if snapshot_info:
+                    for stage, value in snapshot_info.get("timings", {}).items():
+                        trace.add_stage(stage, value)
             else:
                 _LOGGER.warning("No camera entity available for doorbell: %s", doorbell_entity)
             
-            # Step 2: Process the doorbell event with WhoRang backend
-            await self._process_with_whorang_backend(event_data, snapshot_info)
+            # Stage 2: Submit to the WhoRang backend in parallel with the notification stages
+            backend_task = self.hass.async_create_task(
+                self._timed_stage(
+                    timings, "backend_submit", self._process_with_whorang_backend(event_data, snapshot_info)
+                )
+            )
             
-            # Step 3: Update Home Assistant entities
-            await self._update_home_assistant_entities(event_data, snapshot_info)
+            # Stage 3: Update Home Assistant entities
+            await self._timed_stage(
+                timings, "entity_update", self._update_home_assistant_entities(event_data, snapshot_info)
+            )
             
-            # Step 4: Fire Home Assistant events for user automations
-            await self._fire_home_assistant_events(event_data, snapshot_info)
+            # Stage 4: Fire Home Assistant events for user automations
+            timings["time_to_notification"] = self._elapsed_ms(pipeline_started)
+            await self._timed_stage(
+                timings, "notification", self._fire_home_assistant_events(event_data, snapshot_info, timings)
+            )
+            trace.mark("notification_sent")
+            
+            await backend_task
             
             self._successful_events += 1
             _LOGGER.info("Successfully processed doorbell event from %s", doorbell_entity)
@@ -90,6 +139,34 @@ class AutomationEngine:
         except Exception as err:
             self._failed_events += 1
             _LOGGER.error("Error processing doorbell event: %s", err, exc_info=True)
+            if backend_task and not backend_task.done():
+                backend_task.cancel()
+        finally:
+            timings["total"] = self._elapsed_ms(pipeline_started)
+            self._record_timings(timings)
+            for stage in ("capture", "entity_update", "notification", "backend_submit"):
+                trace.add_stage(stage, timings.get(stage))
+            _LOGGER.debug("Doorbell pipeline stage timings (ms): %s", timings)
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """Return milliseconds since a perf_counter reading."""
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    async def _timed_stage(self, timings: Dict[str, float], stage: str, awaitable: Awaitable[_T]) -> _T:
+        """Await a pipeline stage and record its latency."""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = self._elapsed_ms(started)
+
+    def _record_timings(self, timings: Dict[str, float]) -> None:
+        """Keep the latest stage timings and running averages."""
+        self._last_stage_timings = dict(timings)
+        for stage, value in timings.items():
+            self._stage_totals_ms[stage] = self._stage_totals_ms.get(stage, 0.0) + value
+            self._stage_counts[stage] = self._stage_counts.get(stage, 0) + 1
 
     async def _capture_doorbell_snapshot(self, camera_entity: str, event_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Capture a snapshot from the doorbell camera."""
@@ -100,7 +177,8 @@ class AutomationEngine:
                 "doorbell_entity": event_data.get("doorbell_entity"),
                 "trigger_time": event_data.get("trigger_time"),
                 "trigger_state": event_data.get("trigger_state"),
-                "snapshot_delay": self._config.get("snapshot_delay", 1)
+                "snapshot_delay": self._config.get("snapshot_delay", 1),
+                "correlation_id": event_data.get("correlation_id"),
             }
             
             # Capture snapshot
@@ -124,30 +202,40 @@ class AutomationEngine:
                 _LOGGER.warning("No snapshot available for WhoRang processing")
                 return
             
-            # Get AI configuration from integration options
-            config_entry = None
-            for entry in self.hass.config_entries.async_entries("whorang"):
-                if entry.state.name == "loaded":
-                    config_entry = entry
-                    break
+            # Without a Home Assistant URL the signed path is relative and
+            # useless to the backend
+            stream_url = snapshot_info.get("stream_url")
+            if stream_url and not stream_url.startswith(("http://", "https://")):
+                stream_url = None
             
             # Prepare event data for WhoRang backend
             whorang_event_data = {
+                # The persistent URL is what entities, history and the backend
+                # record keep; the short-lived signed URL is only a faster
+                # download source for the backend
                 "image_url": snapshot_info["url"],
+                "image_download_url": stream_url,
                 "location": "front_door",  # Default location
                 "ai_title": "Automatic Doorbell Detection",
                 "timestamp": datetime.now().isoformat(),
                 "source": "intelligent_automation",
+                "correlation_id": event_data.get("correlation_id"),
                 
                 # Add weather context if available
-                **await self._get_weather_context(),
+                **self._get_weather_context(),
                 
                 # Add AI template configuration
-                **self._get_ai_template_config(config_entry)
+                **self.coordinator.ai_template_config
             }
             
+            # Upload the snapshot bytes we already hold instead of having the
+            # backend download them from Home Assistant
+            image_data = None
+            if self._camera_manager and self._config.get("upload_snapshots", True):
+                image_data = self._camera_manager.get_image_data(snapshot_info["snapshot_id"])
+            
             # Process with coordinator (which handles backend communication)
-            success = await self.coordinator.async_process_doorbell_event(whorang_event_data)
+            success = await self.coordinator.async_process_doorbell_event(whorang_event_data, image_data)
             
             if success:
                 _LOGGER.info("Successfully sent doorbell event to WhoRang backend")
@@ -157,64 +245,11 @@ class AutomationEngine:
         except Exception as err:
             _LOGGER.error("Error processing with WhoRang backend: %s", err)
 
-    async def _get_weather_context(self) -> Dict[str, Any]:
-        """Get weather context from Home Assistant weather entities."""
-        try:
-            weather_data = {}
-            
-            # Find weather entities
-            weather_entities = [entity_id for entity_id in self.hass.states.async_entity_ids() 
-                              if entity_id.startswith("weather.")]
-            
-            if weather_entities:
-                # Use the first available weather entity
-                weather_entity = weather_entities[0]
-                weather_state = self.hass.states.get(weather_entity)
-                
-                if weather_state and weather_state.state != "unavailable":
-                    attributes = weather_state.attributes
-                    
-                    weather_data = {
-                        "weather_condition": weather_state.state,
-                        "weather_temp": attributes.get("temperature"),
-                        "weather_humidity": attributes.get("humidity"),
-                        "wind_speed": attributes.get("wind_speed"),
-                        "pressure": attributes.get("pressure")
-                    }
-                    
-                    _LOGGER.debug("Retrieved weather context: %s", weather_data)
-            
-            return weather_data
-            
-        except Exception as err:
-            _LOGGER.error("Error getting weather context: %s", err)
+    def _get_weather_context(self) -> Dict[str, Any]:
+        """Get weather context from the followed Home Assistant weather entity."""
+        if not self._weather:
             return {}
-
-    def _get_ai_template_config(self, config_entry) -> Dict[str, Any]:
-        """Get AI template configuration from integration options."""
-        try:
-            if not config_entry or not config_entry.options:
-                return {
-                    "ai_prompt_template": "professional",
-                    "custom_ai_prompt": "",
-                    "enable_weather_context": True
-                }
-            
-            automation_config = config_entry.options.get("intelligent_automation", {})
-            
-            return {
-                "ai_prompt_template": automation_config.get("ai_prompt_template", "professional"),
-                "custom_ai_prompt": automation_config.get("custom_ai_prompt", ""),
-                "enable_weather_context": automation_config.get("enable_weather_context", True)
-            }
-            
-        except Exception as err:
-            _LOGGER.error("Error getting AI template config: %s", err)
-            return {
-                "ai_prompt_template": "professional",
-                "custom_ai_prompt": "",
-                "enable_weather_context": True
-            }
+        return self._weather.context
 
     async def _update_home_assistant_entities(self, event_data: Dict[str, Any], snapshot_info: Optional[Dict[str, Any]]) -> None:
         """Update Home Assistant entities with doorbell event information."""
@@ -233,7 +268,8 @@ class AutomationEngine:
             
             # Update latest image if snapshot was captured
             latest_image = {}
-            if snapshot_info:
+            # Snapshots that are not persisted have no durable URL yet
+            if snapshot_info and snapshot_info["url"]:
                 latest_image = {
                     "url": snapshot_info["url"],
                     "timestamp": snapshot_info["timestamp"],
@@ -262,8 +298,14 @@ class AutomationEngine:
         except Exception as err:
             _LOGGER.error("Error updating Home Assistant entities: %s", err)
 
-    async def _fire_home_assistant_events(self, event_data: Dict[str, Any], snapshot_info: Optional[Dict[str, Any]]) -> None:
+    async def _fire_home_assistant_events(
+        self,
+        event_data: Dict[str, Any],
+        snapshot_info: Optional[Dict[str, Any]],
+        timings: Optional[Dict[str, float]] = None,
+    ) -> None:
         """Fire Home Assistant events for user automations."""
+        timings = timings or {}
         try:
             # Fire doorbell detected event
             self.hass.bus.async_fire("whorang_intelligent_doorbell_detected", {
@@ -273,7 +315,10 @@ class AutomationEngine:
                 "trigger_state": event_data.get("trigger_state"),
                 "snapshot_captured": snapshot_info is not None,
                 "snapshot_url": snapshot_info["url"] if snapshot_info else None,
-                "automation_source": "intelligent_automation"
+                "automation_source": "intelligent_automation",
+                "capture_ms": timings.get("capture"),
+                "time_to_notification_ms": timings.get("time_to_notification"),
+                "correlation_id": event_data.get("correlation_id"),
             })
             
             # Fire snapshot captured event if applicable
@@ -344,6 +389,11 @@ class AutomationEngine:
                 if self._events_processed > 0 else 0
             ),
             "last_event_time": self._last_event_time.isoformat() if self._last_event_time else None,
+            "last_stage_timings_ms": dict(self._last_stage_timings),
+            "avg_stage_timings_ms": {
+                stage: round(total / self._stage_counts[stage], 1)
+                for stage, total in self._stage_totals_ms.items()
+            },
             "doorbell_detector_stats": self._doorbell_detector.get_statistics() if self._doorbell_detector else {},
             "camera_manager_stats": self._camera_manager.get_statistics() if self._camera_manager else {},
             "config": dict(self._config)
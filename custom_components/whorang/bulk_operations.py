@@ -0,0 +1,76 @@
+"""Bounded-concurrency bulk operations for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class BulkOperationRunner:
+    """Run an async operation over many items with concurrency and rate limits."""
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limit: Optional[float] = None,
+    ) -> None:
+        """Initialize the runner.
+
+        rate_limit is the maximum number of operations started per second,
+        None or 0 for no limit.
+        """
+        self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+        self._interval = 1.0 / rate_limit if rate_limit else 0.0
+        self._rate_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def _wait_for_slot(self) -> None:
+        """Space operation starts according to the rate limit."""
+        if not self._interval:
+            return
+        async with self._rate_lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+                now = self._next_start
+            self._next_start = now + self._interval
+
+    async def _run_item(
+        self, item: Any, operation: Callable[[Any], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """Run the operation for one item and capture its outcome."""
+        async with self._semaphore:
+            await self._wait_for_slot()
+            try:
+                result = await operation(item)
+            except Exception as err:
+                _LOGGER.debug("Bulk operation failed for %s: %s", item, err)
+                return {"item": item, "success": False, "error": str(err)}
+
+        if result is False or (isinstance(result, dict) and result.get("success") is False):
+            error = result.get("error", "Operation failed") if isinstance(result, dict) else "Operation failed"
+            return {"item": item, "success": False, "error": error}
+        return {"item": item, "success": True, "result": result}
+
+    async def async_run(
+        self, items: Iterable[Any], operation: Callable[[Any], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """Run the operation for every item and return a summary."""
+        started = time.monotonic()
+        results: List[Dict[str, Any]] = await asyncio.gather(
+            *(self._run_item(item, operation) for item in items)
+        )
+        succeeded = sum(1 for result in results if result["success"])
+
+        return {
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "results": results,
+        }
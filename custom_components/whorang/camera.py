@@ -3,11 +3,14 @@ from __future__ import annotations
 
 import aiohttp
 import logging
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from homeassistant.components.camera import Camera
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -20,9 +23,17 @@ from .const import (
     CAMERA_LATEST_IMAGE,
 )
 from .coordinator import WhoRangDataUpdateCoordinator
+from .image_processing import resize_image
 
 _LOGGER = logging.getLogger(__name__)
 
+# Resized variants kept per camera, keyed by (url, width, height)
+VARIANT_CACHE_SIZE = 8
+VARIANT_JPEG_QUALITY = 80
+
+# Seconds before an unchanged image URL is revalidated with a conditional request
+IMAGE_REVALIDATE_INTERVAL = 30
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -83,6 +94,37 @@ class WhoRangLatestImageCamera(WhoRangCameraEntity):
         self._attr_icon = "mdi:camera"
         self._cached_image = None
         self._last_image_url = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._last_validated = 0.0
+        self._variants: OrderedDict[Tuple[str, Optional[int], Optional[int]], bytes] = OrderedDict()
+        self._variant_hits = 0
+        self._variant_misses = 0
+        self._not_modified = 0
+
+    async def async_added_to_hass(self) -> None:
+        """Expose the image cache statistics in the diagnostics."""
+        await super().async_added_to_hass()
+        self.coordinator.latest_image_camera = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop exposing the image cache statistics."""
+        if self.coordinator.latest_image_camera is self:
+            self.coordinator.latest_image_camera = None
+        await super().async_will_remove_from_hass()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get image cache statistics.
+
+        These change on every view, so they are kept out of the state
+        attributes to avoid writing a recorder row each time.
+        """
+        return {
+            "cached_variants": len(self._variants),
+            "variant_cache_hits": self._variant_hits,
+            "variant_cache_misses": self._variant_misses,
+            "not_modified_responses": self._not_modified,
+        }
 
     @property
     def state(self) -> str:
@@ -110,7 +152,7 @@ class WhoRangLatestImageCamera(WhoRangCameraEntity):
     async def async_camera_image(
         self, width: Optional[int] = None, height: Optional[int] = None
     ) -> Optional[bytes]:
-        """Return bytes of camera image."""
+        """Return bytes of camera image, downscaled to the requested size."""
         try:
             # Safely get coordinator data with proper None handling
             coordinator_data = getattr(self.coordinator, 'data', None) or {}
@@ -124,35 +166,95 @@ class WhoRangLatestImageCamera(WhoRangCameraEntity):
                 _LOGGER.debug("No image URL available in coordinator data")
                 return self._cached_image
             
-            # If same URL as last time and we have cached image, return it
-            if image_url == self._last_image_url and self._cached_image:
-                _LOGGER.debug("Returning cached image for URL: %s", image_url)
-                return self._cached_image
-            
-            _LOGGER.info("Fetching new image from URL: %s", image_url)
+            # The visitor history may already hold this visitor's image
+            image_data = None
+            visitor_id = latest_visitor.get("visitor_id")
+            if visitor_id and image_url == latest_visitor.get("image_url"):
+                image_data = self.coordinator.visitor_history.get_cached_image(visitor_id)
+            if image_data is None:
+                image_data = await self._async_fetch_source(image_url)
+            if image_data is None or not (width or height):
+                return image_data
             
-            # Fetch image from URL
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    image_url,
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        self._cached_image = image_data
-                        self._last_image_url = image_url
-                        _LOGGER.info("Successfully fetched image (%d bytes) from: %s", 
-                                   len(image_data), image_url)
-                        return image_data
-                    else:
-                        _LOGGER.error("Failed to fetch image from %s: HTTP %s", 
-                                    image_url, response.status)
-                        return self._cached_image
+            return await self._async_get_variant(image_url, image_data, width, height)
                         
         except Exception as e:
             _LOGGER.error("Error fetching camera image: %s", e, exc_info=True)
             return self._cached_image
 
+    async def _async_fetch_source(self, image_url: str) -> Optional[bytes]:
+        """Return the full-size image, revalidating it with a conditional request."""
+        same_url = image_url == self._last_image_url and self._cached_image is not None
+        if same_url and time.monotonic() - self._last_validated < IMAGE_REVALIDATE_INTERVAL:
+            _LOGGER.debug("Returning cached image for URL: %s", image_url)
+            return self._cached_image
+        
+        headers = {}
+        if same_url:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        
+        session = async_get_clientsession(self.hass)
+        async with session.get(
+            image_url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            if response.status == 304 and same_url:
+                self._last_validated = time.monotonic()
+                self._not_modified += 1
+                _LOGGER.debug("Image not modified: %s", image_url)
+                return self._cached_image
+            
+            if response.status != 200:
+                _LOGGER.error("Failed to fetch image from %s: HTTP %s", 
+                            image_url, response.status)
+                return self._cached_image
+            
+            image_data = await response.read()
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+        
+        if image_data != self._cached_image:
+            self._variants.clear()
+        self._cached_image = image_data
+        self._last_image_url = image_url
+        self._last_validated = time.monotonic()
+        _LOGGER.info("Successfully fetched image (%d bytes) from: %s", 
+                   len(image_data), image_url)
+        return image_data
+
+    async def _async_get_variant(
+        self, image_url: str, image_data: bytes, width: Optional[int], height: Optional[int]
+    ) -> bytes:
+        """Return a downscaled variant of the image from the LRU, creating it if needed."""
+        key = (image_url, width, height)
+        variant = self._variants.get(key)
+        if variant is not None:
+            self._variants.move_to_end(key)
+            self._variant_hits += 1
+            return variant
+        
+        self._variant_misses += 1
+        try:
+            variant = await self.hass.async_add_executor_job(
+                resize_image, image_data, width, height, VARIANT_JPEG_QUALITY
+            )
+        except Exception as err:
+            _LOGGER.warning("Could not resize image to %sx%s: %s", width, height, err)
+            return image_data
+        
+        self._variants[key] = variant
+        while len(self._variants) > VARIANT_CACHE_SIZE:
+            self._variants.popitem(last=False)
+        _LOGGER.debug(
+            "Created %sx%s variant of %s (%d -> %d bytes)",
+            width, height, image_url, len(image_data), len(variant)
+        )
+        return variant
+
     @property
     def extra_state_attributes(self):
         """Return additional state attributes."""
@@ -3,15 +3,24 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import os
-import uuid
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.components.camera import async_get_image
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+
+from .image_processing import optimize_snapshot, select_best_frame
+from .snapshot_store import (
+    SnapshotStore,
+    async_acquire_snapshot_store,
+    async_release_snapshot_store,
+    content_digest,
+)
+from .snapshot_view import SnapshotBuffer, async_get_snapshot_buffer, build_snapshot_url
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,8 +29,15 @@ DEFAULT_SNAPSHOT_CONFIG = {
     "quality": 90,
     "timeout": 10,
     "max_file_size": 5 * 1024 * 1024,  # 5MB
+    "optimize_images": True,
+    "max_long_edge": 1920,
+    "burst_frames": 1,
+    "burst_interval": 0.2,
     "cleanup_after_hours": 24,
-    "filename_template": "doorbell_snapshot_{timestamp}_{uuid}.jpg"
+    "cleanup_interval_minutes": 30,
+    "max_storage_mb": 200,
+    "persist_snapshots": True,
+    "stream_token_ttl": 300,
 }
 
 
@@ -37,21 +53,56 @@ class CameraManager:
         self._snapshots_taken = 0
         self._last_snapshot_time = None
         self._failed_snapshots = 0
+        self._last_write_ms = None
+        self._bytes_saved_total = 0
+        self._processing_cpu_ms_total = 0.0
+        self._images_processed = 0
+        self._last_processing = None
+        self._last_burst = None
+        self._persist_failures = 0
+        self._buffer: Optional[SnapshotBuffer] = None
+        self._store: Optional[SnapshotStore] = None
+        self._cleanup_unsub = None
         
     async def async_setup(self, config: Dict[str, Any]) -> None:
         """Set up the camera manager with configuration."""
         # Update configuration
         self._config.update(config.get("camera_config", {}))
         
+        # Recent snapshots are served from memory, disk is only for history
+        self._buffer = async_get_snapshot_buffer(self.hass)
+        
         # Set up www directory path
         self._www_path = Path(self.hass.config.path("www"))
-        
-        # Create snapshots subdirectory
         snapshots_dir = self._www_path / "whorang_snapshots"
-        snapshots_dir.mkdir(exist_ok=True)
+        
+        # Snapshots are content addressed, duplicates of a frame share one file.
+        # The store is shared with other entries writing to the same directory
+        self._store = await async_acquire_snapshot_store(
+            self.hass,
+            snapshots_dir,
+            self,
+            max_bytes=int(self._config["max_storage_mb"] * 1024 * 1024),
+            max_age_seconds=self._config["cleanup_after_hours"] * 3600,
+        )
+        
+        self._cleanup_unsub = async_track_time_interval(
+            self.hass,
+            self._async_cleanup_old_snapshots,
+            timedelta(minutes=self._config.get("cleanup_interval_minutes", 30)),
+        )
         
         _LOGGER.info("Camera manager setup complete. Snapshots will be saved to: %s", snapshots_dir)
 
+    async def async_shutdown(self) -> None:
+        """Shutdown the camera manager."""
+        if self._cleanup_unsub:
+            self._cleanup_unsub()
+            self._cleanup_unsub = None
+        if self._store:
+            await async_release_snapshot_store(self.hass, self._store, self)
+            self._store = None
+
     async def async_capture_snapshot(self, camera_entity: str, event_context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Capture a snapshot from the specified camera entity."""
         try:
@@ -71,31 +122,61 @@ class CameraManager:
             
             _LOGGER.info("Capturing snapshot from camera: %s", camera_entity)
             
+            # Per-step milliseconds, added to the doorbell trace by the caller
+            timings: Dict[str, float] = {}
+            
             # Add delay if configured (some cameras need time after doorbell trigger)
             snapshot_delay = event_context.get("snapshot_delay", self._config.get("snapshot_delay", 1))
             if snapshot_delay > 0:
                 _LOGGER.debug("Waiting %s seconds before snapshot", snapshot_delay)
                 await asyncio.sleep(snapshot_delay)
-            
-            # Capture image from camera
-            image_data = await self._get_camera_image(camera_entity)
+                timings["snapshot_delay"] = snapshot_delay * 1000
+            
+            # Capture image from camera, picking the sharpest of a burst if configured
+            burst = None
+            started = time.perf_counter()
+            burst_frames = int(event_context.get("burst_frames", self._config.get("burst_frames", 1)))
+            if burst_frames > 1:
+                image_data, burst = await self._capture_burst(camera_entity, burst_frames)
+            else:
+                image_data = await self._get_camera_image(camera_entity)
+            timings["camera_fetch"] = round((time.perf_counter() - started) * 1000, 1)
             if not image_data:
                 _LOGGER.error("Failed to get image data from camera: %s", camera_entity)
                 self._failed_snapshots += 1
                 return None
             
-            # Generate filename
-            filename = self._generate_filename(camera_entity, event_context)
-            
-            # Save image to www directory
-            file_path = await self._save_snapshot(image_data, filename)
-            if not file_path:
-                _LOGGER.error("Failed to save snapshot to file")
-                self._failed_snapshots += 1
-                return None
+            # Shrink the frame before it is stored and sent for analysis
+            processing = None
+            if self._config.get("optimize_images", True):
+                started = time.perf_counter()
+                image_data, processing = await self._process_image(image_data)
+                timings["image_processing"] = round((time.perf_counter() - started) * 1000, 1)
+            
+            # Buffer the frame in memory so it can be served without touching disk
+            snapshot_id = await self.hass.async_add_executor_job(content_digest, image_data)
+            filename = f"{snapshot_id}.jpg"
+            self._buffer.put(snapshot_id, image_data)
+            stream_url = build_snapshot_url(
+                self.hass,
+                self._buffer.sign_path(snapshot_id, self._config.get("stream_token_ttl", 300)),
+            )
             
-            # Generate accessible URL
-            snapshot_url = self._generate_snapshot_url(filename)
+            # Persist to the www directory in the background
+            duplicate = self._store.contains(filename)
+            if self._config.get("persist_snapshots", True):
+                self.hass.async_create_background_task(
+                    self._save_snapshot(image_data, snapshot_id, event_context.get("correlation_id")),
+                    f"whorang_save_snapshot_{snapshot_id}",
+                )
+                file_path = str(self._store.path_for(filename))
+                snapshot_url = self._generate_snapshot_url(filename)
+            else:
+                # The signed URL expires within minutes, it must not end up in
+                # entity state or the backend record; the bytes are uploaded
+                # and the backend's stored copy becomes the visitor's image
+                file_path = None
+                snapshot_url = None
             
             # Update statistics
             self._snapshots_taken += 1
@@ -104,18 +185,21 @@ class CameraManager:
             snapshot_info = {
                 "camera_entity": camera_entity,
                 "filename": filename,
-                "file_path": str(file_path),
+                "snapshot_id": snapshot_id,
+                "file_path": file_path,
                 "url": snapshot_url,
+                "stream_url": stream_url,
                 "timestamp": datetime.now().isoformat(),
                 "file_size": len(image_data),
+                "duplicate": duplicate,
+                "processing": processing,
+                "burst": burst,
+                "timings": timings,
                 "event_context": event_context
             }
             
             _LOGGER.info("Snapshot captured successfully: %s (%d bytes)", filename, len(image_data))
             
-            # Schedule cleanup of old snapshots
-            asyncio.create_task(self._cleanup_old_snapshots())
-            
             return snapshot_info
             
         except Exception as err:
@@ -133,11 +217,6 @@ class CameraManager:
                 timeout=self._config["timeout"]
             )
             
-            # Check file size
-            if len(image_data) > self._config["max_file_size"]:
-                _LOGGER.warning("Snapshot too large (%d bytes), truncating", len(image_data))
-                # Could implement image compression here if needed
-            
             return image_data
             
         except HomeAssistantError as err:
@@ -150,46 +229,99 @@ class CameraManager:
             _LOGGER.error("Unexpected error getting camera image: %s", err)
             return None
 
-    def _generate_filename(self, camera_entity: str, event_context: Dict[str, Any]) -> str:
-        """Generate a unique filename for the snapshot."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
+    def get_image_data(self, snapshot_id: str) -> Optional[bytes]:
+        """Return the bytes of a recent snapshot if still held in memory."""
+        if self._buffer is None:
+            return None
+        return self._buffer.get(snapshot_id)
+
+    async def _capture_burst(
+        self, camera_entity: str, frame_count: int
+    ) -> tuple[Optional[bytes], Optional[Dict[str, Any]]]:
+        """Capture a burst of frames and keep the best one."""
+        interval = self._config.get("burst_interval", 0.2)
+        burst_started = time.perf_counter()
+        frames: List[bytes] = []
+        capture_ms: List[float] = []
+        
+        for index in range(frame_count):
+            if index:
+                await asyncio.sleep(interval)
+            frame_started = time.perf_counter()
+            frame = await self._get_camera_image(camera_entity)
+            if frame:
+                frames.append(frame)
+                capture_ms.append(round((time.perf_counter() - frame_started) * 1000, 1))
         
-        # Extract camera name from entity ID
-        camera_name = camera_entity.replace("camera.", "").replace("_", "-")
+        if not frames:
+            return None, None
         
-        # Use template or default format
-        template = self._config.get("filename_template", DEFAULT_SNAPSHOT_CONFIG["filename_template"])
+        best, scores, scoring_cpu_ms = await self.hass.async_add_executor_job(select_best_frame, frames)
         
-        filename = template.format(
-            timestamp=timestamp,
-            uuid=unique_id,
-            camera_name=camera_name,
-            camera_entity=camera_entity.replace(".", "_")
+        burst = {
+            "frames_requested": frame_count,
+            "frames_captured": len(frames),
+            "selected_frame": best,
+            "scores": scores,
+            "capture_ms": capture_ms,
+            "scoring_cpu_ms": scoring_cpu_ms,
+            "total_ms": round((time.perf_counter() - burst_started) * 1000, 1),
+        }
+        self._last_burst = burst
+        _LOGGER.debug(
+            "Burst of %d frames from %s, selected frame %d (score %.1f) in %.0f ms",
+            len(frames), camera_entity, best, scores[best]["score"], burst["total_ms"]
         )
+        return frames[best], burst
+
+    async def _process_image(self, image_data: bytes) -> tuple[bytes, Optional[Dict[str, Any]]]:
+        """Downscale and recompress a frame in the executor."""
+        try:
+            processed, stats = await self.hass.async_add_executor_job(
+                optimize_snapshot,
+                image_data,
+                self._config["max_long_edge"],
+                self._config["quality"],
+                self._config["max_file_size"],
+            )
+        except Exception as err:
+            _LOGGER.warning("Could not optimize snapshot, using original frame: %s", err)
+            return image_data, None
         
-        # Ensure .jpg extension
-        if not filename.lower().endswith('.jpg'):
-            filename += '.jpg'
+        self._images_processed += 1
+        self._bytes_saved_total += stats["bytes_saved"]
+        self._processing_cpu_ms_total += stats["cpu_time_ms"]
+        self._last_processing = stats
         
-        return filename
+        _LOGGER.debug(
+            "Optimized snapshot %s -> %s, %d -> %d bytes in %.1f ms CPU",
+            stats["original_resolution"], stats["resolution"],
+            stats["original_bytes"], stats["processed_bytes"], stats["cpu_time_ms"]
+        )
+        return processed, stats
 
-    async def _save_snapshot(self, image_data: bytes, filename: str) -> Optional[Path]:
-        """Save snapshot image data to file."""
+    async def _save_snapshot(
+        self, image_data: bytes, snapshot_id: str, correlation_id: Optional[str] = None
+    ) -> None:
+        """Save snapshot image data to the snapshot store."""
         try:
-            snapshots_dir = self._www_path / "whorang_snapshots"
-            file_path = snapshots_dir / filename
-            
-            # Write image data to file
-            with open(file_path, 'wb') as f:
-                f.write(image_data)
-            
-            _LOGGER.debug("Saved snapshot to: %s", file_path)
-            return file_path
+            # Writing runs in the executor, slow storage must not stall the event loop
+            started = time.perf_counter()
+            filename, duplicate = await self._store.async_put(image_data, snapshot_id)
+            self._last_write_ms = round((time.perf_counter() - started) * 1000, 2)
+            trace = self.coordinator.traces.get(correlation_id)
+            if trace:
+                trace.add_stage("disk_write", self._last_write_ms)
+            
+            _LOGGER.debug(
+                "Saved snapshot to: %s in %s ms%s",
+                self._store.path_for(filename), self._last_write_ms,
+                " (duplicate frame)" if duplicate else ""
+            )
             
         except Exception as err:
+            self._persist_failures += 1
             _LOGGER.error("Error saving snapshot file: %s", err)
-            return None
 
     def _generate_snapshot_url(self, filename: str) -> str:
         """Generate accessible URL for the snapshot."""
@@ -202,25 +334,10 @@ class CameraManager:
             # Fallback to relative URL
             return f"/local/whorang_snapshots/{filename}"
 
-    async def _cleanup_old_snapshots(self) -> None:
-        """Clean up old snapshot files."""
+    async def _async_cleanup_old_snapshots(self, now: Optional[datetime] = None) -> None:
+        """Evict snapshots older than the retention period or over quota."""
         try:
-            snapshots_dir = self._www_path / "whorang_snapshots"
-            if not snapshots_dir.exists():
-                return
-            
-            cleanup_hours = self._config.get("cleanup_after_hours", 24)
-            cutoff_time = datetime.now().timestamp() - (cleanup_hours * 3600)
-            
-            files_deleted = 0
-            for file_path in snapshots_dir.glob("*.jpg"):
-                try:
-                    if file_path.stat().st_mtime < cutoff_time:
-                        file_path.unlink()
-                        files_deleted += 1
-                except Exception as err:
-                    _LOGGER.debug("Error deleting old snapshot %s: %s", file_path, err)
-            
+            files_deleted = await self._store.async_evict()
             if files_deleted > 0:
                 _LOGGER.info("Cleaned up %d old snapshot files", files_deleted)
                 
@@ -293,6 +410,18 @@ class CameraManager:
             "snapshots_taken": self._snapshots_taken,
             "failed_snapshots": self._failed_snapshots,
             "last_snapshot_time": self._last_snapshot_time.isoformat() if self._last_snapshot_time else None,
+            "last_write_ms": self._last_write_ms,
+            "images_processed": self._images_processed,
+            "bytes_saved_total": self._bytes_saved_total,
+            "avg_processing_cpu_ms": (
+                round(self._processing_cpu_ms_total / self._images_processed, 2)
+                if self._images_processed else None
+            ),
+            "last_processing": self._last_processing,
+            "last_burst": self._last_burst,
+            "persist_failures": self._persist_failures,
+            **(self._store.get_statistics() if self._store else {}),
+            **(self._buffer.get_statistics() if self._buffer else {}),
             "success_rate": (
                 self._snapshots_taken / (self._snapshots_taken + self._failed_snapshots) * 100
                 if (self._snapshots_taken + self._failed_snapshots) > 0 else 0
@@ -350,4 +479,10 @@ class CameraManager:
     def update_config(self, new_config: Dict[str, Any]) -> None:
         """Update camera manager configuration."""
         self._config.update(new_config)
+        if self._store:
+            self._store.set_limits(
+                self,
+                int(self._config["max_storage_mb"] * 1024 * 1024),
+                self._config["cleanup_after_hours"] * 3600,
+            )
         _LOGGER.info("Camera manager configuration updated")
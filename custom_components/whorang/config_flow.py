@@ -9,10 +9,11 @@ from typing import Any, Dict, Optional, Tuple
 import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult, FlowResultType
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import slugify
 
 from .api_client import WhoRangAPIClient, WhoRangConnectionError, WhoRangAuthError
 from .const import (
@@ -96,9 +97,21 @@ def parse_whorang_url(url_input: str) -> Tuple[str, int, bool]:
             return url_input, 443, True
 
 
+def entry_unique_id(host: str, port: int, name: Optional[str] = None) -> str:
+    """Return the unique id of an entry.
+
+    Named entries can share a backend, for example one entry per doorbell,
+    they then share its connection through the backend hub.
+    """
+    if name:
+        return f"{host}:{port}:{slugify(name)}"
+    return f"{host}:{port}"
+
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_URL, description="WhoRang URL"): str,
+        vol.Optional(CONF_NAME, description="Entry name (optional)"): str,
         vol.Optional(CONF_API_KEY, description="API Key (optional)"): str,
         vol.Optional(CONF_VERIFY_SSL, default=True): bool,
     }
@@ -142,9 +155,12 @@ async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str,
         # Get system info for additional validation
         system_info = await api_client.get_system_info()
         
+        name = (data.get(CONF_NAME) or "").strip()
+        
         # Return info that you want to store in the config entry.
         return {
-            "title": f"WhoRang ({host}:{port})",
+            "title": f"WhoRang {name} ({host}:{port})" if name else f"WhoRang ({host}:{port})",
+            "unique_id": entry_unique_id(host, port, name),
             "system_info": system_info,
             "parsed_data": {
                 CONF_HOST: host,
@@ -188,13 +204,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # Try auto-discovery first if no user input
         if user_input is None:
             discovered_backend = await self._async_try_auto_discovery()
-            if discovered_backend:
+            # An addon that is already configured can still get named entries
+            if discovered_backend and entry_unique_id(*discovered_backend) not in self._async_current_ids():
                 host, port = discovered_backend
                 _LOGGER.info("Auto-discovered WhoRang addon at %s:%s", host, port)
                 
-                # Check if already configured
-                await self.async_set_unique_id(f"{host}:{port}")
-                self._abort_if_unique_id_configured()
+                await self.async_set_unique_id(entry_unique_id(host, port))
                 
                 # Auto-configure with discovered backend
                 self._config_data = {
@@ -224,10 +239,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = ERROR_UNKNOWN
             else:
-                # Check if already configured using parsed host:port
-                await self.async_set_unique_id(
-                    f"{parsed_data[CONF_HOST]}:{parsed_data[CONF_PORT]}"
-                )
+                # Check if already configured, named entries may share a backend
+                await self.async_set_unique_id(info["unique_id"])
                 self._abort_if_unique_id_configured()
 
                 # Store config data and proceed to AI providers step
@@ -414,7 +427,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         # Check if already configured
         await self.async_set_unique_id(
-            f"{discovery_info[CONF_HOST]}:{discovery_info[CONF_PORT]}"
+            entry_unique_id(discovery_info[CONF_HOST], discovery_info[CONF_PORT])
         )
         self._abort_if_unique_id_configured()
 
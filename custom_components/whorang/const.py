@@ -131,6 +131,9 @@ API_DETECTED_FACES: Final = "/api/detected-faces"
 API_OPENAI: Final = "/api/openai"
 WEBSOCKET_PATH: Final = "/ws"
 
+# Header carrying the doorbell event correlation id to the backend
+CORRELATION_ID_HEADER: Final = "X-Correlation-ID"
+
 # Entity unique ID prefixes
 SENSOR_PREFIX: Final = "sensor"
 BINARY_SENSOR_PREFIX: Final = "binary_sensor"
@@ -149,6 +152,9 @@ SENSOR_AI_PROVIDER_ACTIVE: Final = "ai_provider_active"
 SENSOR_AI_COST_TODAY: Final = "ai_cost_today"
 SENSOR_AI_COST_MONTH: Final = "ai_cost_month"
 SENSOR_AI_RESPONSE_TIME: Final = "ai_response_time"
+SENSOR_AI_RESPONSE_TIME_P95: Final = "ai_response_time_p95"
+SENSOR_DOORBELL_LATENCY: Final = "doorbell_latency"
+SENSOR_API_REQUESTS: Final = "api_requests"
 SENSOR_KNOWN_FACES_COUNT: Final = "known_faces_count"
 SENSOR_UNKNOWN_FACES: Final = "unknown_faces"
 SENSOR_LATEST_FACE_DETECTION: Final = "latest_face_detection"
@@ -189,7 +195,23 @@ SERVICE_CREATE_PERSON_FROM_FACE: Final = "create_person_from_face"
 SERVICE_GET_UNKNOWN_FACES: Final = "get_unknown_faces"
 SERVICE_DELETE_FACE: Final = "delete_face"
 SERVICE_GET_FACE_SIMILARITIES: Final = "get_face_similarities"
+SERVICE_CLUSTER_UNKNOWN_FACES: Final = "cluster_unknown_faces"
+SERVICE_BULK_FACE_OPERATION: Final = "bulk_face_operation"
+SERVICE_PROFILE: Final = "profile"
+
+# Storage
+STORAGE_VERSION: Final = 1
+STORAGE_KEY_MERGE_CHECKPOINTS: Final = f"{DOMAIN}.merge_checkpoints"
+STORAGE_KEY_SNAPSHOT_INDEX: Final = f"{DOMAIN}.snapshot_index"
+STORAGE_KEY_VISITOR_HISTORY: Final = f"{DOMAIN}.visitor_history"
+STORAGE_KEY_AI_USAGE: Final = f"{DOMAIN}.ai_usage"
+STORAGE_KEY_VISITOR_SERIES: Final = f"{DOMAIN}.visitor_series"
 
+# hass.data keys shared by all config entries
+DATA_SNAPSHOT_BUFFER: Final = f"{DOMAIN}_snapshot_buffer"
+DATA_SNAPSHOT_STORE: Final = f"{DOMAIN}_snapshot_store"
+DATA_BACKEND_HUBS: Final = f"{DOMAIN}_backend_hubs"
+DATA_PROFILE_SESSION: Final = f"{DOMAIN}_profile_session"
 
 # WebSocket message types
 WS_TYPE_NEW_VISITOR: Final = "new_visitor"
@@ -240,6 +262,7 @@ ATTR_KNOWN_FACES: Final = "known_faces"
 ATTR_FACE_DETAILS: Final = "face_details"
 ATTR_REQUIRES_LABELING: Final = "requires_labeling"
 ATTR_SIMILARITY_SCORE: Final = "similarity_score"
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
 
 # Event types for automation
 EVENT_VISITOR_DETECTED: Final = f"{DOMAIN}_visitor_detected"
@@ -249,6 +272,8 @@ EVENT_FACE_DETECTION_COMPLETE: Final = f"{DOMAIN}_face_detection_complete"
 EVENT_UNKNOWN_FACE_DETECTED: Final = f"{DOMAIN}_unknown_face_detected"
 EVENT_FACE_LABELED: Final = f"{DOMAIN}_face_labeled"
 EVENT_PERSON_CREATED: Final = f"{DOMAIN}_person_created"
+EVENT_FACE_CLUSTERS_UPDATED: Final = f"{DOMAIN}_face_clusters_updated"
+EVENT_MERGE_PROGRESS: Final = f"{DOMAIN}_merge_progress"
 
 # Intelligent Automation Events (HA 2025+ Compatible)
 EVENT_DOORBELL_DETECTED: Final = f"{DOMAIN}_doorbell_detected"
@@ -4,20 +4,33 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-import websockets
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api_client import WhoRangAPIClient, WhoRangConnectionError
+from .ai_usage import AIUsageAggregator
 from .api_client_enhanced import WhoRangAPIClientEnhanced
+from .hub import async_get_backend_hub
+from .latency_stats import AILatencyTracker, parse_duration_ms
+from .tracing import DoorbellTraceBuffer
+from .visitor_history import VisitorImageHistory
+from .visitor_series import (
+    LABEL_KNOWN,
+    LABEL_SERVICE_CALL,
+    LABEL_UNKNOWN,
+    VisitorTimeSeries,
+    parse_visitor_timestamp,
+)
 from .const import (
     DOMAIN,
     DEFAULT_UPDATE_INTERVAL,
-    DEFAULT_WEBSOCKET_TIMEOUT,
-    WEBSOCKET_PATH,
     WS_TYPE_NEW_VISITOR,
     WS_TYPE_CONNECTION_STATUS,
     WS_TYPE_AI_ANALYSIS_COMPLETE,
@@ -31,6 +44,9 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Pages of 100 visitors read to seed the visitor time series
+VISITOR_SERIES_SEED_PAGES = 10
+
 
 class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the WhoRang API and WebSocket."""
@@ -44,40 +60,74 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         backend_url: Optional[str] = None,
         discovery_timeout: int = 10,
         retry_attempts: int = 3,
+        config_entry: Optional[ConfigEntry] = None,
     ) -> None:
         """Initialize the coordinator with enhanced API client support."""
         # Check if we should use the enhanced API client
-        if isinstance(api_client, WhoRangAPIClientEnhanced):
-            self.api_client = api_client
-        else:
+        if not isinstance(api_client, WhoRangAPIClientEnhanced):
             # Upgrade to enhanced API client for better deployment support
             _LOGGER.info("Upgrading to enhanced API client for deployment detection")
-            self.api_client = WhoRangAPIClientEnhanced(
-                host=getattr(api_client, 'host', None),
-                port=getattr(api_client, 'port', None),
-                use_ssl=getattr(api_client, 'use_ssl', False),
-                api_key=getattr(api_client, 'api_key', None),
-                verify_ssl=getattr(api_client, 'verify_ssl', True),
-                session=getattr(api_client, '_session', None),
-                timeout=getattr(api_client, 'timeout', 30),
-                ollama_config=getattr(api_client, 'ollama_config', None),
+            basic_client = api_client
+            api_client = WhoRangAPIClientEnhanced(
+                host=getattr(basic_client, 'host', None),
+                port=getattr(basic_client, 'port', None),
+                use_ssl=getattr(basic_client, 'use_ssl', False),
+                api_key=getattr(basic_client, 'api_key', None),
+                verify_ssl=getattr(basic_client, 'verify_ssl', True),
+                session=getattr(basic_client, '_session', None),
+                timeout=getattr(basic_client, 'timeout', 30),
+                ollama_config=getattr(basic_client, 'ollama_config', None),
                 backend_url=backend_url,
                 discovery_timeout=discovery_timeout,
                 retry_attempts=retry_attempts,
             )
+            # The session opened by the basic client is handed over, so is closing it
+            api_client._close_session = getattr(basic_client, '_close_session', False)
+            basic_client._close_session = False
+        
+        # Entries using the same backend share its client, WebSocket and polling
+        self.hub = async_get_backend_hub(hass, api_client)
+        self.hub.async_add_coordinator(self)
+        self.api_client = self.hub.api_client
         
         self.enable_websocket = enable_websocket
-        self._websocket = None
-        self._websocket_task = None
-        self._reconnect_task = None
+        self._unsub_websocket = None
         self._last_visitor_id = None
         self._known_persons = {}
+        self._ai_template_config: Optional[Dict[str, Any]] = None
         
         # Phase 1: Intelligent automation components
         self._automation_engine = None
         self._doorbell_detector = None
         self._camera_manager = None
         
+        # Latest image camera entity, set by the camera platform for the diagnostics
+        self.latest_image_camera = None
+        
+        # Stored state is kept per entry, entries may share one backend
+        storage_suffix = config_entry.entry_id if config_entry is not None else None
+        
+        # Recent visitor images for the camera entity and media browser
+        thumbnail_dir = Path(hass.config.path(DOMAIN, "thumbnails"))
+        self.visitor_history = VisitorImageHistory(
+            hass,
+            self.api_client.get_image_bytes,
+            storage_suffix,
+            thumbnail_dir=thumbnail_dir / storage_suffix if storage_suffix else thumbnail_dir,
+        )
+        
+        # AI cost and latency aggregated from analysis events
+        self.ai_usage = AIUsageAggregator(hass, storage_suffix)
+        
+        # Rolling AI response time percentiles per provider and model
+        self.ai_latency = AILatencyTracker()
+        
+        # Per-stage timings of recent doorbell events by correlation id
+        self.traces = DoorbellTraceBuffer()
+        
+        # Visitor event timestamps for restart-safe visitor counts
+        self.visitor_series = VisitorTimeSeries(hass, storage_suffix)
+        
         # Initialize with default data structure to prevent None errors
         self.data = {
             "latest_visitor": {},
@@ -88,141 +138,28 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             "last_service_call": {}
         }
         
-        # Build WebSocket URL with proper protocol
-        self.websocket_url = self._build_websocket_url()
-        
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=update_interval),
         )
+        # The entry this coordinator belongs to, services and the automation
+        # engine read their options from it instead of searching all entries
+        if config_entry is not None:
+            self.config_entry = config_entry
 
-    def _build_websocket_url(self) -> str:
-        """Build WebSocket URL from API client configuration."""
-        # Use ws:// for HTTP and wss:// for HTTPS
-        scheme = "wss" if self.api_client.use_ssl else "ws"
-        host = self.api_client.host
-        port = self.api_client.port
-        
-        # Handle standard ports
-        if (self.api_client.use_ssl and port == 443) or (not self.api_client.use_ssl and port == 80):
-            return f"{scheme}://{host}{WEBSOCKET_PATH}"
-        else:
-            return f"{scheme}://{host}:{port}{WEBSOCKET_PATH}"
+    @property
+    def websocket_url(self) -> str:
+        """Return the URL of the shared WebSocket connection."""
+        return self.hub.websocket_url
 
     async def _async_update_data(self) -> Dict[str, Any]:
         """Fetch data from API."""
         try:
             _LOGGER.debug("Updating coordinator data")
-            
-            # Get system information
-            system_info = await self.api_client.get_system_info()
-            
-            # Get latest visitor
-            latest_visitor = await self.api_client.get_latest_visitor()
-            
-            # Get known persons for face recognition
-            known_persons = await self.api_client.get_known_persons()
-            self._known_persons = {person["id"]: person for person in known_persons}
-            
-            # Get face gallery data for visual face management
-            face_gallery_data = await self.api_client.get_face_gallery_data()
-            
-            # Get AI usage stats if cost tracking is enabled
-            ai_usage = await self.api_client.get_ai_usage_stats(days=1)
-            
-            # Get current AI provider and model information
-            face_config = system_info.get("face_config", {})
-            current_ai_provider = face_config.get("ai_provider", "local")
-            current_ai_model = await self.api_client.get_current_ai_model()
-            
-            # Get available models for all providers
-            available_models = await self.api_client.get_available_models()
-            
-            # Special handling for local/Ollama provider - get dynamic models
-            ollama_models = []
-            ollama_status = {}
-            if current_ai_provider == "local":
-                try:
-                    # Use the new backend endpoint for dynamic model discovery
-                    local_models_response = await self.api_client.get_provider_models("local")
-                    if local_models_response:
-                        # Transform backend response to match expected format
-                        ollama_models = []
-                        for model in local_models_response:
-                            if isinstance(model, dict):
-                                ollama_models.append({
-                                    "name": model.get("value", ""),
-                                    "display_name": model.get("label", ""),
-                                    "size": model.get("size", 0),
-                                    "is_vision": model.get("is_vision", True),
-                                    "recommended": model.get("recommended", False)
-                                })
-                            elif isinstance(model, str):
-                                ollama_models.append({
-                                    "name": model,
-                                    "display_name": model,
-                                    "size": 0,
-                                    "is_vision": True,
-                                    "recommended": False
-                                })
-                        
-                        # Update available_models with dynamic Ollama models
-                        available_models["local"] = [model["name"] for model in ollama_models]
-                        _LOGGER.debug("Updated local models with %d Ollama models from backend", len(ollama_models))
-                    else:
-                        # Fallback to direct Ollama API if backend fails
-                        _LOGGER.debug("Backend model discovery failed, trying direct Ollama API")
-                        ollama_models = await self.api_client.get_ollama_models()
-                        if ollama_models:
-                            available_models["local"] = [model["name"] for model in ollama_models]
-                            _LOGGER.debug("Updated local models with %d Ollama models from direct API", len(ollama_models))
-                except Exception as e:
-                    _LOGGER.error("Failed to get Ollama models: %s", e)
-                    # Fallback to direct Ollama API
-                    try:
-                        ollama_models = await self.api_client.get_ollama_models()
-                        if ollama_models:
-                            available_models["local"] = [model["name"] for model in ollama_models]
-                            _LOGGER.debug("Updated local models with %d Ollama models from fallback", len(ollama_models))
-                    except Exception as fallback_error:
-                        _LOGGER.error("Fallback Ollama model discovery also failed: %s", fallback_error)
-                
-                # Get Ollama status
-                try:
-                    ollama_status = await self.api_client.get_ollama_status()
-                except Exception as e:
-                    _LOGGER.error("Failed to get Ollama status: %s", e)
-                    ollama_status = {"status": "unknown", "error": str(e)}
-            
-            # Detect if there's a new visitor
-            if latest_visitor and latest_visitor.get("visitor_id") != self._last_visitor_id:
-                self._last_visitor_id = latest_visitor.get("visitor_id")
-                await self._handle_new_visitor(latest_visitor)
-            
-            # Update existing data structure instead of replacing
-            updated_data = {
-                "system_info": system_info,
-                "latest_visitor": latest_visitor or {},
-                "known_persons": known_persons,
-                "face_gallery_data": face_gallery_data,
-                "ai_usage": ai_usage,
-                "current_ai_provider": current_ai_provider,
-                "current_ai_model": current_ai_model,
-                "available_models": available_models,
-                "ollama_models": ollama_models,
-                "ollama_status": ollama_status,
-                "last_update": datetime.now().isoformat(),
-                "websocket_connected": self._websocket is not None and not self._websocket.closed,
-            }
-            
-            # Preserve service call data if it exists
-            if hasattr(self, 'data') and self.data:
-                for key in ["latest_image", "doorbell_state", "visitor_stats", "last_service_call"]:
-                    if key in self.data:
-                        updated_data[key] = self.data[key]
-            
+            backend_data = await self.hub.async_fetch_data(self)
+            updated_data = await self._async_process_backend_data(backend_data)
             _LOGGER.debug("Coordinator data updated successfully")
             return updated_data
             
@@ -242,23 +179,90 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
                     "last_service_call": {}
                 }
 
+    async def async_handle_backend_data(self, backend_data: Dict[str, Any]) -> None:
+        """Apply backend data fetched by another coordinator of the same backend."""
+        try:
+            self.async_set_updated_data(await self._async_process_backend_data(backend_data))
+        except Exception as err:
+            _LOGGER.error("Error applying shared backend data: %s", err)
+
+    async def _async_process_backend_data(self, backend_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the coordinator data from fetched backend data."""
+        latest_visitor = backend_data["latest_visitor"]
+        known_persons = backend_data["known_persons"]
+        self._known_persons = {person["id"]: person for person in known_persons}
+        
+        backend_ai_usage = backend_data.get("backend_ai_usage")
+        if backend_ai_usage:
+            self.ai_usage.async_reconcile(backend_ai_usage)
+        
+        # Detect if there's a new visitor
+        if latest_visitor and latest_visitor.get("visitor_id") != self._last_visitor_id:
+            self._last_visitor_id = latest_visitor.get("visitor_id")
+            await self._handle_new_visitor(latest_visitor)
+        
+        # Update existing data structure instead of replacing
+        updated_data = {
+            **backend_data,
+            "latest_visitor": latest_visitor or {},
+            "ai_usage": self.ai_usage.usage_stats,
+            "visitor_stats": self.visitor_series.get_counts(),
+            "ai_latency": self.ai_latency.get_statistics(),
+            "last_update": datetime.now().isoformat(),
+            "websocket_connected": self.hub.websocket_connected,
+        }
+        
+        # Preserve service call data if it exists
+        if hasattr(self, 'data') and self.data:
+            for key in ["latest_image", "doorbell_state", "last_service_call"]:
+                if key in self.data:
+                    updated_data[key] = self.data[key]
+        
+        return updated_data
+
+    async def async_restore_statistics(self) -> None:
+        """Restore locally aggregated statistics before the first refresh."""
+        await self.ai_usage.async_load()
+        await self.visitor_series.async_load()
+        if not len(self.visitor_series):
+            await self._async_seed_visitor_series()
+
+    async def _async_seed_visitor_series(self) -> None:
+        """Seed the visitor time series with this month's backend visitors."""
+        start_of_month = dt_util.start_of_local_day().replace(day=1).timestamp()
+        seeded: List[Tuple[float, Optional[str]]] = []
+        try:
+            for page in range(1, VISITOR_SERIES_SEED_PAGES + 1):
+                response = await self.api_client.get_visitors(page=page, limit=100)
+                visitors = response.get("visitors", [])
+                page_visitors = [
+                    (timestamp, visitor.get("visitor_id")) for visitor in visitors
+                    if (timestamp := parse_visitor_timestamp(visitor.get("timestamp"))) is not None
+                ]
+                seeded.extend(page_visitors)
+                if len(visitors) < 100 or (
+                    page_visitors and min(timestamp for timestamp, _ in page_visitors) < start_of_month
+                ):
+                    break
+        except Exception as err:
+            _LOGGER.warning("Could not seed visitor counts from backend: %s", err)
+        
+        for timestamp, visitor_id in sorted(seeded, key=lambda visitor: visitor[0]):
+            self.visitor_series.async_record(timestamp, visitor_id=visitor_id)
+        _LOGGER.debug("Seeded visitor time series with %d visitors", len(seeded))
+
     async def async_setup(self) -> None:
         """Set up the coordinator."""
+        await self._async_setup_visitor_history()
+        
         # Initialize automation engine for Phase 1 intelligent automation
         try:
             from .automation_engine import AutomationEngine
             
-            # Get configuration from config entry
-            config_entry = None
-            for entry in self.hass.config_entries.async_entries("whorang"):
-                if entry.state.name == "loaded":
-                    config_entry = entry
-                    break
-            
-            if config_entry:
+            if self.config_entry:
                 # Initialize automation engine with configuration
                 self._automation_engine = AutomationEngine(self.hass, self)
-                await self._automation_engine.async_setup(config_entry.options)
+                await self._automation_engine.async_setup(self.config_entry.options)
                 _LOGGER.info("Phase 1 intelligent automation engine initialized successfully")
             else:
                 _LOGGER.warning("No config entry found for automation engine setup")
@@ -267,112 +271,33 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Failed to initialize automation engine: %s", err)
             # Continue without automation engine - existing functionality still works
         
-        # Start WebSocket connection if enabled
+        # Subscribe to the backend's WebSocket if enabled
         if self.enable_websocket:
-            await self._start_websocket()
+            self._unsub_websocket = self.hub.async_subscribe_messages(self._handle_websocket_message)
+
+    async def _async_setup_visitor_history(self) -> None:
+        """Restore the visitor history, seeding it from the backend when empty."""
+        try:
+            await self.visitor_history.async_load()
+            if self.visitor_history.get_visitors():
+                return
+            response = await self.api_client.get_visitors(page=1, limit=self.visitor_history.max_items)
+            for visitor in reversed(response.get("visitors", [])):
+                await self.visitor_history.async_add(visitor)
+        except Exception as err:
+            _LOGGER.warning("Could not set up visitor history: %s", err)
 
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator."""
-        await self._stop_websocket()
-        await self.api_client.close()
-
-    async def _start_websocket(self) -> None:
-        """Start WebSocket connection."""
-        if self._websocket_task is not None:
-            return
-            
-        _LOGGER.debug("Starting WebSocket connection to %s", self.websocket_url)
-        self._websocket_task = asyncio.create_task(self._websocket_handler())
-
-    async def _stop_websocket(self) -> None:
-        """Stop WebSocket connection."""
-        if self._websocket_task:
-            self._websocket_task.cancel()
-            try:
-                await self._websocket_task
-            except asyncio.CancelledError:
-                pass
-            self._websocket_task = None
-            
-        if self._reconnect_task:
-            self._reconnect_task.cancel()
-            try:
-                await self._reconnect_task
-            except asyncio.CancelledError:
-                pass
-            self._reconnect_task = None
-            
-        if self._websocket:
-            await self._websocket.close()
-            self._websocket = None
-
-    async def _websocket_handler(self) -> None:
-        """Handle WebSocket connection with auto-reconnect."""
-        reconnect_delay = 1
-        max_reconnect_delay = 60
-        
-        while True:
-            try:
-                _LOGGER.debug("Connecting to WebSocket at %s", self.websocket_url)
-                
-                # Prepare connection parameters
-                connect_kwargs = {
-                    "timeout": DEFAULT_WEBSOCKET_TIMEOUT,
-                    "ping_interval": 20,
-                    "ping_timeout": 10,
-                }
-                
-                # Add SSL context if using HTTPS
-                if self.api_client.use_ssl and self.api_client._ssl_context:
-                    connect_kwargs["ssl"] = self.api_client._ssl_context
-                
-                # Add headers if API key is present
-                if self.api_client.api_key:
-                    connect_kwargs["extra_headers"] = {
-                        "Authorization": f"Bearer {self.api_client.api_key}"
-                    }
-                
-                async with websockets.connect(
-                    self.websocket_url,
-                    **connect_kwargs
-                ) as websocket:
-                    self._websocket = websocket
-                    reconnect_delay = 1  # Reset delay on successful connection
-                    
-                    _LOGGER.info("WebSocket connected to WhoRang")
-                    
-                    # Listen for messages
-                    async for message in websocket:
-                        try:
-                            await self._handle_websocket_message(message)
-                        except Exception as err:
-                            _LOGGER.error("Error handling WebSocket message: %s", err)
-                            
-            except websockets.exceptions.InvalidStatusCode as err:
-                if err.status_code == 400:
-                    _LOGGER.error("WebSocket connection rejected (400). Check if WebSocket endpoint exists at %s", self.websocket_url)
-                elif err.status_code == 401:
-                    _LOGGER.error("WebSocket authentication failed (401). Check API key.")
-                else:
-                    _LOGGER.error("WebSocket connection failed with status %s: %s", err.status_code, err)
-                self._websocket = None
-                await asyncio.sleep(reconnect_delay)
-                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
-                
-            except (websockets.exceptions.ConnectionClosed, OSError) as err:
-                _LOGGER.warning("WebSocket connection lost: %s", err)
-                self._websocket = None
-                
-                # Exponential backoff for reconnection
-                _LOGGER.debug("Reconnecting in %s seconds", reconnect_delay)
-                await asyncio.sleep(reconnect_delay)
-                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
-                
-            except Exception as err:
-                _LOGGER.error("Unexpected WebSocket error: %s", err)
-                self._websocket = None
-                await asyncio.sleep(reconnect_delay)
-                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+        await self.visitor_history.async_flush()
+        await self.ai_usage.async_flush()
+        await self.visitor_series.async_flush()
+        if self._automation_engine:
+            await self._automation_engine.async_shutdown()
+        if self._unsub_websocket:
+            self._unsub_websocket()
+            self._unsub_websocket = None
+        await self.hub.async_remove_coordinator(self)
 
     async def _handle_websocket_message(self, message) -> None:
         """Handle incoming WebSocket message with support for both string and JSON formats.
@@ -469,6 +394,9 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             
             if message_type == WS_TYPE_NEW_VISITOR or message_type == "new_visitor":
                 await self._handle_new_visitor(message_data)
+                if self.data:
+                    self.data["visitor_stats"] = self.visitor_series.get_counts()
+                    self.async_set_updated_data(self.data)
                 
             elif message_type == WS_TYPE_AI_ANALYSIS_COMPLETE or message_type == "ai_analysis_complete":
                 await self._handle_ai_analysis_complete(message_data)
@@ -522,9 +450,21 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         # Update last visitor ID
         self._last_visitor_id = visitor_data.get("visitor_id")
         
+        trace = self.traces.find(visitor_data)
+        if trace:
+            trace.mark("visitor_received")
+        
+        await self.visitor_history.async_add(visitor_data)
+        
         # Check if this is a known visitor
         is_known_visitor = self._is_known_visitor(visitor_data)
         
+        self.visitor_series.async_record(
+            parse_visitor_timestamp(visitor_data.get("timestamp")),
+            LABEL_KNOWN if is_known_visitor else LABEL_UNKNOWN,
+            visitor_data.get("visitor_id"),
+        )
+        
         # Fire Home Assistant events
         event_type = EVENT_KNOWN_VISITOR_DETECTED if is_known_visitor else EVENT_VISITOR_DETECTED
         
@@ -547,8 +487,23 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         """Handle AI analysis complete event."""
         _LOGGER.debug("AI analysis complete: %s", analysis_data.get("visitor_id"))
         
+        processing_time = analysis_data.get("processing_time") or analysis_data.get("processing_time_ms")
+        self.ai_usage.async_record(
+            analysis_data.get("ai_provider"), analysis_data.get("cost_usd"), processing_time
+        )
+        self.ai_latency.record(
+            analysis_data.get("ai_provider"), self._analysis_model(analysis_data), processing_time
+        )
+        trace = self.traces.find(analysis_data)
+        if trace:
+            trace.add_stage("ai_processing", parse_duration_ms(processing_time))
+            trace.mark("ai_complete")
+        
         # Update coordinator data with processing time information
         if hasattr(self, 'data') and self.data:
+            self.data["ai_usage"] = self.ai_usage.usage_stats
+            self.data["ai_latency"] = self.ai_latency.get_statistics()
+            
             # Update latest visitor with processing time
             if "latest_visitor" in self.data:
                 self.data["latest_visitor"].update({
@@ -583,6 +538,13 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             }
         )
 
+    def _analysis_model(self, analysis_data: Dict[str, Any]) -> Optional[str]:
+        """Return the AI model of an analysis, the current model if not given."""
+        model = analysis_data.get("ai_model") or analysis_data.get("model")
+        if not model and self.data:
+            model = self.data.get("current_ai_model")
+        return model
+
     async def _handle_face_detection_complete(self, face_data: Dict[str, Any]) -> None:
         """Handle face detection complete event."""
         _LOGGER.debug("Face detection complete: %s", face_data.get("visitor_id"))
@@ -679,8 +641,9 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         )
         
         # Reset local visitor statistics
+        self.visitor_series.async_clear()
         if hasattr(self, 'data') and self.data:
-            self.data["visitor_stats"] = {}
+            self.data["visitor_stats"] = self.visitor_series.get_counts()
             self.async_set_updated_data(self.data)
 
     async def _handle_analysis_started(self, analysis_data: Dict[str, Any]) -> None:
@@ -713,6 +676,10 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         """Handle automatic AI analysis completed event."""
         _LOGGER.info("AI analysis completed for visitor: %s", analysis_data.get('visitor_id'))
         
+        trace = self.traces.find(analysis_data)
+        if trace:
+            trace.mark("ai_complete")
+        
         # Update coordinator data with analysis results
         if hasattr(self, 'data') and self.data:
             # Update latest visitor with analysis results
@@ -764,8 +731,11 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
         _LOGGER.warning("AI analysis error for visitor %s: %s", 
                        error_data.get("visitor_id"), error_data.get("error"))
         
+        self.ai_latency.record_error(error_data.get("provider"), self._analysis_model(error_data))
+        
         # Update coordinator data to show analysis failed
         if hasattr(self, 'data') and self.data:
+            self.data["ai_latency"] = self.ai_latency.get_statistics()
             self.data["ai_processing"] = False
             self.data["analysis_status"] = {
                 "visitor_id": error_data.get('visitor_id'),
@@ -831,28 +801,37 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             return self.data.get("websocket_connected", False)
         return False
 
+    @property
+    def automation_config(self) -> Dict[str, Any]:
+        """Return the intelligent automation options of this coordinator's entry."""
+        if not self.config_entry or not self.config_entry.options:
+            return {}
+        return self.config_entry.options.get("intelligent_automation", {})
+
+    @property
+    def ai_template_config(self) -> Dict[str, Any]:
+        """Return the AI template configuration, built once per options change."""
+        if self._ai_template_config is None:
+            automation_config = self.automation_config
+            self._ai_template_config = {
+                "ai_prompt_template": automation_config.get("ai_prompt_template", "professional"),
+                "custom_ai_prompt": automation_config.get("custom_ai_prompt", ""),
+                "enable_weather_context": automation_config.get("enable_weather_context", True)
+            }
+        return self._ai_template_config
+
+    @callback
+    def async_invalidate_options(self) -> None:
+        """Drop configuration derived from the entry options after they changed."""
+        self._ai_template_config = None
+
     async def async_trigger_analysis(self, visitor_id: Optional[str] = None) -> bool:
         """Trigger AI analysis for a visitor with Home Assistant configuration."""
         try:
-            # Get the Home Assistant configuration entry to pass AI template settings
-            config_entry = None
-            for entry in self.hass.config_entries.async_entries(DOMAIN):
-                if entry.state.name == "loaded":
-                    config_entry = entry
-                    break
-            
-            # Extract AI template configuration from Home Assistant options
-            ai_template_config = {}
-            if config_entry and config_entry.options:
-                automation_config = config_entry.options.get("intelligent_automation", {})
-                ai_template_config = {
-                    "ai_prompt_template": automation_config.get("ai_prompt_template", "professional"),
-                    "custom_ai_prompt": automation_config.get("custom_ai_prompt", ""),
-                    "enable_weather_context": automation_config.get("enable_weather_context", True)
-                }
-                
-                _LOGGER.info("Triggering analysis with AI template: %s", 
-                           ai_template_config.get("ai_prompt_template", "professional"))
+            # Pass the AI template settings from the Home Assistant options
+            ai_template_config = self.ai_template_config
+            _LOGGER.info("Triggering analysis with AI template: %s", 
+                       ai_template_config.get("ai_prompt_template", "professional"))
             
             # Call the enhanced trigger analysis method
             await self.api_client.trigger_analysis_with_config(visitor_id, ai_template_config)
@@ -922,47 +901,61 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Failed to export data: %s", err)
             return None
 
-    async def async_process_doorbell_event(self, event_data: Dict[str, Any]) -> bool:
-        """Process a complete doorbell event with image and context data."""
+    async def async_process_doorbell_event(
+        self, event_data: Dict[str, Any], image_data: Optional[bytes] = None
+    ) -> bool:
+        """Process a complete doorbell event with image and context data.
+
+        Snapshot bytes already in memory are uploaded directly, image_url
+        remains the fallback for the backend to download from. Without an
+        image_url the backend's copy of the uploaded bytes is used.
+        """
         try:
             _LOGGER.debug("Coordinator processing doorbell event: %s", event_data)
             
             # Extract data from event
             image_url = event_data.get("image_url")
-            if not image_url:
-                _LOGGER.error("Image URL is required for doorbell event")
+            if not image_url and not image_data:
+                _LOGGER.error("Image URL or image data is required for doorbell event")
                 return False
             
-            # Extract AI template configuration from automation_config
-            automation_config = event_data.get("automation_config", {})
-            ai_template_config = {}
-            
-            if automation_config:
-                ai_template_config = {
-                    "ai_prompt_template": automation_config.get("ai_prompt_template", "professional"),
-                    "custom_ai_prompt": automation_config.get("custom_ai_prompt", ""),
-                    "enable_weather_context": automation_config.get("enable_weather_context", True)
-                }
-                _LOGGER.info("🎯 Using AI template from HA config: %s", ai_template_config.get("ai_prompt_template"))
-            else:
-                _LOGGER.warning("No automation config found, using default professional template")
-                ai_template_config = {
-                    "ai_prompt_template": "professional",
-                    "custom_ai_prompt": "",
-                    "enable_weather_context": True
-                }
+            # Template settings supplied by the caller win, the entry options fill the rest
+            ai_template_config = {
+                key: event_data.get(key, default)
+                for key, default in self.ai_template_config.items()
+            }
+            _LOGGER.debug("Using AI template: %s", ai_template_config["ai_prompt_template"])
             
             # Create enhanced event data with AI template configuration
             enhanced_event_data = event_data.copy()
             enhanced_event_data.update(ai_template_config)
             
+            # Trace the event, continuing the trace of an automation trigger
+            trace = self.traces.get(event_data.get("correlation_id")) or self.traces.start(
+                event_data.get("source", "service_call"), correlation_id=event_data.get("correlation_id")
+            )
+            enhanced_event_data["correlation_id"] = trace.correlation_id
+            
             # Send event to backend API with AI template configuration
-            success = await self.api_client.process_doorbell_event(enhanced_event_data)
+            post_started = time.perf_counter()
+            response = await self.api_client.submit_doorbell_event(enhanced_event_data, image_data)
+            trace.add_stage("backend_post", (time.perf_counter() - post_started) * 1000)
             
-            if not success:
+            if response is None:
                 _LOGGER.error("Backend failed to process doorbell event")
                 return False
             
+            trace.mark("backend_accepted")
+            # The backend stores a placeholder when it got neither bytes nor a URL
+            if not image_url and response.get("image_url") not in (None, "", "/placeholder.svg"):
+                image_url = response["image_url"]
+                if not image_url.startswith(("http://", "https://")):
+                    image_url = f"{self.api_client.base_url}{image_url}"
+            backend_visitor_id = response.get("visitor_id")
+            # The webhook answers with the event's UUID and its row id, the
+            # analysis messages refer to the row id
+            self.traces.link_visitor(trace, backend_visitor_id, response.get("id"))
+            
             # Update coordinator data immediately for entity updates
             current_time = datetime.now()
             
@@ -977,7 +970,12 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             
             # Create visitor data structure with initial processing message
             visitor_data = {
-                "visitor_id": f"service_call_{int(current_time.timestamp())}",
+                # The backend's id when it returns one, so WebSocket updates match
+                "visitor_id": (
+                    str(backend_visitor_id) if backend_visitor_id is not None
+                    else f"service_call_{int(current_time.timestamp())}"
+                ),
+                "correlation_id": trace.correlation_id,
                 "visitor_name": "Unknown Visitor",
                 "timestamp": event_data.get("timestamp", current_time.isoformat()),
                 "face_recognized": False,
@@ -1024,16 +1022,10 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
                 }
             })
             
-            # Update visitor statistics
-            today = current_time.date().isoformat()
-            if "visitor_stats" not in self.data:
-                self.data["visitor_stats"] = {}
-            
-            if "today" not in self.data["visitor_stats"] or self.data["visitor_stats"].get("date") != today:
-                self.data["visitor_stats"]["today"] = 0
-                self.data["visitor_stats"]["date"] = today
-                
-            self.data["visitor_stats"]["today"] += 1
+            # Update visitor statistics, the backend visitor this call
+            # creates replaces the provisional event instead of adding one
+            self.visitor_series.async_record(label=LABEL_SERVICE_CALL)
+            self.data["visitor_stats"] = self.visitor_series.get_counts()
             
             # Update system status
             if "system_info" not in self.data:
@@ -1054,7 +1046,8 @@ class WhoRangDataUpdateCoordinator(DataUpdateCoordinator):
             self.hass.bus.async_fire("whorang_visitor_detected", {
                 "visitor_data": visitor_data,
                 "event_source": "service_call",
-                "image_url": image_url
+                "image_url": image_url,
+                "correlation_id": trace.correlation_id,
             })
             
             # Schedule a delayed update to fetch the actual AI response from backend
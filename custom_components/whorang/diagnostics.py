@@ -0,0 +1,52 @@
+"""Diagnostics support for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, DOMAIN
+from .coordinator import WhoRangDataUpdateCoordinator
+
+TO_REDACT = {CONF_API_KEY, "ai_api_keys"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: WhoRangDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    diagnostics: Dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "doorbell_traces": {
+            **coordinator.traces.get_statistics(),
+            "recent": coordinator.traces.as_list(),
+        },
+        "ai_latency": coordinator.ai_latency.get_statistics(),
+        "ai_usage": coordinator.ai_usage.get_statistics(),
+        "backend_hub": coordinator.hub.get_statistics(),
+        # Only recorded while the API Requests sensor is enabled
+        "request_metrics": (
+            coordinator.api_client.request_metrics.get_statistics()
+            if coordinator.api_client.request_metrics
+            else {"enabled": False}
+        ),
+    }
+
+    # Image caches of the camera entity and the visitor history, browse
+    # the visitors themselves with the media browser
+    diagnostics["visitor_history"] = coordinator.visitor_history.get_statistics()
+    if coordinator.latest_image_camera:
+        diagnostics["latest_image_camera"] = coordinator.latest_image_camera.get_statistics()
+
+    # Includes the doorbell detector and camera manager statistics
+    if coordinator._automation_engine:
+        diagnostics["automation_engine"] = coordinator._automation_engine.get_statistics()
+
+    return diagnostics
@@ -1,17 +1,22 @@
 """Automatic doorbell detection system for WhoRang AI Doorbell integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 import re
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
 
-from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.core import Event, HomeAssistant, State, callback
 from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
-from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED,
+    async_get as async_get_entity_registry,
+)
 from homeassistant.const import STATE_ON, STATE_OFF
+from homeassistant.util import dt as dt_util
+
+from .trigger_queue import DEFAULT_QUEUE_SIZE, RESULT_QUEUED, DoorbellTriggerQueue
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,6 +72,99 @@ CAMERA_PATTERNS = [
 ]
 
 
+def _strip_wildcards(pattern: str) -> str:
+    """Drop the leading/trailing .* that only slow down re.search."""
+    if pattern.startswith(".*"):
+        pattern = pattern[2:]
+    if pattern.endswith(".*"):
+        pattern = pattern[:-2]
+    return pattern
+
+
+def _compile_patterns(patterns: List[Dict[str, Any]]) -> List[Tuple[Pattern[str], Dict[str, Any]]]:
+    """Precompile detection patterns, keeping their order."""
+    return [(re.compile(_strip_wildcards(config["pattern"])), config) for config in patterns]
+
+
+def _compile_prefilter(patterns: List[Dict[str, Any]]) -> Pattern[str]:
+    """Combine all patterns into one alternation that rejects non-matches in a single pass."""
+    return re.compile("|".join(f"(?:{_strip_wildcards(config['pattern'])})" for config in patterns))
+
+
+# Only these domains can be doorbells or cameras, registry events for others are ignored
+_WATCHED_DOMAINS = ("binary_sensor.", "camera.")
+
+_DOORBELL_MATCHERS = _compile_patterns(DOORBELL_PATTERNS)
+_DOORBELL_PREFILTER = _compile_prefilter(DOORBELL_PATTERNS)
+_CAMERA_MATCHERS = _compile_patterns(CAMERA_PATTERNS)
+_CAMERA_PREFILTER = _compile_prefilter(CAMERA_PATTERNS)
+
+# Doorbell-camera pairing: every shared token adds its kind's weight to the score
+PAIRING_BRANDS = ["reolink", "ring", "nest", "arlo", "hikvision", "dahua"]
+PAIRING_LOCATIONS = ["front", "door", "entrance", "porch", "main", "doorbell"]
+PAIRING_WEIGHTS = {"name": 100, "word": 20, "brand": 30, "location": 15}
+PAIRING_MIN_SCORE = 30
+_WORD_PATTERN = re.compile(r"\w+")
+
+PairingToken = Tuple[str, str]
+
+
+def _pairing_tokens(entity_id: str) -> FrozenSet[PairingToken]:
+    """Return the tokens an entity can share with a pairing partner."""
+    name = entity_id.split(".", 1)[-1].lower()
+    tokens = {("name", name)}
+    tokens.update(("word", word) for word in _WORD_PATTERN.findall(name))
+    tokens.update(("brand", brand) for brand in PAIRING_BRANDS if brand in name)
+    tokens.update(("location", location) for location in PAIRING_LOCATIONS if location in name)
+    return frozenset(tokens)
+
+
+def _score_tokens(first: FrozenSet[PairingToken], second: FrozenSet[PairingToken]) -> int:
+    """Score a pair from the tokens both entities share."""
+    return sum(PAIRING_WEIGHTS[kind] for kind, _ in first & second)
+
+
+class _TokenIndex:
+    """Inverted index from pairing tokens to entity ids."""
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._postings: Dict[PairingToken, Set[str]] = {}
+        self._tokens: Dict[str, FrozenSet[PairingToken]] = {}
+
+    def add(self, entity_id: str) -> FrozenSet[PairingToken]:
+        """Index an entity and return its tokens."""
+        self.discard(entity_id)
+        tokens = self._tokens[entity_id] = _pairing_tokens(entity_id)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(entity_id)
+        return tokens
+
+    def discard(self, entity_id: str) -> None:
+        """Remove an entity from the index."""
+        for token in self._tokens.pop(entity_id, ()):
+            postings = self._postings[token]
+            postings.discard(entity_id)
+            if not postings:
+                del self._postings[token]
+
+    def tokens(self, entity_id: str) -> FrozenSet[PairingToken]:
+        """Return the indexed tokens of an entity."""
+        return self._tokens.get(entity_id, frozenset())
+
+    def candidates(self, tokens: FrozenSet[PairingToken]) -> Set[str]:
+        """Return the entities sharing at least one token."""
+        found: Set[str] = set()
+        for token in tokens:
+            found.update(self._postings.get(token, ()))
+        return found
+
+    def clear(self) -> None:
+        """Empty the index."""
+        self._postings.clear()
+        self._tokens.clear()
+
+
 class DoorbellDetector:
     """Automatic doorbell detection and monitoring system."""
 
@@ -76,9 +174,20 @@ class DoorbellDetector:
         self.coordinator = coordinator
         self._detected_doorbells: Dict[str, Dict[str, Any]] = {}
         self._detected_cameras: Dict[str, Dict[str, Any]] = {}
-        self._doorbell_camera_pairs: List[Dict[str, str]] = []
-        self._state_listeners: List[Any] = []
+        self._doorbell_camera_pairs: Dict[str, Dict[str, Any]] = {}
+        self._doorbell_index = _TokenIndex()
+        self._camera_index = _TokenIndex()
+        self._state_unsub = None
+        self._registry_unsub = None
+        self._last_discovery_ms: Optional[float] = None
         self._last_triggers: Dict[str, datetime] = {}
+        self._last_trigger_monotonic: Dict[str, float] = {}
+        self._debounced = 0
+        self._trigger_queue = DoorbellTriggerQueue(
+            hass, self._async_process_trigger, on_drop=self._async_trigger_dropped
+        )
+        # Trace and monotonic queue time of the trigger waiting for each doorbell
+        self._trigger_traces: Dict[str, Tuple[Any, float]] = {}
         self._debounce_seconds = 2  # Prevent multiple triggers within 2 seconds
         self._enabled = True
         self._sensitivity = "medium"  # low, medium, high
@@ -98,66 +207,126 @@ class DoorbellDetector:
         # Discover doorbell and camera entities
         await self._discover_entities()
         
-        # Set up state monitoring
+        # Set up state monitoring, triggers are processed by the queue workers
+        self._trigger_queue.max_size = max(int(config.get("trigger_queue_size", DEFAULT_QUEUE_SIZE)), 1)
+        self._trigger_queue.async_start()
         await self._setup_state_monitoring()
         
+        # Pick up doorbells and cameras added, renamed or removed later on
+        self._registry_unsub = self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, self._async_handle_registry_updated
+        )
+        
         _LOGGER.info("Doorbell detector setup complete. Found %d doorbells, %d cameras, %d pairs",
                     len(self._detected_doorbells), len(self._detected_cameras), len(self._doorbell_camera_pairs))
 
     async def async_shutdown(self) -> None:
         """Shutdown the doorbell detector."""
-        # Remove state listeners
-        for remove_listener in self._state_listeners:
-            remove_listener()
-        self._state_listeners.clear()
+        # Remove state and registry listeners
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
+        if self._registry_unsub:
+            self._registry_unsub()
+            self._registry_unsub = None
+        await self._trigger_queue.async_stop()
         
         _LOGGER.info("Doorbell detector shutdown complete")
 
     async def _discover_entities(self) -> None:
         """Discover doorbell and camera entities in Home Assistant."""
+        started = time.perf_counter()
         entity_registry = async_get_entity_registry(self.hass)
-        device_registry = async_get_device_registry(self.hass)
         
-        # Get all entities
-        all_entities = entity_registry.entities
-        
-        # Discover doorbell entities
-        for entity_id, entity_entry in all_entities.items():
-            if entity_entry.disabled:
-                continue
-                
-            # Check if entity is a binary sensor (most doorbells are binary sensors)
-            if entity_id.startswith("binary_sensor."):
-                doorbell_match = self._match_doorbell_pattern(entity_id, entity_entry)
-                if doorbell_match:
-                    self._detected_doorbells[entity_id] = doorbell_match
-                    _LOGGER.info("Discovered doorbell entity: %s (priority: %d)", 
-                               entity_id, doorbell_match["priority"])
-            
-            # Check if entity is a camera
-            elif entity_id.startswith("camera."):
-                camera_match = self._match_camera_pattern(entity_id, entity_entry)
-                if camera_match:
-                    self._detected_cameras[entity_id] = camera_match
-                    _LOGGER.info("Discovered camera entity: %s (priority: %d)", 
-                               entity_id, camera_match["priority"])
+        # Discover doorbell and camera entities
+        for entity_id, entity_entry in entity_registry.entities.items():
+            self._evaluate_entity(entity_id, entity_entry)
         
         # Create doorbell-camera pairs
         self._create_doorbell_camera_pairs()
+        
+        self._last_discovery_ms = round((time.perf_counter() - started) * 1000, 2)
+        _LOGGER.debug("Entity discovery over %d registry entries took %s ms",
+                      len(entity_registry.entities), self._last_discovery_ms)
+
+    def _evaluate_entity(self, entity_id: str, entity_entry) -> bool:
+        """Classify one registry entry, returning True if the detected sets changed."""
+        was_detected = entity_id in self._detected_doorbells or entity_id in self._detected_cameras
+        self._detected_doorbells.pop(entity_id, None)
+        self._detected_cameras.pop(entity_id, None)
+        
+        if entity_entry is None or entity_entry.disabled:
+            return was_detected
+        
+        # Check if entity is a binary sensor (most doorbells are binary sensors)
+        if entity_id.startswith("binary_sensor."):
+            doorbell_match = self._match_doorbell_pattern(entity_id, entity_entry)
+            if doorbell_match:
+                self._detected_doorbells[entity_id] = doorbell_match
+                _LOGGER.info("Discovered doorbell entity: %s (priority: %d)", 
+                           entity_id, doorbell_match["priority"])
+                return True
+        
+        # Check if entity is a camera
+        elif entity_id.startswith("camera."):
+            camera_match = self._match_camera_pattern(entity_id, entity_entry)
+            if camera_match:
+                self._detected_cameras[entity_id] = camera_match
+                _LOGGER.info("Discovered camera entity: %s (priority: %d)", 
+                           entity_id, camera_match["priority"])
+                return True
+        
+        return was_detected
+
+    @callback
+    def _async_handle_registry_updated(self, event: Event) -> None:
+        """Update detected entities when the entity registry changes."""
+        action = event.data.get("action")
+        entity_id = event.data.get("entity_id")
+        old_entity_id = event.data.get("old_entity_id")
+        if not any(
+            candidate and candidate.startswith(_WATCHED_DOMAINS)
+            for candidate in (entity_id, old_entity_id)
+        ):
+            return
+        
+        changed = False
+        if old_entity_id and self._evaluate_entity(old_entity_id, None):
+            self._update_pairs_for_entity(old_entity_id)
+            changed = True
+        
+        entity_entry = None
+        if action != "remove":
+            entity_entry = async_get_entity_registry(self.hass).async_get(entity_id)
+        if self._evaluate_entity(entity_id, entity_entry):
+            self._update_pairs_for_entity(entity_id)
+            changed = True
+        
+        if not changed:
+            return
+        
+        _LOGGER.debug("Entity registry %s of %s changed detected doorbells/cameras", action, entity_id)
+        self._async_track_doorbell_states()
 
     def _match_doorbell_pattern(self, entity_id: str, entity_entry) -> Optional[Dict[str, Any]]:
         """Check if entity matches doorbell patterns."""
-        # Get entity state to check device class
-        state = self.hass.states.get(entity_id)
-        device_class = None
-        if state and state.attributes:
-            device_class = state.attributes.get("device_class")
+        name = entity_id.lower()
+        if not _DOORBELL_PREFILTER.search(name):
+            return None
+        
+        # Prefer the registry device class, the entity may not have a state yet
+        device_class = getattr(entity_entry, "device_class", None) or getattr(
+            entity_entry, "original_device_class", None
+        )
+        if device_class is None:
+            state = self.hass.states.get(entity_id)
+            if state and state.attributes:
+                device_class = state.attributes.get("device_class")
         
         # Apply sensitivity filtering
         min_priority = self._get_min_priority_for_sensitivity()
         
-        for pattern_config in DOORBELL_PATTERNS:
-            pattern = pattern_config["pattern"]
+        for matcher, pattern_config in _DOORBELL_MATCHERS:
             required_device_class = pattern_config.get("device_class")
             priority = pattern_config["priority"]
             
@@ -166,14 +335,14 @@ class DoorbellDetector:
                 continue
             
             # Check if entity name matches pattern
-            if re.search(pattern, entity_id.lower()):
+            if matcher.search(name):
                 # Check device class requirement if specified
                 if required_device_class and device_class != required_device_class:
                     continue
                     
                 return {
                     "entity_id": entity_id,
-                    "pattern": pattern,
+                    "pattern": pattern_config["pattern"],
                     "priority": priority,
                     "trigger_states": pattern_config["trigger_states"],
                     "device_class": device_class,
@@ -184,10 +353,13 @@ class DoorbellDetector:
 
     def _match_camera_pattern(self, entity_id: str, entity_entry) -> Optional[Dict[str, Any]]:
         """Check if entity matches camera patterns."""
+        name = entity_id.lower()
+        if not _CAMERA_PREFILTER.search(name):
+            return None
+        
         min_priority = self._get_min_priority_for_sensitivity()
         
-        for pattern_config in CAMERA_PATTERNS:
-            pattern = pattern_config["pattern"]
+        for matcher, pattern_config in _CAMERA_MATCHERS:
             priority = pattern_config["priority"]
             
             # Skip if priority is too low for current sensitivity
@@ -195,10 +367,10 @@ class DoorbellDetector:
                 continue
             
             # Check if entity name matches pattern
-            if re.search(pattern, entity_id.lower()):
+            if matcher.search(name):
                 return {
                     "entity_id": entity_id,
-                    "pattern": pattern,
+                    "pattern": pattern_config["pattern"],
                     "priority": priority,
                     "friendly_name": entity_entry.name or entity_id,
                 }
@@ -215,142 +387,195 @@ class DoorbellDetector:
         return sensitivity_thresholds.get(self._sensitivity, 70)
 
     def _create_doorbell_camera_pairs(self) -> None:
-        """Create pairs between doorbell and camera entities."""
-        self._doorbell_camera_pairs.clear()
+        """Index all detected entities and pair every doorbell from scratch."""
+        manual_pairs = {
+            doorbell_id: pair for doorbell_id, pair in self._doorbell_camera_pairs.items()
+            if pair.get("manual")
+        }
+        self._doorbell_camera_pairs = manual_pairs
+        self._doorbell_index.clear()
+        self._camera_index.clear()
         
-        for doorbell_id, doorbell_info in self._detected_doorbells.items():
-            best_camera = None
-            best_score = 0
-            
-            for camera_id, camera_info in self._detected_cameras.items():
-                # Calculate pairing score based on name similarity
-                score = self._calculate_pairing_score(doorbell_id, camera_id)
-                
-                if score > best_score:
-                    best_score = score
-                    best_camera = camera_id
-            
-            if best_camera and best_score > 30:  # Minimum confidence threshold
-                pair = {
-                    "doorbell_entity": doorbell_id,
-                    "camera_entity": best_camera,
-                    "confidence_score": best_score,
-                    "doorbell_info": doorbell_info,
-                    "camera_info": self._detected_cameras[best_camera]
-                }
-                self._doorbell_camera_pairs.append(pair)
-                
-                _LOGGER.info("Created doorbell-camera pair: %s -> %s (score: %d)",
-                           doorbell_id, best_camera, best_score)
+        for camera_id in self._detected_cameras:
+            self._camera_index.add(camera_id)
+        for doorbell_id in self._detected_doorbells:
+            self._doorbell_index.add(doorbell_id)
+            self._pair_doorbell(doorbell_id)
 
-    def _calculate_pairing_score(self, doorbell_id: str, camera_id: str) -> int:
-        """Calculate confidence score for doorbell-camera pairing."""
-        score = 0
+    def _update_pairs_for_entity(self, entity_id: str) -> None:
+        """Update the indexes and affected pairs after an entity was (re)classified."""
+        self._doorbell_index.discard(entity_id)
+        self._camera_index.discard(entity_id)
         
-        # Extract base names (remove domain prefixes)
-        doorbell_name = doorbell_id.replace("binary_sensor.", "").lower()
-        camera_name = camera_id.replace("camera.", "").lower()
+        if entity_id not in self._detected_doorbells:
+            self._doorbell_camera_pairs.pop(entity_id, None)
         
-        # Exact match bonus
-        if doorbell_name == camera_name:
-            score += 100
+        # Doorbells that lost their camera pick the next best one
+        if entity_id not in self._detected_cameras:
+            for doorbell_id, pair in list(self._doorbell_camera_pairs.items()):
+                if pair["camera_entity"] == entity_id and not pair.get("manual"):
+                    del self._doorbell_camera_pairs[doorbell_id]
+                    self._pair_doorbell(doorbell_id)
         
-        # Substring matching
-        doorbell_words = set(re.findall(r'\w+', doorbell_name))
-        camera_words = set(re.findall(r'\w+', camera_name))
+        # A new camera only competes for the doorbells it shares tokens with
+        if entity_id in self._detected_cameras:
+            camera_tokens = self._camera_index.add(entity_id)
+            for doorbell_id in self._doorbell_index.candidates(camera_tokens):
+                pair = self._doorbell_camera_pairs.get(doorbell_id)
+                if pair and pair.get("manual"):
+                    continue
+                score = _score_tokens(self._doorbell_index.tokens(doorbell_id), camera_tokens)
+                if score > PAIRING_MIN_SCORE and (
+                    pair is None or score > pair["confidence_score"]
+                    or pair["camera_entity"] == entity_id
+                ):
+                    self._set_pair(doorbell_id, entity_id, score)
         
-        # Common words bonus
-        common_words = doorbell_words.intersection(camera_words)
-        score += len(common_words) * 20
+        if entity_id in self._detected_doorbells:
+            self._doorbell_index.add(entity_id)
+            self._pair_doorbell(entity_id)
+
+    def _pair_doorbell(self, doorbell_id: str) -> None:
+        """Pair a doorbell with the best scoring camera that shares a token with it."""
+        existing = self._doorbell_camera_pairs.get(doorbell_id)
+        if existing and existing.get("manual"):
+            return
         
-        # Brand matching bonus
-        brands = ["reolink", "ring", "nest", "arlo", "hikvision", "dahua"]
-        for brand in brands:
-            if brand in doorbell_name and brand in camera_name:
-                score += 30
+        doorbell_tokens = self._doorbell_index.tokens(doorbell_id)
+        best_camera = None
+        best_score = 0
         
-        # Location matching bonus
-        locations = ["front", "door", "entrance", "porch", "main", "doorbell"]
-        for location in locations:
-            if location in doorbell_name and location in camera_name:
-                score += 15
+        # Sorted so ties resolve the same way on every rebuild
+        for camera_id in sorted(self._camera_index.candidates(doorbell_tokens)):
+            score = _score_tokens(doorbell_tokens, self._camera_index.tokens(camera_id))
+            if score > best_score:
+                best_score = score
+                best_camera = camera_id
         
-        return score
+        if best_camera and best_score > PAIRING_MIN_SCORE:  # Minimum confidence threshold
+            self._set_pair(doorbell_id, best_camera, best_score)
+        else:
+            self._doorbell_camera_pairs.pop(doorbell_id, None)
+
+    def _set_pair(self, doorbell_id: str, camera_id: str, score: int) -> None:
+        """Record an automatic doorbell-camera pair."""
+        self._doorbell_camera_pairs[doorbell_id] = {
+            "doorbell_entity": doorbell_id,
+            "camera_entity": camera_id,
+            "confidence_score": score,
+            "doorbell_info": self._detected_doorbells[doorbell_id],
+            "camera_info": self._detected_cameras[camera_id]
+        }
+        
+        _LOGGER.info("Created doorbell-camera pair: %s -> %s (score: %d)",
+                   doorbell_id, camera_id, score)
 
     async def _setup_state_monitoring(self) -> None:
         """Set up state change monitoring for detected doorbell entities."""
         if not self._detected_doorbells:
-            _LOGGER.warning("No doorbell entities found for monitoring")
-            return
+            _LOGGER.warning("No doorbell entities found for monitoring yet")
+        
+        self._async_track_doorbell_states()
+
+    @callback
+    def _async_track_doorbell_states(self) -> None:
+        """(Re)subscribe to state changes of the currently detected doorbells."""
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
         
         # Monitor all detected doorbell entities
         doorbell_entities = list(self._detected_doorbells.keys())
-        
-        @callback
-        def doorbell_state_changed(event):
-            """Handle doorbell state change."""
-            asyncio.create_task(self._handle_doorbell_trigger(event))
+        if not doorbell_entities:
+            return
         
         # Set up state change tracking
-        remove_listener = async_track_state_change_event(
-            self.hass, doorbell_entities, doorbell_state_changed
+        self._state_unsub = async_track_state_change_event(
+            self.hass, doorbell_entities, self._async_handle_doorbell_state
         )
-        self._state_listeners.append(remove_listener)
         
         _LOGGER.info("Set up state monitoring for %d doorbell entities", len(doorbell_entities))
 
-    async def _handle_doorbell_trigger(self, event) -> None:
-        """Handle doorbell trigger event."""
-        try:
-            entity_id = event.data.get("entity_id")
-            new_state = event.data.get("new_state")
-            old_state = event.data.get("old_state")
-            
-            if not entity_id or not new_state:
-                return
-            
-            # Get doorbell configuration
-            doorbell_info = self._detected_doorbells.get(entity_id)
-            if not doorbell_info:
-                return
-            
-            # Check if this is a valid trigger state
-            trigger_states = doorbell_info.get("trigger_states", [STATE_ON])
-            if new_state.state not in trigger_states:
-                return
-            
-            # Check if this is a state change (not just attribute update)
-            if old_state and old_state.state == new_state.state:
-                return
-            
-            # Debounce: prevent multiple triggers within debounce period
-            now = datetime.now()
-            last_trigger = self._last_triggers.get(entity_id)
-            if last_trigger and (now - last_trigger).total_seconds() < self._debounce_seconds:
-                _LOGGER.debug("Debouncing doorbell trigger for %s", entity_id)
-                return
-            
-            self._last_triggers[entity_id] = now
-            
-            _LOGGER.info("Doorbell trigger detected: %s -> %s", entity_id, new_state.state)
-            
-            # Find associated camera for this doorbell
-            camera_entity = self._find_camera_for_doorbell(entity_id)
-            
-            # Trigger the automation engine
-            await self._trigger_doorbell_automation(entity_id, camera_entity, new_state)
-            
-        except Exception as err:
-            _LOGGER.error("Error handling doorbell trigger: %s", err, exc_info=True)
+    @callback
+    def _async_handle_doorbell_state(self, event: Event) -> None:
+        """Filter and debounce a doorbell state change, then queue it."""
+        entity_id = event.data.get("entity_id")
+        new_state = event.data.get("new_state")
+        old_state = event.data.get("old_state")
+        
+        if not entity_id or not new_state:
+            return
+        
+        # Get doorbell configuration
+        doorbell_info = self._detected_doorbells.get(entity_id)
+        if not doorbell_info:
+            return
+        
+        # Check if this is a valid trigger state
+        trigger_states = doorbell_info.get("trigger_states", [STATE_ON])
+        if new_state.state not in trigger_states:
+            return
+        
+        # Check if this is a state change (not just attribute update)
+        if old_state and old_state.state == new_state.state:
+            return
+        
+        # Debounce on the monotonic clock so clock adjustments cannot suppress or double triggers
+        now = time.monotonic()
+        last_trigger = self._last_trigger_monotonic.get(entity_id)
+        if last_trigger is not None and now - last_trigger < self._debounce_seconds:
+            _LOGGER.debug("Debouncing doorbell trigger for %s", entity_id)
+            self._debounced += 1
+            return
+        
+        self._last_trigger_monotonic[entity_id] = now
+        self._last_triggers[entity_id] = datetime.now()
+        
+        result = self._trigger_queue.async_submit(entity_id, new_state, doorbell_info["priority"])
+        if result == RESULT_QUEUED:
+            # A coalesced trigger keeps the trace of the one it joined
+            trace = self.coordinator.traces.start("doorbell", entity_id)
+            trace.add_stage(
+                "state_dispatch", (dt_util.utcnow() - event.time_fired).total_seconds() * 1000
+            )
+            self._trigger_traces[entity_id] = (trace, now)
+        _LOGGER.info("Doorbell trigger detected: %s -> %s (%s)", entity_id, new_state.state, result)
+
+    async def _async_process_trigger(self, entity_id: str, state: State) -> None:
+        """Run the automation for a queued doorbell trigger."""
+        # Find associated camera for this doorbell
+        camera_entity = self._find_camera_for_doorbell(entity_id)
+        
+        correlation_id = None
+        if entity_id in self._trigger_traces:
+            trace, queued_at = self._trigger_traces.pop(entity_id)
+            trace.add_stage("queue_wait", (time.monotonic() - queued_at) * 1000)
+            correlation_id = trace.correlation_id
+        
+        # Trigger the automation engine
+        await self._trigger_doorbell_automation(entity_id, camera_entity, state, correlation_id)
+
+    @callback
+    def _async_trigger_dropped(self, entity_id: str) -> None:
+        """Close the trace of a trigger the queue dropped without processing it."""
+        if entity_id not in self._trigger_traces:
+            return
+        trace, queued_at = self._trigger_traces.pop(entity_id)
+        trace.add_stage("queue_wait", (time.monotonic() - queued_at) * 1000)
+        trace.mark("dropped")
 
     def _find_camera_for_doorbell(self, doorbell_entity: str) -> Optional[str]:
         """Find the best camera entity for a doorbell entity."""
-        for pair in self._doorbell_camera_pairs:
-            if pair["doorbell_entity"] == doorbell_entity:
-                return pair["camera_entity"]
-        return None
+        pair = self._doorbell_camera_pairs.get(doorbell_entity)
+        return pair["camera_entity"] if pair else None
 
-    async def _trigger_doorbell_automation(self, doorbell_entity: str, camera_entity: Optional[str], state: State) -> None:
+    async def _trigger_doorbell_automation(
+        self,
+        doorbell_entity: str,
+        camera_entity: Optional[str],
+        state: State,
+        correlation_id: Optional[str] = None,
+    ) -> None:
         """Trigger the doorbell automation workflow."""
         try:
             # Import automation engine
@@ -369,7 +594,8 @@ class DoorbellDetector:
                 "trigger_state": state.state,
                 "trigger_time": datetime.now().isoformat(),
                 "doorbell_info": self._detected_doorbells.get(doorbell_entity, {}),
-                "attributes": dict(state.attributes) if state.attributes else {}
+                "attributes": dict(state.attributes) if state.attributes else {},
+                "correlation_id": correlation_id,
             }
             
             # Trigger automation
@@ -384,7 +610,7 @@ class DoorbellDetector:
         return {
             "doorbells": dict(self._detected_doorbells),
             "cameras": dict(self._detected_cameras),
-            "pairs": list(self._doorbell_camera_pairs),
+            "pairs": list(self._doorbell_camera_pairs.values()),
             "enabled": self._enabled,
             "sensitivity": self._sensitivity
         }
@@ -396,9 +622,12 @@ class DoorbellDetector:
             "doorbells_detected": len(self._detected_doorbells),
             "cameras_detected": len(self._detected_cameras),
             "pairs_created": len(self._doorbell_camera_pairs),
+            "last_discovery_ms": self._last_discovery_ms,
             "triggers_today": len([t for t in self._last_triggers.values() 
                                  if (datetime.now() - t).days == 0]),
             "last_trigger": max(self._last_triggers.values()) if self._last_triggers else None,
+            "triggers_debounced": self._debounced,
+            **self._trigger_queue.get_statistics(),
             "sensitivity": self._sensitivity,
             "enabled": self._enabled
         }
@@ -415,13 +644,7 @@ class DoorbellDetector:
                 _LOGGER.error("Camera entity not found: %s", camera_entity)
                 return False
             
-            # Remove existing pairs for this doorbell
-            self._doorbell_camera_pairs = [
-                pair for pair in self._doorbell_camera_pairs 
-                if pair["doorbell_entity"] != doorbell_entity
-            ]
-            
-            # Create new pair
+            # Create new pair, replacing any existing pair for this doorbell
             pair = {
                 "doorbell_entity": doorbell_entity,
                 "camera_entity": camera_entity,
@@ -431,7 +654,7 @@ class DoorbellDetector:
                 "camera_info": self._detected_cameras.get(camera_entity, {})
             }
             
-            self._doorbell_camera_pairs.append(pair)
+            self._doorbell_camera_pairs[doorbell_entity] = pair
             
             _LOGGER.info("Created manual doorbell-camera pair: %s -> %s", 
                         doorbell_entity, camera_entity)
@@ -0,0 +1,151 @@
+"""Unknown face clustering for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+DEFAULT_MIN_CLUSTER_SIZE = 2
+
+# Face fields copied onto the cluster representative
+REPRESENTATIVE_FIELDS = (
+    "id",
+    "face_crop_path",
+    "thumbnail_path",
+    "quality_score",
+    "confidence",
+    "created_at",
+    "visitor_event_id",
+    "original_image",
+)
+
+
+def _parse_embedding(face: Dict[str, Any]) -> Optional[List[float]]:
+    """Return the embedding of a face as a list of floats, if any."""
+    embedding = face.get("embedding_data") or face.get("embedding")
+    if isinstance(embedding, str):
+        try:
+            embedding = json.loads(embedding)
+        except ValueError:
+            return None
+    if not isinstance(embedding, list) or not embedding:
+        return None
+    return embedding
+
+
+def cluster_faces(
+    faces: List[Dict[str, Any]],
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    min_cluster_size: int = DEFAULT_MIN_CLUSTER_SIZE,
+) -> Dict[str, Any]:
+    """Group faces by embedding similarity using density-based clustering.
+
+    This is DBSCAN over cosine similarity: a face is a core face when at
+    least ``min_cluster_size`` faces (itself included) are within the
+    similarity threshold, and clusters are the faces reachable from core
+    faces. It is CPU bound and must run in an executor.
+    """
+    started = time.perf_counter()
+
+    embeddings: List[List[float]] = []
+    candidates: List[Dict[str, Any]] = []
+    skipped: List[Any] = []
+    for face in faces:
+        embedding = _parse_embedding(face)
+        if embedding is None:
+            skipped.append(face.get("id"))
+            continue
+        embeddings.append(embedding)
+        candidates.append(face)
+
+    # Embeddings from different providers have different sizes and are not
+    # comparable, so only the dominant dimension is clustered.
+    if embeddings:
+        dimension = Counter(len(e) for e in embeddings).most_common(1)[0][0]
+        keep = [i for i, e in enumerate(embeddings) if len(e) == dimension]
+        skipped.extend(
+            candidates[i].get("id") for i in range(len(candidates)) if len(embeddings[i]) != dimension
+        )
+        embeddings = [embeddings[i] for i in keep]
+        candidates = [candidates[i] for i in keep]
+
+    clusters: List[Dict[str, Any]] = []
+    unclustered: List[Any] = []
+
+    if candidates:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        similarity = matrix @ matrix.T
+        neighbours = similarity >= similarity_threshold
+        core = neighbours.sum(axis=1) >= max(min_cluster_size, 1)
+
+        labels = np.full(len(candidates), -1, dtype=np.int32)
+        label = 0
+        for seed in np.flatnonzero(core):
+            if labels[seed] != -1:
+                continue
+            labels[seed] = label
+            frontier = np.zeros(len(candidates), dtype=bool)
+            frontier[seed] = True
+            while frontier.any():
+                reached = neighbours[frontier].any(axis=0) & (labels == -1)
+                labels[reached] = label
+                frontier = reached & core
+            label += 1
+
+        quality = np.asarray(
+            [float(face.get("quality_score") or 0.0) for face in candidates],
+            dtype=np.float32,
+        )
+
+        for cluster_label in range(label):
+            members = np.flatnonzero(labels == cluster_label)
+            if len(members) < min_cluster_size:
+                unclustered.extend(candidates[i].get("id") for i in members)
+                continue
+
+            # Medoid: the face most similar to the rest of its cluster,
+            # ties broken by face quality.
+            cohesion = similarity[np.ix_(members, members)].mean(axis=1)
+            ranking = np.lexsort((-quality[members], -cohesion))
+            representative = candidates[members[ranking[0]]]
+
+            clusters.append({
+                "face_ids": [candidates[i].get("id") for i in members],
+                "size": int(len(members)),
+                "cohesion": round(float(cohesion.mean()), 4),
+                "representative_face_id": representative.get("id"),
+                "representative": {
+                    key: representative.get(key)
+                    for key in REPRESENTATIVE_FIELDS
+                    if key in representative
+                },
+            })
+
+        unclustered.extend(candidates[i].get("id") for i in np.flatnonzero(labels == -1))
+
+    clusters.sort(key=lambda cluster: cluster["size"], reverse=True)
+    for index, cluster in enumerate(clusters, start=1):
+        cluster["cluster_id"] = index
+
+    return {
+        "clusters": clusters,
+        "cluster_count": len(clusters),
+        "clustered_faces": sum(cluster["size"] for cluster in clusters),
+        "unclustered_face_ids": unclustered,
+        "skipped_face_ids": skipped,
+        "total_faces": len(faces),
+        "similarity_threshold": similarity_threshold,
+        "min_cluster_size": min_cluster_size,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
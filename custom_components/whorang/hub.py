@@ -0,0 +1,372 @@
+"""Shared backend connection for WhoRang AI Doorbell config entries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set
+
+import websockets
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .api_client_enhanced import WhoRangAPIClientEnhanced
+from .const import DATA_BACKEND_HUBS, DEFAULT_WEBSOCKET_TIMEOUT, WEBSOCKET_PATH
+
+if TYPE_CHECKING:
+    from .coordinator import WhoRangDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between AI usage fetches used to reconcile the local statistics
+AI_USAGE_RECONCILE_INTERVAL = 3600
+
+MessageHandler = Callable[[Any], Awaitable[None]]
+
+
+@callback
+def async_get_backend_hub(
+    hass: HomeAssistant, api_client: WhoRangAPIClientEnhanced
+) -> WhoRangBackendHub:
+    """Return the hub for the client's backend, creating it on first use.
+
+    Entries pointing at the same backend with the same API key share the
+    hub. The client of the first entry is kept, so its timeout, SSL and
+    retry settings apply to all of them, and the clients of later entries
+    are closed. The backend has a single Ollama configuration, the entry
+    set up last wins it, see async_merge_client.
+    """
+    hubs: Dict[str, WhoRangBackendHub] = hass.data.setdefault(DATA_BACKEND_HUBS, {})
+    key = f"{api_client.base_url}|{api_client.api_key or ''}"
+    hub = hubs.get(key)
+    if hub is None:
+        hub = hubs[key] = WhoRangBackendHub(hass, key, api_client)
+    elif api_client is not hub.api_client:
+        hub.async_merge_client(api_client)
+    return hub
+
+
+class WhoRangBackendHub:
+    """Own the connection to one WhoRang backend for all its coordinators.
+
+    The hub holds the API client (and so the pooled HTTP session), a single
+    WebSocket connection whose messages are fanned out to every subscriber,
+    and the backend data fetch. Concurrent refreshes share one fetch, and a
+    fetch made for one coordinator is handed to the others, which resets
+    their refresh timers so the backend is polled once per interval no
+    matter how many entries use it.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, key: str, api_client: WhoRangAPIClientEnhanced
+    ) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self.key = key
+        self.api_client = api_client
+        self.websocket_url = self._build_websocket_url()
+        self._coordinators: List[WhoRangDataUpdateCoordinator] = []
+        self._message_handlers: List[MessageHandler] = []
+        self._websocket = None
+        self._websocket_task: Optional[asyncio.Task] = None
+        self._fetch_task: Optional[asyncio.Task] = None
+        self._fetch_waiters: Set[WhoRangDataUpdateCoordinator] = set()
+        self._fetches = 0
+        self._shared_fetches = 0
+        self._last_usage_fetch: Optional[float] = None
+
+    def _build_websocket_url(self) -> str:
+        """Build WebSocket URL from API client configuration."""
+        # Use ws:// for HTTP and wss:// for HTTPS
+        scheme = "wss" if self.api_client.use_ssl else "ws"
+        host = self.api_client.host
+        port = self.api_client.port
+
+        # Handle standard ports
+        if (self.api_client.use_ssl and port == 443) or (not self.api_client.use_ssl and port == 80):
+            return f"{scheme}://{host}{WEBSOCKET_PATH}"
+        return f"{scheme}://{host}:{port}{WEBSOCKET_PATH}"
+
+    @property
+    def websocket_connected(self) -> bool:
+        """Return whether the WebSocket is connected."""
+        return self._websocket is not None and not self._websocket.closed
+
+    @callback
+    def async_merge_client(self, api_client: WhoRangAPIClientEnhanced) -> None:
+        """Take the Ollama settings of a later entry's client and close it."""
+        if api_client.ollama_config != self.api_client.ollama_config:
+            _LOGGER.warning(
+                "Entries sharing the backend at %s have different Ollama settings, "
+                "using those of the entry set up last",
+                self.api_client.base_url,
+            )
+            self.api_client.ollama_config = dict(api_client.ollama_config)
+        self.hass.async_create_task(api_client.close())
+
+    @callback
+    def async_add_coordinator(self, coordinator: WhoRangDataUpdateCoordinator) -> None:
+        """Register a coordinator to receive data fetched for others."""
+        self._coordinators.append(coordinator)
+
+    async def async_remove_coordinator(self, coordinator: WhoRangDataUpdateCoordinator) -> None:
+        """Unregister a coordinator, closing the connection after the last one."""
+        if coordinator in self._coordinators:
+            self._coordinators.remove(coordinator)
+        if self._coordinators:
+            return
+
+        await self._async_stop_websocket()
+        await self.api_client.close()
+        self.hass.data.get(DATA_BACKEND_HUBS, {}).pop(self.key, None)
+
+    @callback
+    def async_subscribe_messages(self, handler: MessageHandler) -> CALLBACK_TYPE:
+        """Subscribe to WebSocket messages, connecting on the first subscriber."""
+        self._message_handlers.append(handler)
+        if self._websocket_task is None:
+            _LOGGER.debug("Starting WebSocket connection to %s", self.websocket_url)
+            self._websocket_task = self.hass.async_create_background_task(
+                self._websocket_handler(), f"whorang_websocket_{self.key}"
+            )
+
+        @callback
+        def unsubscribe() -> None:
+            if handler in self._message_handlers:
+                self._message_handlers.remove(handler)
+            if not self._message_handlers:
+                self.hass.async_create_task(self._async_stop_websocket())
+
+        return unsubscribe
+
+    async def async_fetch_data(self, coordinator: WhoRangDataUpdateCoordinator) -> Dict[str, Any]:
+        """Fetch backend data for a coordinator, sharing any fetch in progress."""
+        if self._fetch_task is None:
+            self._fetch_waiters = set()
+            self._fetch_task = self.hass.async_create_task(self._async_fetch_and_share())
+        else:
+            self._shared_fetches += 1
+            if self.api_client.request_metrics:
+                self.api_client.request_metrics.record_cache_hit("shared_fetch")
+        self._fetch_waiters.add(coordinator)
+        return await asyncio.shield(self._fetch_task)
+
+    async def _async_fetch_and_share(self) -> Dict[str, Any]:
+        """Fetch backend data and hand it to coordinators that did not ask."""
+        try:
+            backend_data = await self._async_fetch_backend_data()
+        finally:
+            self._fetch_task = None
+        self._fetches += 1
+
+        for coordinator in self._coordinators:
+            if coordinator not in self._fetch_waiters:
+                self.hass.async_create_task(coordinator.async_handle_backend_data(backend_data))
+        return backend_data
+
+    async def _async_fetch_backend_data(self) -> Dict[str, Any]:
+        """Fetch the polled data from the backend."""
+        api_client = self.api_client
+
+        # Get system information
+        system_info = await api_client.get_system_info()
+
+        # Get latest visitor
+        latest_visitor = await api_client.get_latest_visitor()
+
+        # Get known persons for face recognition
+        known_persons = await api_client.get_known_persons()
+
+        # Get face gallery data for visual face management
+        face_gallery_data = await api_client.get_face_gallery_data()
+
+        # AI usage is aggregated locally from analysis events, the backend
+        # is only asked now and then to reconcile the totals
+        ai_usage = None
+        now = time.monotonic()
+        if self._last_usage_fetch is None or now - self._last_usage_fetch >= AI_USAGE_RECONCILE_INTERVAL:
+            ai_usage = await api_client.get_ai_usage_stats(days=1)
+            self._last_usage_fetch = now
+        elif api_client.request_metrics:
+            api_client.request_metrics.record_cache_hit("ai_usage_local")
+
+        # Get current AI provider and model information
+        face_config = system_info.get("face_config", {})
+        current_ai_provider = face_config.get("ai_provider", "local")
+        current_ai_model = await api_client.get_current_ai_model()
+
+        # Get available models for all providers
+        available_models = await api_client.get_available_models()
+
+        # Special handling for local/Ollama provider - get dynamic models
+        ollama_models = []
+        ollama_status = {}
+        if current_ai_provider == "local":
+            try:
+                # Use the new backend endpoint for dynamic model discovery
+                local_models_response = await api_client.get_provider_models("local")
+                if local_models_response:
+                    # Transform backend response to match expected format
+                    ollama_models = []
+                    for model in local_models_response:
+                        if isinstance(model, dict):
+                            ollama_models.append({
+                                "name": model.get("value", ""),
+                                "display_name": model.get("label", ""),
+                                "size": model.get("size", 0),
+                                "is_vision": model.get("is_vision", True),
+                                "recommended": model.get("recommended", False)
+                            })
+                        elif isinstance(model, str):
+                            ollama_models.append({
+                                "name": model,
+                                "display_name": model,
+                                "size": 0,
+                                "is_vision": True,
+                                "recommended": False
+                            })
+
+                    # Update available_models with dynamic Ollama models
+                    available_models["local"] = [model["name"] for model in ollama_models]
+                    _LOGGER.debug("Updated local models with %d Ollama models from backend", len(ollama_models))
+                else:
+                    # Fallback to direct Ollama API if backend fails
+                    _LOGGER.debug("Backend model discovery failed, trying direct Ollama API")
+                    ollama_models = await api_client.get_ollama_models()
+                    if ollama_models:
+                        available_models["local"] = [model["name"] for model in ollama_models]
+                        _LOGGER.debug("Updated local models with %d Ollama models from direct API", len(ollama_models))
+            except Exception as e:
+                _LOGGER.error("Failed to get Ollama models: %s", e)
+                # Fallback to direct Ollama API
+                try:
+                    ollama_models = await api_client.get_ollama_models()
+                    if ollama_models:
+                        available_models["local"] = [model["name"] for model in ollama_models]
+                        _LOGGER.debug("Updated local models with %d Ollama models from fallback", len(ollama_models))
+                except Exception as fallback_error:
+                    _LOGGER.error("Fallback Ollama model discovery also failed: %s", fallback_error)
+
+            # Get Ollama status
+            try:
+                ollama_status = await api_client.get_ollama_status()
+            except Exception as e:
+                _LOGGER.error("Failed to get Ollama status: %s", e)
+                ollama_status = {"status": "unknown", "error": str(e)}
+
+        return {
+            "system_info": system_info,
+            "latest_visitor": latest_visitor,
+            "known_persons": known_persons,
+            "face_gallery_data": face_gallery_data,
+            "backend_ai_usage": ai_usage,
+            "current_ai_provider": current_ai_provider,
+            "current_ai_model": current_ai_model,
+            "available_models": available_models,
+            "ollama_models": ollama_models,
+            "ollama_status": ollama_status,
+        }
+
+    async def _async_stop_websocket(self) -> None:
+        """Stop the WebSocket connection."""
+        if self._message_handlers:
+            return
+        if self._websocket_task:
+            self._websocket_task.cancel()
+            try:
+                await self._websocket_task
+            except asyncio.CancelledError:
+                pass
+            self._websocket_task = None
+
+        if self._websocket:
+            await self._websocket.close()
+            self._websocket = None
+
+    async def _async_dispatch_message(self, message: Any) -> None:
+        """Hand a message to every subscriber at once.
+
+        Subscribers run concurrently so the refreshes they request share a
+        single backend fetch.
+        """
+        results = await asyncio.gather(
+            *(handler(message) for handler in list(self._message_handlers)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Error handling WebSocket message: %s", result)
+
+    async def _websocket_handler(self) -> None:
+        """Handle WebSocket connection with auto-reconnect."""
+        reconnect_delay = 1
+        max_reconnect_delay = 60
+
+        while True:
+            try:
+                _LOGGER.debug("Connecting to WebSocket at %s", self.websocket_url)
+
+                # Prepare connection parameters
+                connect_kwargs = {
+                    "timeout": DEFAULT_WEBSOCKET_TIMEOUT,
+                    "ping_interval": 20,
+                    "ping_timeout": 10,
+                }
+
+                # Add SSL context if using HTTPS
+                if self.api_client.use_ssl and self.api_client._ssl_context:
+                    connect_kwargs["ssl"] = self.api_client._ssl_context
+
+                # Add headers if API key is present
+                if self.api_client.api_key:
+                    connect_kwargs["extra_headers"] = {
+                        "Authorization": f"Bearer {self.api_client.api_key}"
+                    }
+
+                async with websockets.connect(
+                    self.websocket_url,
+                    **connect_kwargs
+                ) as websocket:
+                    self._websocket = websocket
+                    reconnect_delay = 1  # Reset delay on successful connection
+
+                    _LOGGER.info("WebSocket connected to WhoRang")
+
+                    # Listen for messages
+                    async for message in websocket:
+                        await self._async_dispatch_message(message)
+
+            except websockets.exceptions.InvalidStatusCode as err:
+                if err.status_code == 400:
+                    _LOGGER.error("WebSocket connection rejected (400). Check if WebSocket endpoint exists at %s", self.websocket_url)
+                elif err.status_code == 401:
+                    _LOGGER.error("WebSocket authentication failed (401). Check API key.")
+                else:
+                    _LOGGER.error("WebSocket connection failed with status %s: %s", err.status_code, err)
+                self._websocket = None
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+
+            except (websockets.exceptions.ConnectionClosed, OSError) as err:
+                _LOGGER.warning("WebSocket connection lost: %s", err)
+                self._websocket = None
+
+                # Exponential backoff for reconnection
+                _LOGGER.debug("Reconnecting in %s seconds", reconnect_delay)
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+
+            except Exception as err:
+                _LOGGER.error("Unexpected WebSocket error: %s", err)
+                self._websocket = None
+                await asyncio.sleep(reconnect_delay)
+                reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get shared connection statistics."""
+        return {
+            "coordinators": len(self._coordinators),
+            "websocket_subscribers": len(self._message_handlers),
+            "websocket_connected": self.websocket_connected,
+            "backend_fetches": self._fetches,
+            "shared_fetches": self._shared_fetches,
+        }
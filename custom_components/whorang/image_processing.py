@@ -0,0 +1,145 @@
+"""Snapshot image processing for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import io
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_JPEG_QUALITY = 40
+QUALITY_STEP = 10
+DOWNSCALE_STEP = 0.8
+
+# Frames are scored on a small grayscale copy, fine detail is not needed to rank them
+SCORING_LONG_EDGE = 480
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> bytes:
+    """Encode an image as JPEG without any metadata.
+
+    Baseline JPEG is written in chunks. Optimized or progressive encoding
+    compresses the whole frame in one call that holds the GIL, which stalls
+    the event loop for tens of milliseconds even from an executor thread.
+    """
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+def optimize_snapshot(
+    data: bytes,
+    max_long_edge: int,
+    quality: int,
+    max_file_size: int,
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Downscale, re-encode and strip metadata from a snapshot.
+
+    Quality is lowered, and then the image shrunk further, until the result
+    fits max_file_size. If re-encoding would only make an image that
+    already fits larger, the original bytes are kept. This is CPU bound and
+    must run in an executor.
+    """
+    cpu_started = time.thread_time()
+
+    with Image.open(io.BytesIO(data)) as source:
+        original_size = source.size
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        if max(image.size) > max_long_edge:
+            image.thumbnail((max_long_edge, max_long_edge), Image.Resampling.LANCZOS)
+
+        used_quality = quality
+        result = _encode_jpeg(image, used_quality)
+        while len(result) > max_file_size and used_quality > MIN_JPEG_QUALITY:
+            used_quality = max(used_quality - QUALITY_STEP, MIN_JPEG_QUALITY)
+            result = _encode_jpeg(image, used_quality)
+        while len(result) > max_file_size and min(image.size) > 64:
+            image = image.resize(
+                (int(image.width * DOWNSCALE_STEP), int(image.height * DOWNSCALE_STEP)),
+                Image.Resampling.LANCZOS,
+            )
+            result = _encode_jpeg(image, used_quality)
+        final_size = image.size
+
+    reencoded = True
+    if len(result) >= len(data) and len(data) <= max_file_size and final_size == original_size:
+        result = data
+        reencoded = False
+
+    stats = {
+        "original_bytes": len(data),
+        "processed_bytes": len(result),
+        "bytes_saved": len(data) - len(result),
+        "original_resolution": f"{original_size[0]}x{original_size[1]}",
+        "resolution": f"{final_size[0]}x{final_size[1]}",
+        "quality": used_quality,
+        "reencoded": reencoded,
+        "cpu_time_ms": round((time.thread_time() - cpu_started) * 1000, 2),
+    }
+    return result, stats
+
+
+def resize_image(data: bytes, width: Optional[int], height: Optional[int], quality: int) -> bytes:
+    """Downscale an image to fit within width x height, keeping the aspect ratio.
+
+    Images already within the requested size are returned unchanged. This is
+    CPU bound and must run in an executor.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        target = (width or source.width, height or source.height)
+        if source.width <= target[0] and source.height <= target[1]:
+            return data
+        image = source.convert("RGB") if source.mode not in ("RGB", "L") else source.copy()
+
+    image.thumbnail(target, Image.Resampling.LANCZOS)
+    return _encode_jpeg(image, quality)
+
+
+def score_frame(data: bytes) -> Dict[str, float]:
+    """Score a frame for sharpness (variance of the Laplacian) and exposure."""
+    with Image.open(io.BytesIO(data)) as source:
+        image = source.convert("L")
+        image.thumbnail((SCORING_LONG_EDGE, SCORING_LONG_EDGE), Image.Resampling.BILINEAR)
+        pixels = np.asarray(image, dtype=np.float32)
+
+    laplacian = (
+        pixels[:-2, 1:-1] + pixels[2:, 1:-1] + pixels[1:-1, :-2] + pixels[1:-1, 2:]
+        - 4.0 * pixels[1:-1, 1:-1]
+    )
+    sharpness = float(laplacian.var())
+
+    # Penalize clipped shadows/highlights and frames far from mid-grey
+    clipped = float(np.mean((pixels < 5) | (pixels > 250)))
+    brightness = float(pixels.mean())
+    exposure = (1.0 - clipped) * (1.0 - 0.5 * abs(brightness - 128.0) / 128.0)
+
+    return {
+        "sharpness": round(sharpness, 2),
+        "exposure": round(exposure, 4),
+        "brightness": round(brightness, 1),
+        "score": round(sharpness * exposure, 2),
+    }
+
+
+def select_best_frame(frames: List[bytes]) -> Tuple[int, List[Dict[str, float]], float]:
+    """Score a burst of frames and return the best index, all scores and CPU time.
+
+    This is CPU bound and must run in an executor.
+    """
+    cpu_started = time.thread_time()
+    scores = []
+    for data in frames:
+        try:
+            scores.append(score_frame(data))
+        except Exception as err:
+            _LOGGER.debug("Could not score burst frame: %s", err)
+            scores.append({"sharpness": 0.0, "exposure": 0.0, "brightness": 0.0, "score": -1.0})
+    best = max(range(len(frames)), key=lambda index: scores[index]["score"])
+    return best, scores, round((time.thread_time() - cpu_started) * 1000, 2)
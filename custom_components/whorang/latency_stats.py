@@ -0,0 +1,149 @@
+"""Rolling AI response time statistics for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Bucket edges grow by 5%, from 10 ms to about 10 minutes
+BUCKET_MIN_MS = 10.0
+BUCKET_GROWTH = 1.05
+BUCKET_COUNT = 230
+# The window is split into slots that expire one at a time
+WINDOW_SECONDS = 24 * 3600
+WINDOW_SLOTS = 24
+PERCENTILES = (50, 95, 99)
+
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+# Upper edge of each bucket, the value reported for a percentile in it
+_BUCKET_UPPER_MS = BUCKET_MIN_MS * BUCKET_GROWTH ** np.arange(1, BUCKET_COUNT + 1)
+
+
+def parse_duration_ms(value: Any) -> Optional[float]:
+    """Return a processing time such as 1234, 1234.5 or "1234ms" in milliseconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().removesuffix("ms"))
+        except ValueError:
+            return None
+    return None
+
+
+def _bucket_index(duration_ms: float) -> int:
+    """Return the histogram bucket of a duration."""
+    if duration_ms <= BUCKET_MIN_MS:
+        return 0
+    return min(int(math.log(duration_ms / BUCKET_MIN_MS) / _LOG_GROWTH), BUCKET_COUNT - 1)
+
+
+class RollingLatencyHistogram:
+    """Fixed-bucket latency histogram over a rolling time window.
+
+    Buckets are log spaced, so a percentile is exact to within one bucket
+    (5%) whatever the latency range, and memory stays constant. The window
+    is made of slots, each a bucket count array; when a slot's time is up
+    it is cleared and reused, dropping the oldest samples.
+    """
+
+    def __init__(self, window: float = WINDOW_SECONDS, slots: int = WINDOW_SLOTS) -> None:
+        """Initialize the histogram."""
+        self._slot_seconds = window / slots
+        self._counts = np.zeros((slots, BUCKET_COUNT), dtype=np.int64)
+        self._errors = np.zeros(slots, dtype=np.int64)
+        # Slot number (time // slot length) each row currently holds
+        self._slot_ids = np.full(slots, -1, dtype=np.int64)
+        self.last_ms: Optional[float] = None
+
+    def _row(self, now: float) -> int:
+        """Return the row for the current slot, clearing it if it is stale."""
+        slot_id = int(now // self._slot_seconds)
+        row = slot_id % len(self._slot_ids)
+        if self._slot_ids[row] != slot_id:
+            self._counts[row] = 0
+            self._errors[row] = 0
+            self._slot_ids[row] = slot_id
+        return row
+
+    def _live_rows(self, now: float) -> np.ndarray:
+        """Return a mask of the rows inside the window."""
+        oldest = int(now // self._slot_seconds) - len(self._slot_ids) + 1
+        return self._slot_ids >= oldest
+
+    def add(self, duration_ms: float, now: Optional[float] = None) -> None:
+        """Add a successful request."""
+        row = self._row(now if now is not None else time.monotonic())
+        self._counts[row, _bucket_index(duration_ms)] += 1
+        self.last_ms = duration_ms
+
+    def add_error(self, now: Optional[float] = None) -> None:
+        """Add a failed request."""
+        row = self._row(now if now is not None else time.monotonic())
+        self._errors[row] += 1
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Return percentiles, throughput and error rate over the window."""
+        live = self._live_rows(now if now is not None else time.monotonic())
+        counts = self._counts[live].sum(axis=0)
+        total = int(counts.sum())
+        errors = int(self._errors[live].sum())
+        window_hours = len(self._slot_ids) * self._slot_seconds / 3600
+
+        summary: Dict[str, Any] = {
+            "count": total,
+            "errors": errors,
+            "error_rate": round(errors / (total + errors), 4) if total + errors else 0.0,
+            "throughput_per_hour": round(total / window_hours, 2),
+            "last_ms": self.last_ms,
+        }
+        cumulative = np.cumsum(counts)
+        for percentile in PERCENTILES:
+            key = f"p{percentile}_ms"
+            if not total:
+                summary[key] = None
+                continue
+            index = int(np.searchsorted(cumulative, math.ceil(total * percentile / 100)))
+            summary[key] = round(float(_BUCKET_UPPER_MS[index]), 1)
+        return summary
+
+
+class AILatencyTracker:
+    """Rolling AI response time statistics per provider and model, and overall."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._overall = RollingLatencyHistogram()
+        self._by_model: Dict[Tuple[str, str], RollingLatencyHistogram] = {}
+
+    def _histograms(self, provider: Optional[str], model: Optional[str]):
+        """Return the overall histogram and the one of a provider and model."""
+        key = (provider or "unknown", model or "unknown")
+        if key not in self._by_model:
+            self._by_model[key] = RollingLatencyHistogram()
+        return self._overall, self._by_model[key]
+
+    def record(self, provider: Optional[str], model: Optional[str], processing_time: Any) -> None:
+        """Record a completed analysis, ignoring unparsable processing times."""
+        duration_ms = parse_duration_ms(processing_time)
+        if duration_ms is None:
+            return
+        for histogram in self._histograms(provider, model):
+            histogram.add(duration_ms)
+
+    def record_error(self, provider: Optional[str], model: Optional[str]) -> None:
+        """Record a failed analysis."""
+        for histogram in self._histograms(provider, model):
+            histogram.add_error()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return the overall summary with a per provider and model breakdown."""
+        return {
+            **self._overall.summary(),
+            "by_model": {
+                f"{provider}/{model}": histogram.summary()
+                for (provider, model), histogram in self._by_model.items()
+            },
+        }
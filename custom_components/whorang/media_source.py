@@ -0,0 +1,169 @@
+"""Media source for browsing recent WhoRang visitors."""
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.media_player import MediaClass
+from homeassistant.components.media_source import (
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import WhoRangDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+VISITOR_IMAGE_URL = "/api/whorang/visitor_image/{entry_id}/{visitor_id}"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> WhoRangMediaSource:
+    """Set up the WhoRang media source."""
+    hass.http.register_view(WhoRangVisitorImageView(hass))
+    return WhoRangMediaSource(hass)
+
+
+def _get_coordinator(hass: HomeAssistant, entry_id: str) -> WhoRangDataUpdateCoordinator | None:
+    """Return the coordinator of a loaded config entry."""
+    coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+    if isinstance(coordinator, WhoRangDataUpdateCoordinator):
+        return coordinator
+    return None
+
+
+class WhoRangMediaSource(MediaSource):
+    """Provide recent visitor images from the visitor history."""
+
+    name = "WhoRang Visitors"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Resolve a visitor to its image URL."""
+        entry_id, _, visitor_id = (item.identifier or "").partition("/")
+        coordinator = _get_coordinator(self.hass, entry_id)
+        if coordinator is None or not visitor_id:
+            raise Unresolvable(f"Unknown visitor: {item.identifier}")
+
+        return PlayMedia(
+            VISITOR_IMAGE_URL.format(entry_id=entry_id, visitor_id=visitor_id),
+            "image/jpeg",
+        )
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Browse config entries and their recent visitors."""
+        if item.identifier:
+            entry_id = item.identifier.partition("/")[0]
+            coordinator = _get_coordinator(self.hass, entry_id)
+            if coordinator is None:
+                raise Unresolvable(f"Unknown config entry: {entry_id}")
+            return self._build_visitor_list(entry_id, coordinator)
+
+        entries = [
+            (entry_id, coordinator)
+            for entry_id, coordinator in self.hass.data.get(DOMAIN, {}).items()
+            if isinstance(coordinator, WhoRangDataUpdateCoordinator)
+        ]
+        if len(entries) == 1:
+            return self._build_visitor_list(*entries[0])
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=None,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=self.name,
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.DIRECTORY,
+            children=[
+                BrowseMediaSource(
+                    domain=DOMAIN,
+                    identifier=entry_id,
+                    media_class=MediaClass.DIRECTORY,
+                    media_content_type="",
+                    title=self._entry_title(entry_id),
+                    can_play=False,
+                    can_expand=True,
+                )
+                for entry_id, _ in entries
+            ],
+        )
+
+    def _entry_title(self, entry_id: str) -> str:
+        """Return the title of a config entry."""
+        entry = self.hass.config_entries.async_get_entry(entry_id)
+        return entry.title if entry else self.name
+
+    def _build_visitor_list(
+        self, entry_id: str, coordinator: WhoRangDataUpdateCoordinator
+    ) -> BrowseMediaSource:
+        """Return the recent visitors of a config entry, newest first."""
+        children = []
+        for visitor in coordinator.visitor_history.get_visitors():
+            url = VISITOR_IMAGE_URL.format(entry_id=entry_id, visitor_id=visitor["visitor_id"])
+            title = visitor.get("ai_title") or "Visitor"
+            if visitor.get("timestamp"):
+                title = f"{title} ({visitor['timestamp']})"
+            children.append(
+                BrowseMediaSource(
+                    domain=DOMAIN,
+                    identifier=f"{entry_id}/{visitor['visitor_id']}",
+                    media_class=MediaClass.IMAGE,
+                    media_content_type="image/jpeg",
+                    title=title,
+                    can_play=True,
+                    can_expand=False,
+                    thumbnail=f"{url}?thumbnail=1",
+                )
+            )
+
+        return BrowseMediaSource(
+            domain=DOMAIN,
+            identifier=entry_id,
+            media_class=MediaClass.DIRECTORY,
+            media_content_type="",
+            title=self._entry_title(entry_id),
+            can_play=False,
+            can_expand=True,
+            children_media_class=MediaClass.IMAGE,
+            children=children,
+        )
+
+
+class WhoRangVisitorImageView(HomeAssistantView):
+    """Serve visitor images and thumbnails from the visitor history."""
+
+    url = VISITOR_IMAGE_URL
+    name = "api:whorang:visitor_image"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(self, request: web.Request, entry_id: str, visitor_id: str) -> web.Response:
+        """Return a visitor image."""
+        coordinator = _get_coordinator(self.hass, entry_id)
+        if coordinator is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        thumbnail = request.query.get("thumbnail") == "1"
+        data = await coordinator.visitor_history.async_get_image(visitor_id, thumbnail=thumbnail)
+        if data is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        return web.Response(
+            body=data,
+            content_type="image/jpeg",
+            headers={"Cache-Control": "private, max-age=3600"},
+        )
@@ -0,0 +1,123 @@
+"""Person merging shared by the WhoRang API clients."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+
+from .const import API_FACES_PERSONS
+
+_LOGGER = logging.getLogger(__name__)
+
+RequestFunc = Callable[..., Awaitable[Dict[str, Any]]]
+ProgressCallback = Callable[[List[int], int], None]
+
+
+async def async_merge_persons(
+    client: Any,
+    request: RequestFunc,
+    route_missing: Type[Exception],
+    source_id: int,
+    target_id: int,
+    batch_size: int,
+    max_concurrency: int,
+    completed_face_ids: Optional[List[int]],
+    progress_callback: Optional[ProgressCallback],
+) -> Dict[str, Any]:
+    """Merge the source person into the target person.
+
+    The backend merges in one transaction. Only when it has no merge route
+    are the faces reassigned from here, any other error is raised.
+    """
+    try:
+        response = await request(
+            "POST", f"{API_FACES_PERSONS}/{target_id}/merge",
+            data={"source_person_id": source_id}
+        )
+    except route_missing as err:
+        # Older backends have no merge endpoint, reassign faces from here
+        _LOGGER.debug("Server-side merge unavailable, falling back to bulk assign: %s", err)
+        return await _async_merge_with_bulk_assign(
+            client, source_id, target_id, batch_size, max_concurrency,
+            completed_face_ids, progress_callback
+        )
+
+    if not response.get("success"):
+        return {
+            "success": False,
+            "method": "server",
+            "faces_moved": 0,
+            "completed_face_ids": [],
+            "errors": [str(response.get("error") or "merge failed")],
+        }
+    return {
+        "success": True,
+        "method": "server",
+        "faces_moved": response.get("faces_moved", 0),
+        "completed_face_ids": [],
+        "errors": [],
+    }
+
+
+async def _async_merge_with_bulk_assign(
+    client: Any,
+    source_id: int,
+    target_id: int,
+    batch_size: int,
+    max_concurrency: int,
+    completed_face_ids: Optional[List[int]],
+    progress_callback: Optional[ProgressCallback],
+) -> Dict[str, Any]:
+    """Merge persons by reassigning the source faces in concurrent batches."""
+    completed = set(completed_face_ids or [])
+    errors: List[str] = []
+
+    source_faces = await client.get_person_faces(source_id)
+    pending = [
+        face["id"] for face in source_faces
+        if face.get("id") is not None and face["id"] not in completed
+    ]
+    total = len(pending) + len(completed)
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def assign_batch(batch: List[int]) -> None:
+        async with semaphore:
+            result = await client.bulk_assign_faces(batch, target_id)
+        if "error" in result or result.get("assignedCount", 0) < len(batch):
+            errors.append(str(result.get("error") or result.get("errors") or "partial batch"))
+            return
+        completed.update(batch)
+        if progress_callback:
+            progress_callback(sorted(completed), total)
+
+    await asyncio.gather(*(assign_batch(batch) for batch in batches))
+
+    if errors:
+        _LOGGER.error("Failed to merge persons %s -> %s: %s", source_id, target_id, errors)
+        return {
+            "success": False,
+            "method": "bulk_assign",
+            "faces_moved": len(completed),
+            "completed_face_ids": sorted(completed),
+            "errors": errors,
+        }
+
+    try:
+        await client.delete_person(source_id)
+    except Exception as err:
+        return {
+            "success": False,
+            "method": "bulk_assign",
+            "faces_moved": len(completed),
+            "completed_face_ids": sorted(completed),
+            "errors": [f"Failed to delete source person: {err}"],
+        }
+
+    return {
+        "success": True,
+        "method": "bulk_assign",
+        "faces_moved": len(completed),
+        "completed_face_ids": [],
+        "errors": [],
+    }
@@ -0,0 +1,275 @@
+"""On-demand profiling of WhoRang AI Doorbell hot paths."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import pstats
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DATA_BACKEND_HUBS, DATA_PROFILE_SESSION, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Methods looked up through self on every call, so an instance attribute
+# replaces them for the session
+COORDINATOR_HOOKS = (
+    "_async_update_data",
+    "async_handle_backend_data",
+    "_handle_json_message",
+    "_handle_string_message",
+)
+HUB_HOOKS = ("_async_fetch_backend_data", "_async_dispatch_message")
+AUTOMATION_HOOKS = ("handle_doorbell_event", "_process_with_whorang_backend")
+DETECTOR_HOOKS = ("_trigger_doorbell_automation",)
+CAMERA_HOOKS = ("async_capture_snapshot",)
+ENTITY_PROPERTIES = ("native_value", "extra_state_attributes", "is_on")
+
+_MISSING = object()
+
+
+class _ProfiledCoroutine:
+    """Awaitable running a coroutine with the profiler on only while it runs.
+
+    The profiler is switched off whenever the coroutine is suspended, so
+    other tasks running meanwhile are not attributed to the hot path.
+    """
+
+    def __init__(self, session: ProfileSession, hook: str, coro) -> None:
+        """Initialize the wrapper."""
+        self._session = session
+        self._hook = hook
+        self._coro = coro
+
+    def __await__(self):
+        """Drive the coroutine one step at a time."""
+        send_value, error = None, None
+        while True:
+            started = self._session.enter()
+            try:
+                if error is not None:
+                    yielded = self._coro.throw(error)
+                else:
+                    yielded = self._coro.send(send_value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._session.exit(self._hook, started)
+            try:
+                send_value, error = (yield yielded), None
+            except BaseException as err:  # pylint: disable=broad-except
+                send_value, error = None, err
+
+
+class ProfileSession:
+    """A cProfile session limited to the integration's hot paths.
+
+    Hooks are installed by replacing the hot path methods and entity
+    properties with profiled wrappers for the length of the session and
+    restoring the originals afterwards, so nothing is left on those paths
+    while no session runs.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the session."""
+        self.hass = hass
+        self.profiler = cProfile.Profile()
+        self.active = False
+        self._depth = 0
+        # Owner, attribute and previous value in the owner's __dict__
+        self._patched: List[Tuple[Any, str, Any]] = []
+        # Hook -> [calls or steps, milliseconds with the profiler on]
+        self.hook_times: Dict[str, List[float]] = {}
+
+    def enter(self) -> float:
+        """Turn the profiler on for a hook, nested hooks share it."""
+        if not self.active:
+            # A coroutine still suspended in a hook when the session ended
+            return time.perf_counter()
+        if self._depth == 0:
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Another profiler took over meanwhile, the hot path must still run
+                pass
+        self._depth += 1
+        return time.perf_counter()
+
+    def exit(self, hook: str, started: float) -> None:
+        """Turn the profiler off when the outermost hook returns."""
+        if not self.active:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            self.profiler.disable()
+        totals = self.hook_times.setdefault(hook, [0, 0.0])
+        totals[0] += 1
+        totals[1] += (time.perf_counter() - started) * 1000
+
+    def _wrap(self, hook: str, func: Callable) -> Callable:
+        """Return a profiled version of a function or coroutine function."""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await _ProfiledCoroutine(self, hook, func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = self.enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.exit(hook, started)
+        return wrapper
+
+    def _patch(self, owner: Any, name: str, value: Any) -> None:
+        """Replace an attribute, remembering what to restore."""
+        self._patched.append((owner, name, vars(owner).get(name, _MISSING)))
+        setattr(owner, name, value)
+
+    def _hook_methods(self, instance: Any, names: Tuple[str, ...]) -> None:
+        """Profile methods of an instance."""
+        if instance is None:
+            return
+        for name in names:
+            method = getattr(instance, name, None)
+            if method is not None:
+                self._patch(instance, name, self._wrap(f"{type(instance).__name__}.{name}", method))
+
+    def _hook_entity_properties(self, base: type) -> None:
+        """Profile the state and attribute properties of entity classes."""
+        classes = [base]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+            for name in ENTITY_PROPERTIES:
+                prop = vars(cls).get(name)
+                if isinstance(prop, property) and prop.fget is not None:
+                    self._patch(cls, name, property(self._wrap(f"{cls.__name__}.{name}", prop.fget)))
+
+    def install(self) -> None:
+        """Install the hooks on every loaded config entry."""
+        # Imported here, the platforms are loaded after this module
+        from .binary_sensor import WhoRangBinarySensorEntity
+        from .coordinator import WhoRangDataUpdateCoordinator
+        from .sensor import WhoRangSensorEntity
+
+        self.active = True
+        for coordinator in self.hass.data.get(DOMAIN, {}).values():
+            if not isinstance(coordinator, WhoRangDataUpdateCoordinator):
+                continue
+            self._hook_methods(coordinator, COORDINATOR_HOOKS)
+            self._hook_methods(coordinator._automation_engine, AUTOMATION_HOOKS)
+            self._hook_methods(coordinator._doorbell_detector, DETECTOR_HOOKS)
+            self._hook_methods(coordinator._camera_manager, CAMERA_HOOKS)
+        for hub in self.hass.data.get(DATA_BACKEND_HUBS, {}).values():
+            self._hook_methods(hub, HUB_HOOKS)
+        self._hook_entity_properties(WhoRangSensorEntity)
+        self._hook_entity_properties(WhoRangBinarySensorEntity)
+
+    def uninstall(self) -> None:
+        """Restore the original methods and properties."""
+        self.active = False
+        while self._patched:
+            owner, name, previous = self._patched.pop()
+            if previous is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, previous)
+        if self._depth:
+            self.profiler.disable()
+            self._depth = 0
+
+    def hook_summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the time spent per hook, most first.
+
+        Coroutine hooks count each resumed step as a call.
+        """
+        return {
+            hook: {"calls": int(calls), "total_ms": round(total_ms, 2)}
+            for hook, (calls, total_ms) in sorted(
+                self.hook_times.items(), key=lambda item: item[1][1], reverse=True
+            )
+        }
+
+
+def write_report(profiler: cProfile.Profile, path: str, sort: str, top: int) -> List[Dict[str, Any]]:
+    """Write the profile report and return the top functions.
+
+    Runs in the executor, sorting and formatting large profiles is slow.
+    """
+    stream = io.StringIO()
+    try:
+        stats = pstats.Stats(profiler, stream=stream)
+    except TypeError:
+        # Nothing was profiled, no hot path ran during the session
+        stats = None
+    else:
+        stats.sort_stats(sort).print_stats()
+
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(f"WhoRang profile, {datetime.now().isoformat()}, sorted by {sort}\n")
+        report.write(stream.getvalue() if stats else "No hot path ran during the session.\n")
+
+    if stats is None:
+        return []
+
+    summary = []
+    for (filename, line, function) in stats.fcn_list[:top]:
+        primitive_calls, calls, own_time, cumulative_time, _ = stats.stats[(filename, line, function)]
+        summary.append({
+            "function": f"{filename}:{line}({function})",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_ms": round(own_time * 1000, 3),
+            "cumulative_ms": round(cumulative_time * 1000, 3),
+        })
+    return summary
+
+
+async def async_profile(hass: HomeAssistant, duration: float, top: int, sort: str) -> Dict[str, Any]:
+    """Profile the hot paths for a while and return a summary of the report.
+
+    Raises HomeAssistantError if another profiler is active.
+    """
+    session = ProfileSession(hass)
+    # Enabling once up front also detects profilers using sys.monitoring
+    # (cProfile on Python 3.12+), which sys.getprofile() does not show
+    if sys.getprofile() is not None:
+        raise HomeAssistantError("Another profiler is active, stop it before profiling WhoRang")
+    try:
+        session.profiler.enable()
+    except ValueError as err:
+        raise HomeAssistantError(
+            f"Another profiler is active, stop it before profiling WhoRang: {err}"
+        ) from err
+    session.profiler.disable()
+
+    hass.data[DATA_PROFILE_SESSION] = session
+    session.install()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        session.uninstall()
+        hass.data.pop(DATA_PROFILE_SESSION, None)
+
+    path = hass.config.path(f"whorang_profile_{datetime.now():%Y%m%d_%H%M%S}.txt")
+    top_functions = await hass.async_add_executor_job(write_report, session.profiler, path, sort, top)
+    _LOGGER.info("Wrote WhoRang profile report to %s", path)
+    return {
+        "report": path,
+        "duration": duration,
+        "sort": sort,
+        "hooks": session.hook_summary(),
+        "top": top_functions,
+    }
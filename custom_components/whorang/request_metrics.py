@@ -0,0 +1,123 @@
+"""Backend API request metrics for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional
+
+from .latency_stats import RollingLatencyHistogram
+
+# Coarser than the AI latency window, there is a histogram per endpoint
+WINDOW_SLOTS = 4
+# Path segments that are ids, folded so /api/visitors/12 and /13 share metrics
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,})(?=/|$)")
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """Return the metrics key of a request, such as "GET /api/visitors/{id}"."""
+    path = endpoint.split("?", 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class EndpointMetrics:
+    """Counters and a rolling latency histogram of one endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency = RollingLatencyHistogram(slots=WINDOW_SLOTS)
+        self.calls = 0
+        self.total_ms = 0.0
+        self.decode_ms = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+        self.errors: Dict[str, int] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the counters with the latency percentiles of the window."""
+        latency = self.latency.summary()
+        decoded = latency["count"] or 1
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 1),
+            "p50_ms": latency["p50_ms"],
+            "p95_ms": latency["p95_ms"],
+            "p99_ms": latency["p99_ms"],
+            "throughput_per_hour": latency["throughput_per_hour"],
+            "error_rate": latency["error_rate"],
+            "avg_decode_ms": round(self.decode_ms / decoded, 3),
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "retries": self.retries,
+            "errors": dict(self.errors),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint metrics of the requests made by an API client.
+
+    Only exists while something asked for it, the client skips all
+    recording when it has no metrics object.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+        self.cache_hits: Dict[str, int] = {}
+
+    def _endpoint(self, method: str, endpoint: str) -> EndpointMetrics:
+        """Return the metrics of an endpoint, creating them on first use."""
+        key = endpoint_key(method, endpoint)
+        if key not in self._endpoints:
+            self._endpoints[key] = EndpointMetrics()
+        return self._endpoints[key]
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        duration_ms: float,
+        bytes_out: int,
+        bytes_in: int,
+        decode_ms: float,
+    ) -> None:
+        """Record a successful request."""
+        metrics = self._endpoint(method, endpoint)
+        metrics.calls += 1
+        metrics.total_ms += duration_ms
+        metrics.decode_ms += decode_ms
+        metrics.bytes_out += bytes_out
+        metrics.bytes_in += bytes_in
+        metrics.latency.add(duration_ms)
+
+    def record_error(
+        self, method: str, endpoint: str, error_class: str, duration_ms: float, bytes_out: int
+    ) -> None:
+        """Record a failed request by error class."""
+        metrics = self._endpoint(method, endpoint)
+        metrics.calls += 1
+        metrics.total_ms += duration_ms
+        metrics.bytes_out += bytes_out
+        metrics.errors[error_class] = metrics.errors.get(error_class, 0) + 1
+        metrics.latency.add_error()
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Record that a failed request is retried."""
+        self._endpoint(method, endpoint).retries += 1
+
+    def record_cache_hit(self, name: str) -> None:
+        """Record that requests were avoided by reusing a result."""
+        self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+
+    def get_statistics(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """Return totals and per-endpoint metrics, most time spent first."""
+        endpoints = sorted(self._endpoints.items(), key=lambda item: item[1].total_ms, reverse=True)
+        return {
+            "enabled": True,
+            "requests": sum(metrics.calls for _, metrics in endpoints),
+            "errors": sum(sum(metrics.errors.values()) for _, metrics in endpoints),
+            "retries": sum(metrics.retries for _, metrics in endpoints),
+            "bytes_out": sum(metrics.bytes_out for _, metrics in endpoints),
+            "bytes_in": sum(metrics.bytes_in for _, metrics in endpoints),
+            "cache_hits": dict(self.cache_hits),
+            "endpoints": {key: metrics.summary() for key, metrics in endpoints[:top]},
+        }
@@ -32,6 +32,9 @@ from .const import (
     SENSOR_AI_COST_TODAY,
     SENSOR_AI_COST_MONTH,
     SENSOR_AI_RESPONSE_TIME,
+    SENSOR_AI_RESPONSE_TIME_P95,
+    SENSOR_DOORBELL_LATENCY,
+    SENSOR_API_REQUESTS,
     SENSOR_KNOWN_FACES_COUNT,
     SENSOR_UNKNOWN_FACES,
     SENSOR_LATEST_FACE_DETECTION,
@@ -68,6 +71,7 @@ from .const import (
     DEVICE_CLASS_MONETARY,
 )
 from .coordinator import WhoRangDataUpdateCoordinator
+from .latency_stats import parse_duration_ms
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -90,6 +94,9 @@ async def async_setup_entry(
         WhoRangAICostTodaySensor(coordinator, config_entry),
         WhoRangAICostMonthSensor(coordinator, config_entry),
         WhoRangAIResponseTimeSensor(coordinator, config_entry),
+        WhoRangAIResponseTimeP95Sensor(coordinator, config_entry),
+        WhoRangDoorbellLatencySensor(coordinator, config_entry),
+        WhoRangAPIRequestsSensor(coordinator, config_entry),
         WhoRangKnownFacesCountSensor(coordinator, config_entry),
         WhoRangUnknownFacesSensor(coordinator, config_entry),
         WhoRangLatestFaceDetectionSensor(coordinator, config_entry),
@@ -415,6 +422,15 @@ class WhoRangVisitorCountTodaySensor(WhoRangSensorEntity):
         stats = system_info.get("stats", {})
         return stats.get("today", 0)
 
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return additional state attributes."""
+        visitor_stats = self.coordinator.data.get("visitor_stats", {}) if self.coordinator.data else {}
+        return {
+            "known_today": visitor_stats.get("known_today", 0),
+            "hourly_last_7_days": visitor_stats.get("hourly", []),
+        }
+
 
 class WhoRangVisitorCountWeekSensor(WhoRangSensorEntity):
     """Sensor for this week's visitor count."""
@@ -434,6 +450,12 @@ class WhoRangVisitorCountWeekSensor(WhoRangSensorEntity):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
+        # Local visitor time series, falling back to system info from API
+        if self.coordinator.data:
+            visitor_stats = self.coordinator.data.get("visitor_stats", {})
+            if visitor_stats.get("week") is not None:
+                return visitor_stats["week"]
+        
         system_info = self.coordinator.async_get_system_info()
         stats = system_info.get("stats", {})
         return stats.get("week", 0)
@@ -457,6 +479,12 @@ class WhoRangVisitorCountMonthSensor(WhoRangSensorEntity):
     @property
     def native_value(self) -> int:
         """Return the state of the sensor."""
+        # Local visitor time series, falling back to system info from API
+        if self.coordinator.data:
+            visitor_stats = self.coordinator.data.get("visitor_stats", {})
+            if visitor_stats.get("month") is not None:
+                return visitor_stats["month"]
+        
         system_info = self.coordinator.async_get_system_info()
         stats = system_info.get("stats", {})
         return stats.get("month", 0)
@@ -691,30 +719,17 @@ class WhoRangAIResponseTimeSensor(WhoRangSensorEntity):
     @property
     def native_value(self) -> Optional[int]:
         """Return the state of the sensor."""
-        # Check coordinator data first (includes service call updates and WebSocket data)
+        # Latest sample from analysis events, already parsed when recorded
         if self.coordinator.data:
-            latest_visitor = self.coordinator.data.get("latest_visitor")
-            if latest_visitor and latest_visitor.get("processing_time"):
-                processing_time = latest_visitor.get("processing_time")
-                if isinstance(processing_time, str):
-                    # Handle string format (remove "ms" suffix if present)
-                    return int(processing_time.replace("ms", ""))
-                elif isinstance(processing_time, (int, float)):
-                    return int(processing_time)
-            
-            # Check WebSocket analysis status data
-            analysis_status = self.coordinator.data.get("analysis_status", {})
-            if analysis_status.get("processing_time_ms"):
-                return int(analysis_status.get("processing_time_ms"))
+            last_ms = self.coordinator.data.get("ai_latency", {}).get("last_ms")
+            if last_ms is not None:
+                return int(last_ms)
         
         # Fallback to API data
         latest_visitor = self.coordinator.async_get_latest_visitor()
-        if latest_visitor and latest_visitor.get("processing_time"):
-            processing_time = latest_visitor.get("processing_time")
-            if isinstance(processing_time, str):
-                # Handle string format (remove "ms" suffix if present)
-                return int(processing_time.replace("ms", ""))
-            elif isinstance(processing_time, (int, float)):
+        if latest_visitor:
+            processing_time = parse_duration_ms(latest_visitor.get("processing_time"))
+            if processing_time is not None:
                 return int(processing_time)
         
         return None
@@ -748,9 +763,139 @@ class WhoRangAIResponseTimeSensor(WhoRangSensorEntity):
                 attributes["confidence_score"] = latest_visitor.get("confidence_score")
                 attributes["visitor_id"] = latest_visitor.get("visitor_id")
         
+        # Rolling percentiles, throughput and error rate over the last day
+        if self.coordinator.data:
+            ai_latency = self.coordinator.data.get("ai_latency", {})
+            for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_per_hour", "error_rate"):
+                attributes[key] = ai_latency.get(key)
+        
         return attributes
 
 
+class WhoRangAIResponseTimeP95Sensor(WhoRangSensorEntity):
+    """Sensor for the 95th percentile AI response time over the last day."""
+
+    def __init__(
+        self,
+        coordinator: WhoRangDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_AI_RESPONSE_TIME_P95)
+        self._attr_name = "AI Response Time P95"
+        self._attr_icon = "mdi:timer-alert"
+        self._attr_native_unit_of_measurement = UNIT_MILLISECONDS
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = STATE_CLASS_MEASUREMENT
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the state of the sensor."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.get("ai_latency", {}).get("p95_ms")
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return additional state attributes."""
+        ai_latency = self.coordinator.data.get("ai_latency", {}) if self.coordinator.data else {}
+        attributes = {
+            key: ai_latency.get(key)
+            for key in ("p50_ms", "p99_ms", "count", "errors", "error_rate", "throughput_per_hour")
+        }
+        # Per provider/model breakdown, to compare models side by side
+        for name, summary in ai_latency.get("by_model", {}).items():
+            attributes[name] = {
+                key: summary.get(key)
+                for key in ("p50_ms", "p95_ms", "p99_ms", "count", "error_rate")
+            }
+        return attributes
+
+
+class WhoRangDoorbellLatencySensor(WhoRangSensorEntity):
+    """Sensor for the end-to-end latency of the latest doorbell event."""
+
+    def __init__(
+        self,
+        coordinator: WhoRangDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_DOORBELL_LATENCY)
+        self._attr_name = "Doorbell Latency"
+        self._attr_icon = "mdi:timer-sand"
+        self._attr_native_unit_of_measurement = UNIT_MILLISECONDS
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = STATE_CLASS_MEASUREMENT
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the state of the sensor."""
+        trace = self.coordinator.traces.latest
+        return trace.end_to_end_ms if trace else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return additional state attributes."""
+        trace = self.coordinator.traces.latest
+        if not trace:
+            return {}
+        return {
+            "correlation_id": trace.correlation_id,
+            "source": trace.source,
+            "visitor_id": trace.visitor_id,
+            "stages_ms": dict(trace.stages),
+            "milestones_ms": dict(trace.milestones),
+            "avg_end_to_end_ms": self.coordinator.traces.get_statistics()["avg_end_to_end_ms"],
+        }
+
+
+class WhoRangAPIRequestsSensor(WhoRangSensorEntity):
+    """Diagnostic sensor for backend API request metrics.
+
+    Disabled by default, the API client only records metrics while this
+    sensor is enabled.
+    """
+
+    # Endpoints listed in the attributes, most time spent first
+    TOP_ENDPOINTS = 10
+
+    def __init__(
+        self,
+        coordinator: WhoRangDataUpdateCoordinator,
+        config_entry: ConfigEntry,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, SENSOR_API_REQUESTS)
+        self._attr_name = "API Requests"
+        self._attr_icon = "mdi:api"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_state_class = STATE_CLASS_TOTAL_INCREASING
+
+    async def async_added_to_hass(self) -> None:
+        """Start recording request metrics."""
+        await super().async_added_to_hass()
+        self.coordinator.api_client.enable_request_metrics()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop recording request metrics."""
+        self.coordinator.api_client.disable_request_metrics()
+        await super().async_will_remove_from_hass()
+
+    @property
+    def native_value(self) -> Optional[int]:
+        """Return the state of the sensor."""
+        metrics = self.coordinator.api_client.request_metrics
+        return metrics.get_statistics(top=0)["requests"] if metrics else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return additional state attributes."""
+        metrics = self.coordinator.api_client.request_metrics
+        return metrics.get_statistics(top=self.TOP_ENDPOINTS) if metrics else {}
+
+
 class WhoRangKnownFacesCountSensor(WhoRangSensorEntity):
     """Sensor for known faces count."""
 
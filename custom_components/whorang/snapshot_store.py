@@ -0,0 +1,295 @@
+"""Content-addressed snapshot storage for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DATA_SNAPSHOT_STORE, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT_INDEX
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_SAVE_DELAY = 10
+
+
+def content_digest(data: bytes) -> str:
+    """Return the content hash used as snapshot filename."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def write_file_atomic(file_path: Path, data: bytes) -> None:
+    """Write a file via a temporary file so readers never see partial data."""
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=".tmp_", suffix=file_path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotStore:
+    """Snapshot files keyed by content hash, bounded by a byte quota and age.
+
+    Entries are kept in least-recently-used order. Storing a frame that is
+    already present only refreshes its position, so repeated rings of an
+    identical frame cost no disk space. The index is persisted in HA storage
+    so startup does not rescan the directory.
+
+    There is one store per Home Assistant instance, shared by all config
+    entries through async_acquire_snapshot_store, as the index and the
+    directory are global. Every entry sets its own quota and age limit and
+    the most permissive of them applies, so no entry loses snapshots
+    sooner than its options allow.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        directory: Path,
+        max_bytes: int,
+        max_age_seconds: float,
+    ) -> None:
+        """Initialize the snapshot store."""
+        self.hass = hass
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT_INDEX)
+        # filename -> {"size": int, "created": float, "last_access": float}
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._total_bytes = 0
+        self._duplicates = 0
+        self._evicted = 0
+        # Digest -> write in progress, concurrent puts of a frame share it
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Filename -> eviction in progress, a put of that frame waits for it
+        self._deleting: Dict[str, asyncio.Future] = {}
+        self._load_task: Optional[asyncio.Task] = None
+        # User -> (max_bytes, max_age_seconds) of each entry sharing the store
+        self._limits: Dict[Any, Tuple[int, float]] = {}
+
+    @property
+    def users(self) -> int:
+        """Return the number of entries using the store."""
+        return len(self._limits)
+
+    def set_limits(self, user: Any, max_bytes: int, max_age_seconds: float) -> None:
+        """Set the limits of one user, the most permissive of all users apply."""
+        self._limits[user] = (max_bytes, max_age_seconds)
+        self.max_bytes = max(limits[0] for limits in self._limits.values())
+        self.max_age_seconds = max(limits[1] for limits in self._limits.values())
+
+    def remove_limits(self, user: Any) -> None:
+        """Drop the limits of a user that no longer uses the store."""
+        self._limits.pop(user, None)
+        if self._limits:
+            self.max_bytes = max(limits[0] for limits in self._limits.values())
+            self.max_age_seconds = max(limits[1] for limits in self._limits.values())
+
+    async def async_load(self) -> None:
+        """Load the index once, later calls wait for the first load."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load_index())
+        await asyncio.shield(self._load_task)
+
+    @property
+    def loaded(self) -> bool:
+        """Return whether the index was loaded, only then is it worth saving."""
+        task = self._load_task
+        return task is not None and task.done() and not task.cancelled() and task.exception() is None
+
+    async def _async_load_index(self) -> None:
+        """Load the index, scanning the directory only if no index exists."""
+        data = await self._store.async_load()
+        if data and isinstance(data.get("entries"), list):
+            entries = data["entries"]
+            await self.hass.async_add_executor_job(self._ensure_directory)
+        else:
+            entries = await self.hass.async_add_executor_job(self._scan_directory)
+            _LOGGER.info("Built snapshot index from %d existing files", len(entries))
+
+        for entry in sorted(entries, key=lambda item: item["last_access"]):
+            self._entries[entry["filename"]] = {
+                "size": entry["size"],
+                "created": entry["created"],
+                "last_access": entry["last_access"],
+            }
+            self._total_bytes += entry["size"]
+
+        await self.async_evict()
+
+    def _ensure_directory(self) -> None:
+        """Create the snapshot directory."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _scan_directory(self) -> List[Dict[str, Any]]:
+        """Index snapshot files already on disk."""
+        self._ensure_directory()
+        entries = []
+        for file_path in self.directory.glob("*.jpg"):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            entries.append({
+                "filename": file_path.name,
+                "size": stat.st_size,
+                "created": stat.st_mtime,
+                "last_access": stat.st_mtime,
+            })
+        return entries
+
+    async def async_put(self, data: bytes, digest: Optional[str] = None) -> Tuple[str, bool]:
+        """Store image bytes, returning the filename and whether it was a duplicate."""
+        if digest is None:
+            digest = await self.hass.async_add_executor_job(content_digest, data)
+        filename = f"{digest}.jpg"
+        now = time.time()
+
+        # Wait while the same frame is being written, instead of writing it
+        # twice, or being evicted, so the unlink cannot remove the new file
+        while (busy := self._pending.get(digest) or self._deleting.get(filename)) is not None:
+            await asyncio.shield(busy)
+
+        entry = self._entries.get(filename)
+        if entry is not None:
+            entry["last_access"] = now
+            self._entries.move_to_end(filename)
+            self._duplicates += 1
+            self._schedule_save()
+            return filename, True
+
+        pending = self._pending[digest] = self.hass.loop.create_future()
+        try:
+            await self.hass.async_add_executor_job(write_file_atomic, self.directory / filename, data)
+            self._entries[filename] = {"size": len(data), "created": now, "last_access": now}
+            self._total_bytes += len(data)
+        finally:
+            del self._pending[digest]
+            pending.set_result(None)
+
+        await self.async_evict(keep=filename)
+        self._schedule_save()
+        return filename, False
+
+    def contains(self, filename: str) -> bool:
+        """Return whether a snapshot is stored."""
+        return filename in self._entries
+
+    def path_for(self, filename: str) -> Path:
+        """Return the on-disk path of a stored snapshot."""
+        return self.directory / filename
+
+    async def async_evict(self, keep: Optional[str] = None) -> int:
+        """Evict expired snapshots, then least recently used ones over quota."""
+        cutoff = time.time() - self.max_age_seconds
+        victims = []
+
+        for filename, entry in list(self._entries.items()):
+            over_quota = self._total_bytes > self.max_bytes
+            if filename == keep or (entry["last_access"] >= cutoff and not over_quota):
+                break
+            victims.append(filename)
+            self._total_bytes -= entry["size"]
+            del self._entries[filename]
+
+        if victims:
+            self._evicted += len(victims)
+            deleting = self.hass.loop.create_future()
+            for filename in victims:
+                self._deleting[filename] = deleting
+            try:
+                await self.hass.async_add_executor_job(self._delete_files, victims)
+            finally:
+                for filename in victims:
+                    del self._deleting[filename]
+                deleting.set_result(None)
+            self._schedule_save()
+            _LOGGER.debug("Evicted %d snapshots, %d bytes in use", len(victims), self._total_bytes)
+
+        return len(victims)
+
+    def _delete_files(self, filenames: List[str]) -> None:
+        """Delete snapshot files."""
+        for filename in filenames:
+            try:
+                (self.directory / filename).unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as err:
+                _LOGGER.debug("Error deleting snapshot %s: %s", filename, err)
+
+    def _schedule_save(self) -> None:
+        """Persist the index after a short delay."""
+        self._store.async_delay_save(self._data_to_save, INDEX_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the index in storage format."""
+        return {
+            "entries": [
+                {"filename": filename, **entry}
+                for filename, entry in self._entries.items()
+            ]
+        }
+
+    async def async_flush(self) -> None:
+        """Write the index to storage immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get snapshot store statistics."""
+        return {
+            "stored_snapshots": len(self._entries),
+            "stored_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "duplicate_frames": self._duplicates,
+            "evicted_snapshots": self._evicted,
+        }
+
+
+async def async_acquire_snapshot_store(
+    hass: HomeAssistant,
+    directory: Path,
+    user: Any,
+    max_bytes: int,
+    max_age_seconds: float,
+) -> SnapshotStore:
+    """Return the shared snapshot store, creating and loading it on first use."""
+    store: Optional[SnapshotStore] = hass.data.get(DATA_SNAPSHOT_STORE)
+    if store is None:
+        store = hass.data[DATA_SNAPSHOT_STORE] = SnapshotStore(
+            hass, directory, max_bytes, max_age_seconds
+        )
+    store.set_limits(user, max_bytes, max_age_seconds)
+    try:
+        await store.async_load()
+    except BaseException:
+        await async_release_snapshot_store(hass, store, user)
+        raise
+    return store
+
+
+async def async_release_snapshot_store(hass: HomeAssistant, store: SnapshotStore, user: Any) -> None:
+    """Release the shared snapshot store, flushing its index for the last user."""
+    store.remove_limits(user)
+    if store.users > 0:
+        return
+    if hass.data.get(DATA_SNAPSHOT_STORE) is store:
+        hass.data.pop(DATA_SNAPSHOT_STORE)
+    if store.loaded:
+        await store.async_flush()
@@ -0,0 +1,149 @@
+"""In-memory snapshot serving for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+
+from .const import DATA_SNAPSHOT_BUFFER
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_VIEW_URL = "/api/whorang/snapshot/{snapshot_id}"
+DEFAULT_BUFFER_ITEMS = 16
+DEFAULT_BUFFER_BYTES = 32 * 1024 * 1024
+DEFAULT_TOKEN_TTL = 300
+
+
+class SnapshotBuffer:
+    """Bounded in-memory ring buffer of recent snapshots with signed access URLs."""
+
+    def __init__(
+        self,
+        max_items: int = DEFAULT_BUFFER_ITEMS,
+        max_bytes: int = DEFAULT_BUFFER_BYTES,
+    ) -> None:
+        """Initialize the snapshot buffer."""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self._total_bytes = 0
+        # Tokens only need to survive as long as the buffer, which is in memory
+        self._secret = secrets.token_bytes(32)
+        self._served = 0
+        self._misses = 0
+
+    def put(self, snapshot_id: str, data: bytes) -> None:
+        """Add a snapshot, dropping the oldest ones beyond the bounds."""
+        previous = self._images.pop(snapshot_id, None)
+        if previous is not None:
+            self._total_bytes -= len(previous)
+        self._images[snapshot_id] = data
+        self._total_bytes += len(data)
+
+        while len(self._images) > 1 and (
+            len(self._images) > self.max_items or self._total_bytes > self.max_bytes
+        ):
+            _, dropped = self._images.popitem(last=False)
+            self._total_bytes -= len(dropped)
+
+    def get(self, snapshot_id: str) -> Optional[bytes]:
+        """Return a buffered snapshot."""
+        return self._images.get(snapshot_id)
+
+    def serve(self, snapshot_id: str) -> Optional[bytes]:
+        """Return a buffered snapshot for the view, counting hits and misses."""
+        data = self._images.get(snapshot_id)
+        if data is None:
+            self._misses += 1
+        else:
+            self._served += 1
+        return data
+
+    def _signature(self, snapshot_id: str, expires: int) -> str:
+        """Return the token for a snapshot and expiry time."""
+        message = f"{snapshot_id}:{expires}".encode()
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def sign_path(self, snapshot_id: str, ttl: int = DEFAULT_TOKEN_TTL) -> str:
+        """Return a short-lived signed path for a snapshot."""
+        expires = int(time.time()) + ttl
+        path = SNAPSHOT_VIEW_URL.format(snapshot_id=snapshot_id)
+        return f"{path}?expires={expires}&token={self._signature(snapshot_id, expires)}"
+
+    def verify(self, snapshot_id: str, expires: str, token: str) -> bool:
+        """Check a token and its expiry."""
+        try:
+            expires_at = int(expires)
+        except (TypeError, ValueError):
+            return False
+        if expires_at < time.time():
+            return False
+        return hmac.compare_digest(self._signature(snapshot_id, expires_at), token or "")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get buffer statistics."""
+        return {
+            "buffered_snapshots": len(self._images),
+            "buffered_bytes": self._total_bytes,
+            "served": self._served,
+            "misses": self._misses,
+        }
+
+
+class WhoRangSnapshotView(HomeAssistantView):
+    """Serve buffered snapshots to holders of a signed URL."""
+
+    url = SNAPSHOT_VIEW_URL
+    name = "api:whorang:snapshot"
+    # The backend has no Home Assistant credentials, the signed token is the auth
+    requires_auth = False
+
+    def __init__(self, buffer: SnapshotBuffer) -> None:
+        """Initialize the view."""
+        self._buffer = buffer
+
+    async def get(self, request: web.Request, snapshot_id: str) -> web.Response:
+        """Return a snapshot from memory."""
+        if not self._buffer.verify(
+            snapshot_id, request.query.get("expires"), request.query.get("token")
+        ):
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        data = self._buffer.serve(snapshot_id)
+        if data is None:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        return web.Response(
+            body=data,
+            content_type="image/jpeg",
+            headers={"Cache-Control": "private, max-age=300"},
+        )
+
+
+@callback
+def async_get_snapshot_buffer(hass: HomeAssistant) -> SnapshotBuffer:
+    """Return the shared snapshot buffer, registering its view on first use."""
+    buffer: Optional[SnapshotBuffer] = hass.data.get(DATA_SNAPSHOT_BUFFER)
+    if buffer is None:
+        buffer = hass.data[DATA_SNAPSHOT_BUFFER] = SnapshotBuffer()
+        hass.http.register_view(WhoRangSnapshotView(buffer))
+    return buffer
+
+
+def build_snapshot_url(hass: HomeAssistant, path: str) -> str:
+    """Make a snapshot path absolute, preferring the internal URL."""
+    try:
+        return f"{get_url(hass, prefer_external=False)}{path}"
+    except NoURLAvailableError:
+        return path
@@ -0,0 +1,140 @@
+"""Doorbell latency tracing for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MAX_TRACES = 50
+
+# Milestones that end a trace, best first
+END_MILESTONES = ("ai_complete", "visitor_received", "backend_accepted", "notification_sent")
+
+
+def new_correlation_id() -> str:
+    """Return a new correlation id."""
+    return uuid.uuid4().hex
+
+
+class DoorbellTrace:
+    """Timing trace of one doorbell event through the pipeline.
+
+    Stages hold durations in milliseconds (camera fetch, backend POST, ...)
+    and milestones hold the milliseconds since the trigger at which a point
+    was reached (backend accepted, AI text received, ...).
+    """
+
+    def __init__(self, correlation_id: str, source: str, entity_id: Optional[str] = None) -> None:
+        """Initialize the trace."""
+        self.correlation_id = correlation_id
+        self.source = source
+        self.entity_id = entity_id
+        self.visitor_id: Optional[str] = None
+        # Every id the backend knows the visitor by, its messages use either
+        self.visitor_ids: List[str] = []
+        self.started_at = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.milestones: Dict[str, float] = {}
+
+    def add_stage(self, stage: str, duration_ms: Optional[float]) -> None:
+        """Record the duration of a stage."""
+        if duration_ms is not None:
+            self.stages[stage] = round(float(duration_ms), 1)
+
+    def mark(self, milestone: str) -> None:
+        """Record that a milestone was reached now, keeping the first time."""
+        self.milestones.setdefault(milestone, round((time.perf_counter() - self._started) * 1000, 1))
+
+    @property
+    def end_to_end_ms(self) -> Optional[float]:
+        """Return the time from trigger to the furthest milestone reached."""
+        for milestone in END_MILESTONES:
+            if milestone in self.milestones:
+                return self.milestones[milestone]
+        return None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the trace as a dict."""
+        return {
+            "correlation_id": self.correlation_id,
+            "source": self.source,
+            "entity_id": self.entity_id,
+            "visitor_id": self.visitor_id,
+            "started_at": self.started_at,
+            "stages_ms": dict(self.stages),
+            "milestones_ms": dict(self.milestones),
+            "end_to_end_ms": self.end_to_end_ms,
+        }
+
+
+class DoorbellTraceBuffer:
+    """Bounded buffer of the most recent doorbell traces."""
+
+    def __init__(self, max_traces: int = DEFAULT_MAX_TRACES) -> None:
+        """Initialize the buffer."""
+        self.max_traces = max_traces
+        self._traces: OrderedDict[str, DoorbellTrace] = OrderedDict()
+        self._by_visitor: Dict[str, str] = {}
+
+    def start(
+        self, source: str, entity_id: Optional[str] = None, correlation_id: Optional[str] = None
+    ) -> DoorbellTrace:
+        """Start a trace, dropping the oldest when the buffer is full."""
+        trace = DoorbellTrace(correlation_id or new_correlation_id(), source, entity_id)
+        self._traces[trace.correlation_id] = trace
+        while len(self._traces) > self.max_traces:
+            _, dropped = self._traces.popitem(last=False)
+            for visitor_id in dropped.visitor_ids:
+                self._by_visitor.pop(visitor_id, None)
+        return trace
+
+    def get(self, correlation_id: Optional[str]) -> Optional[DoorbellTrace]:
+        """Return a trace by correlation id."""
+        return self._traces.get(correlation_id) if correlation_id else None
+
+    def link_visitor(self, trace: DoorbellTrace, *visitor_ids: Any) -> None:
+        """Associate the backend visitor ids of a trace, the first is reported."""
+        for visitor_id in visitor_ids:
+            if visitor_id is None or visitor_id == "":
+                continue
+            visitor_id = str(visitor_id)
+            if trace.visitor_id is None:
+                trace.visitor_id = visitor_id
+            trace.visitor_ids.append(visitor_id)
+            self._by_visitor[visitor_id] = trace.correlation_id
+
+    def find(self, message_data: Dict[str, Any]) -> Optional[DoorbellTrace]:
+        """Return the trace a backend message belongs to, by correlation or visitor id."""
+        trace = self.get(message_data.get("correlation_id"))
+        if trace is None and message_data.get("visitor_id") is not None:
+            trace = self.get(self._by_visitor.get(str(message_data["visitor_id"])))
+        return trace
+
+    @property
+    def latest(self) -> Optional[DoorbellTrace]:
+        """Return the most recent trace."""
+        return next(reversed(self._traces.values()), None)
+
+    def as_list(self) -> list:
+        """Return all traces, newest first."""
+        return [trace.as_dict() for trace in reversed(self._traces.values())]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Return average stage timings over the buffered traces."""
+        totals: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        end_to_end = []
+        for trace in self._traces.values():
+            for stage, value in trace.stages.items():
+                totals[stage] = totals.get(stage, 0.0) + value
+                counts[stage] = counts.get(stage, 0) + 1
+            if trace.end_to_end_ms is not None:
+                end_to_end.append(trace.end_to_end_ms)
+        return {
+            "traces": len(self._traces),
+            "avg_stages_ms": {stage: round(totals[stage] / counts[stage], 1) for stage in totals},
+            "avg_end_to_end_ms": round(sum(end_to_end) / len(end_to_end), 1) if end_to_end else None,
+        }
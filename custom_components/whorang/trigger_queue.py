@@ -0,0 +1,151 @@
+"""Bounded doorbell trigger queue for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, State, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_WORKERS = 2
+
+RESULT_QUEUED = "queued"
+RESULT_COALESCED = "coalesced"
+RESULT_OVERFLOW = "overflow"
+
+
+class DoorbellTriggerQueue:
+    """Priority queue of doorbell triggers processed by a fixed set of workers.
+
+    Each doorbell has at most one trigger waiting and one being processed.
+    A trigger for a doorbell that is already waiting replaces the waiting
+    state, and one that arrives while its pipeline runs is dropped, both
+    counted as coalesced. Higher priority triggers (doorbell presses) are
+    processed before lower ones (motion). When the queue is full the lowest
+    priority trigger is dropped and counted as overflow. on_drop is called
+    with the entity id of every waiting trigger dropped without processing.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        handler: Callable[[str, State], Awaitable[None]],
+        max_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = DEFAULT_WORKERS,
+        on_drop: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Initialize the trigger queue."""
+        self.hass = hass
+        self.max_size = max(max_size, 1)
+        self._handler = handler
+        self._on_drop = on_drop
+        self._worker_count = max(workers, 1)
+        # Heap of (-priority, sequence, entity_id), the state lives in _pending
+        self._heap: List[Tuple[int, int, str]] = []
+        self._pending: Dict[str, State] = {}
+        self._running: Set[str] = set()
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._queued = 0
+        self._coalesced = 0
+        self._overflow = 0
+        self._processed = 0
+        self._failed = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Start the workers."""
+        for index in range(self._worker_count):
+            self._workers.append(
+                self.hass.async_create_background_task(
+                    self._async_worker(), f"whorang_trigger_worker_{index}"
+                )
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the workers and drop waiting triggers."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._heap.clear()
+        dropped = list(self._pending)
+        self._pending.clear()
+        if self._on_drop:
+            for entity_id in dropped:
+                self._on_drop(entity_id)
+
+    @callback
+    def async_submit(self, entity_id: str, state: State, priority: int) -> str:
+        """Queue a trigger, returning whether it was queued, coalesced or dropped."""
+        if entity_id in self._pending:
+            self._pending[entity_id] = state
+            self._coalesced += 1
+            return RESULT_COALESCED
+        if entity_id in self._running:
+            self._coalesced += 1
+            return RESULT_COALESCED
+
+        if len(self._heap) >= self.max_size:
+            lowest = max(self._heap)
+            if -lowest[0] >= priority:
+                self._overflow += 1
+                _LOGGER.warning("Doorbell trigger queue full, dropping trigger from %s", entity_id)
+                return RESULT_OVERFLOW
+            self._heap.remove(lowest)
+            heapq.heapify(self._heap)
+            del self._pending[lowest[2]]
+            self._overflow += 1
+            _LOGGER.warning(
+                "Doorbell trigger queue full, dropping lower priority trigger from %s", lowest[2]
+            )
+            if self._on_drop:
+                self._on_drop(lowest[2])
+
+        heapq.heappush(self._heap, (-priority, next(self._sequence), entity_id))
+        self._pending[entity_id] = state
+        self._queued += 1
+        self._wakeup.set()
+        return RESULT_QUEUED
+
+    async def _async_worker(self) -> None:
+        """Process queued triggers one at a time."""
+        while True:
+            await self._wakeup.wait()
+            if not self._heap:
+                self._wakeup.clear()
+                continue
+
+            _, _, entity_id = heapq.heappop(self._heap)
+            if not self._heap:
+                self._wakeup.clear()
+            state = self._pending.pop(entity_id)
+
+            self._running.add(entity_id)
+            try:
+                await self._handler(entity_id, state)
+                self._processed += 1
+            except Exception as err:
+                self._failed += 1
+                _LOGGER.error("Error processing doorbell trigger from %s: %s", entity_id, err, exc_info=True)
+            finally:
+                self._running.discard(entity_id)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get trigger queue statistics."""
+        return {
+            "queue_depth": len(self._heap),
+            "queue_max_size": self.max_size,
+            "running_pipelines": len(self._running),
+            "triggers_queued": self._queued,
+            "triggers_coalesced": self._coalesced,
+            "triggers_overflowed": self._overflow,
+            "triggers_processed": self._processed,
+            "triggers_failed": self._failed,
+        }
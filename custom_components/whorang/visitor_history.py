@@ -0,0 +1,240 @@
+"""Recent visitor image history for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import STORAGE_VERSION, STORAGE_KEY_VISITOR_HISTORY
+from .image_processing import resize_image
+from .snapshot_store import write_file_atomic
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 20
+DEFAULT_HISTORY_BYTES = 16 * 1024 * 1024
+THUMBNAIL_SIZE = 320
+THUMBNAIL_QUALITY = 75
+INDEX_SAVE_DELAY = 10
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_-]")
+
+
+class VisitorImageHistory:
+    """The last N visitors with their images held in a memory-budgeted LRU.
+
+    Visitor metadata is kept for the newest max_items visitors in arrival
+    order. Full images are downloaded once and kept in least-recently-used
+    order until full images and thumbnails together exceed max_bytes, at
+    which point the least recently viewed full images are dropped and
+    downloaded again on demand. Thumbnails can be persisted so the history
+    survives a restart without downloading anything.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fetch: Callable[[str], Awaitable[Optional[bytes]]],
+        storage_suffix: Optional[str] = None,
+        max_items: int = DEFAULT_HISTORY_SIZE,
+        max_bytes: int = DEFAULT_HISTORY_BYTES,
+        thumbnail_dir: Optional[Path] = None,
+    ) -> None:
+        """Initialize the visitor history."""
+        self.hass = hass
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.thumbnail_dir = thumbnail_dir
+        self._fetch = fetch
+        key = f"{STORAGE_KEY_VISITOR_HISTORY}.{storage_suffix}" if storage_suffix else STORAGE_KEY_VISITOR_HISTORY
+        self._store = Store(hass, STORAGE_VERSION, key)
+        self._visitors: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._images: OrderedDict[str, bytes] = OrderedDict()
+        self._thumbnails: Dict[str, bytes] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._downloads = 0
+
+    @property
+    def _used_bytes(self) -> int:
+        """Return the memory used by images and thumbnails."""
+        return sum(len(data) for data in self._images.values()) + sum(
+            len(data) for data in self._thumbnails.values()
+        )
+
+    async def async_load(self) -> None:
+        """Restore the visitor index from storage."""
+        data = await self._store.async_load()
+        # Visitors recorded before loading finished are newer than stored ones
+        recorded = list(self._visitors.items())
+        self._visitors.clear()
+        for visitor in (data or {}).get("visitors", []):
+            self._visitors[visitor["visitor_id"]] = visitor
+        for visitor_id, visitor in recorded:
+            self._visitors[visitor_id] = visitor
+            self._visitors.move_to_end(visitor_id)
+        while len(self._visitors) > self.max_items:
+            self._visitors.popitem(last=False)
+        if self.thumbnail_dir:
+            await self.hass.async_add_executor_job(
+                self.thumbnail_dir.mkdir, 0o755, True, True
+            )
+
+    async def async_add(self, visitor: Dict[str, Any]) -> None:
+        """Record a visitor and prefetch its image in the background."""
+        visitor_id = visitor.get("visitor_id")
+        image_url = visitor.get("image_url")
+        if not visitor_id or not image_url:
+            return
+        visitor_id = str(visitor_id)
+
+        self._visitors[visitor_id] = {
+            "visitor_id": visitor_id,
+            "timestamp": visitor.get("timestamp"),
+            "ai_title": visitor.get("ai_title"),
+            "ai_message": visitor.get("ai_message") or visitor.get("ai_analysis"),
+            "image_url": image_url,
+        }
+        self._visitors.move_to_end(visitor_id)
+
+        removed = []
+        while len(self._visitors) > self.max_items:
+            old_id, _ = self._visitors.popitem(last=False)
+            self._images.pop(old_id, None)
+            self._thumbnails.pop(old_id, None)
+            removed.append(old_id)
+        if removed and self.thumbnail_dir:
+            await self.hass.async_add_executor_job(self._delete_thumbnails, removed)
+
+        self._store.async_delay_save(self._data_to_save, INDEX_SAVE_DELAY)
+        self.hass.async_create_background_task(
+            self.async_get_image(visitor_id), f"whorang_visitor_image_{visitor_id}"
+        )
+
+    def get_visitors(self) -> List[Dict[str, Any]]:
+        """Return the recorded visitors, newest first."""
+        return list(reversed(self._visitors.values()))
+
+    def get_cached_image(self, visitor_id: str) -> Optional[bytes]:
+        """Return a visitor image only if it is already in memory."""
+        return self._images.get(str(visitor_id))
+
+    async def async_get_image(self, visitor_id: str, thumbnail: bool = False) -> Optional[bytes]:
+        """Return a visitor image or thumbnail, downloading it at most once."""
+        visitor_id = str(visitor_id)
+        if visitor_id not in self._visitors:
+            return None
+
+        if thumbnail:
+            if visitor_id in self._thumbnails:
+                self._hits += 1
+                return self._thumbnails[visitor_id]
+            if self.thumbnail_dir:
+                data = await self.hass.async_add_executor_job(self._read_thumbnail, visitor_id)
+                if data:
+                    self._thumbnails[visitor_id] = data
+                    self._hits += 1
+                    return data
+        elif visitor_id in self._images:
+            self._images.move_to_end(visitor_id)
+            self._hits += 1
+            return self._images[visitor_id]
+
+        # Concurrent viewers of the same visitor share one download
+        task = self._pending.get(visitor_id)
+        if task is None:
+            task = self._pending[visitor_id] = self.hass.async_create_task(
+                self._async_download(visitor_id)
+            )
+            task.add_done_callback(lambda _: self._pending.pop(visitor_id, None))
+        image = await asyncio.shield(task)
+
+        if thumbnail:
+            return self._thumbnails.get(visitor_id)
+        return image
+
+    async def _async_download(self, visitor_id: str) -> Optional[bytes]:
+        """Download a visitor image and derive its thumbnail."""
+        image_url = self._visitors[visitor_id]["image_url"]
+        image = await self._fetch(image_url)
+        if not image:
+            return None
+        self._downloads += 1
+
+        try:
+            thumbnail = await self.hass.async_add_executor_job(
+                resize_image, image, THUMBNAIL_SIZE, THUMBNAIL_SIZE, THUMBNAIL_QUALITY
+            )
+        except Exception as err:
+            _LOGGER.debug("Could not create thumbnail for visitor %s: %s", visitor_id, err)
+            thumbnail = None
+
+        # The visitor may have been pushed out of the history while downloading
+        if visitor_id not in self._visitors:
+            return image
+
+        self._images[visitor_id] = image
+        if thumbnail:
+            self._thumbnails[visitor_id] = thumbnail
+            if self.thumbnail_dir:
+                await self.hass.async_add_executor_job(
+                    write_file_atomic, self._thumbnail_path(visitor_id), thumbnail
+                )
+        self._enforce_budget(keep=visitor_id)
+        return image
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Drop least recently used full images until within the memory budget."""
+        used = self._used_bytes
+        for visitor_id in list(self._images):
+            if used <= self.max_bytes:
+                break
+            if visitor_id == keep:
+                continue
+            used -= len(self._images.pop(visitor_id))
+
+    def _thumbnail_path(self, visitor_id: str) -> Path:
+        """Return the persisted thumbnail path of a visitor."""
+        return self.thumbnail_dir / f"{_UNSAFE_FILENAME.sub('_', visitor_id)}.jpg"
+
+    def _read_thumbnail(self, visitor_id: str) -> Optional[bytes]:
+        """Read a persisted thumbnail."""
+        try:
+            return self._thumbnail_path(visitor_id).read_bytes()
+        except OSError:
+            return None
+
+    def _delete_thumbnails(self, visitor_ids: List[str]) -> None:
+        """Delete persisted thumbnails."""
+        for visitor_id in visitor_ids:
+            try:
+                self._thumbnail_path(visitor_id).unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as err:
+                _LOGGER.debug("Error deleting thumbnail for visitor %s: %s", visitor_id, err)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the visitor index in storage format."""
+        return {"visitors": list(self._visitors.values())}
+
+    async def async_flush(self) -> None:
+        """Write the visitor index to storage immediately."""
+        await self._store.async_save(self._data_to_save())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get visitor history statistics."""
+        return {
+            "history_visitors": len(self._visitors),
+            "history_images_cached": len(self._images),
+            "history_bytes": self._used_bytes,
+            "history_max_bytes": self.max_bytes,
+            "history_hits": self._hits,
+            "history_downloads": self._downloads,
+        }
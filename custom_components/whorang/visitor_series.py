@@ -0,0 +1,207 @@
+"""Visitor event time series for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Optional
+
+import numpy as np
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import STORAGE_KEY_VISITOR_SERIES, STORAGE_VERSION
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 16384
+SAVE_DELAY = 30
+# Seconds within which a backend visitor is taken to be a pending service call
+PROVISIONAL_MATCH_WINDOW = 120
+# Counted visitor ids remembered to recognise replays of the same visitor
+RECENT_VISITOR_IDS = 256
+
+LABEL_UNKNOWN = "unknown"
+LABEL_KNOWN = "known"
+LABEL_SERVICE_CALL = "service_call"
+LABELS = (LABEL_UNKNOWN, LABEL_KNOWN, LABEL_SERVICE_CALL)
+_LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+
+def parse_visitor_timestamp(value: Any) -> Optional[float]:
+    """Return a visitor timestamp as epoch seconds."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        parsed = dt_util.parse_datetime(value)
+        if parsed is not None:
+            return dt_util.as_utc(parsed).timestamp()
+    return None
+
+
+class VisitorTimeSeries:
+    """Ring buffer of visitor event timestamps and labels.
+
+    Timestamps (epoch seconds) and label codes live in two fixed numpy
+    arrays, so today/week/month counts and the hourly histogram are a few
+    vectorized comparisons over at most capacity events. The buffer is
+    persisted, which keeps the counts across restarts without asking the
+    backend. A service call is recorded as a provisional event that the
+    backend visitor it creates replaces instead of being counted twice,
+    pending service calls are matched oldest first. Backend visitors seen
+    again, such as the latest visitor after a restart, are recognised by
+    their visitor id.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage_suffix: Optional[str] = None,
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        """Initialize the time series."""
+        self.hass = hass
+        self.capacity = capacity
+        key = f"{STORAGE_KEY_VISITOR_SERIES}.{storage_suffix}" if storage_suffix else STORAGE_KEY_VISITOR_SERIES
+        self._store = Store(hass, STORAGE_VERSION, key)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._labels = np.zeros(capacity, dtype=np.uint8)
+        self._head = 0
+        self._size = 0
+        # Slots of provisional events not yet matched to a visitor, oldest first
+        self._provisional_slots: Deque[int] = deque()
+        self._visitor_ids: OrderedDict[str, None] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of events held."""
+        return self._size
+
+    async def async_load(self) -> None:
+        """Restore the events from storage."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        timestamps = data.get("timestamps", [])[-self.capacity:]
+        labels = data.get("labels", [])[-self.capacity:]
+        if len(timestamps) != len(labels):
+            _LOGGER.warning("Discarding inconsistent stored visitor time series")
+            return
+        size = len(timestamps)
+        self._timestamps[:size] = timestamps
+        self._labels[:size] = labels
+        self._size = size
+        self._head = size % self.capacity
+        for visitor_id in data.get("visitor_ids", []):
+            self._visitor_ids[visitor_id] = None
+
+    def async_record(
+        self,
+        timestamp: Optional[float] = None,
+        label: str = LABEL_UNKNOWN,
+        visitor_id: Optional[str] = None,
+    ) -> bool:
+        """Add a visitor event, returning whether it was counted.
+
+        A backend visitor whose id was already counted is a replay and is
+        not counted again.
+        """
+        timestamp = timestamp if timestamp is not None else dt_util.utcnow().timestamp()
+        code = _LABEL_CODES.get(label, _LABEL_CODES[LABEL_UNKNOWN])
+
+        if visitor_id is not None:
+            visitor_id = str(visitor_id)
+            if visitor_id in self._visitor_ids:
+                return False
+            self._visitor_ids[visitor_id] = None
+            while len(self._visitor_ids) > RECENT_VISITOR_IDS:
+                self._visitor_ids.popitem(last=False)
+
+        slot = self._match_provisional(timestamp) if label != LABEL_SERVICE_CALL else None
+        if slot is not None:
+            # The backend visitor of a service call already counted
+            self._timestamps[slot] = timestamp
+            self._labels[slot] = code
+        else:
+            slot = self._head
+            if self._provisional_slots and self._provisional_slots[0] == slot:
+                # The ring wrapped onto the oldest pending service call
+                self._provisional_slots.popleft()
+            self._timestamps[slot] = timestamp
+            self._labels[slot] = code
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            if label == LABEL_SERVICE_CALL:
+                self._provisional_slots.append(slot)
+
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return True
+
+    def _match_provisional(self, timestamp: float) -> Optional[int]:
+        """Take the oldest pending service call within the match window of a visitor."""
+        # Service calls too old for this visitor are too old for later ones
+        while (
+            self._provisional_slots
+            and self._timestamps[self._provisional_slots[0]] < timestamp - PROVISIONAL_MATCH_WINDOW
+        ):
+            self._provisional_slots.popleft()
+        for slot in self._provisional_slots:
+            if abs(timestamp - self._timestamps[slot]) <= PROVISIONAL_MATCH_WINDOW:
+                self._provisional_slots.remove(slot)
+                return slot
+        return None
+
+    def async_clear(self) -> None:
+        """Drop all events, used when the backend database is cleared."""
+        self._head = 0
+        self._size = 0
+        self._provisional_slots.clear()
+        self._visitor_ids.clear()
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _ordered(self) -> np.ndarray:
+        """Return the slot indices from oldest to newest."""
+        if self._size < self.capacity:
+            return np.arange(self._size)
+        return (np.arange(self.capacity) + self._head) % self.capacity
+
+    def get_counts(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Return visitor counts for today, this week and this month.
+
+        The hourly histogram counts the last 7 days by local hour of day.
+        """
+        now = dt_util.as_local(now or dt_util.now())
+        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        start_of_week = start_of_day - timedelta(days=start_of_day.weekday())
+        start_of_month = start_of_day.replace(day=1)
+
+        timestamps = self._timestamps[:self._size]
+        labels = self._labels[:self._size]
+        today = timestamps >= start_of_day.timestamp()
+
+        recent = timestamps >= (start_of_day - timedelta(days=6)).timestamp()
+        utc_offset = now.utcoffset().total_seconds() if now.utcoffset() else 0
+        hours = ((timestamps[recent] + utc_offset) // 3600 % 24).astype(np.int64)
+
+        return {
+            "today": int(np.count_nonzero(today)),
+            "week": int(np.count_nonzero(timestamps >= start_of_week.timestamp())),
+            "month": int(np.count_nonzero(timestamps >= start_of_month.timestamp())),
+            "known_today": int(np.count_nonzero(today & (labels == _LABEL_CODES[LABEL_KNOWN]))),
+            "hourly": np.bincount(hours, minlength=24).tolist(),
+            "date": start_of_day.date().isoformat(),
+            "source": "local",
+        }
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the events in storage format, oldest first."""
+        order = self._ordered()
+        return {
+            "timestamps": self._timestamps[order].tolist(),
+            "labels": self._labels[order].tolist(),
+            "visitor_ids": list(self._visitor_ids),
+        }
+
+    async def async_flush(self) -> None:
+        """Write the events to storage immediately."""
+        await self._store.async_save(self._data_to_save())
@@ -0,0 +1,127 @@
+"""Weather context for WhoRang AI Doorbell integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_state_added_domain,
+    async_track_state_change_event,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+WEATHER_DOMAIN = "weather"
+
+# Attribute -> context key sent to the backend
+WEATHER_ATTRIBUTES = {
+    "temperature": "weather_temp",
+    "humidity": "weather_humidity",
+    "wind_speed": "wind_speed",
+    "pressure": "pressure",
+}
+
+
+def _score_weather_state(state: State) -> tuple:
+    """Rank weather entities, available ones with the most attributes first."""
+    available = state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+    attributes = sum(1 for attribute in WEATHER_ATTRIBUTES if state.attributes.get(attribute) is not None)
+    # The default home location weather entity wins ties
+    home = state.entity_id in ("weather.home", "weather.forecast_home")
+    return (available, attributes, home)
+
+
+class WeatherContextProvider:
+    """Keep the weather context of one weather entity ready for doorbell events.
+
+    The entity is the configured one, or otherwise the best available
+    weather entity, picked once. The context dict is rebuilt only when that
+    entity's state changes, so reading it on the ring path is O(1).
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id: Optional[str] = None) -> None:
+        """Initialize the provider."""
+        self.hass = hass
+        self._configured_entity_id = entity_id
+        self.entity_id: Optional[str] = None
+        self._context: Dict[str, Any] = {}
+        self._state_unsub = None
+        self._added_unsub = None
+
+    @property
+    def context(self) -> Dict[str, Any]:
+        """Return the current weather context."""
+        return self._context
+
+    @callback
+    def async_start(self) -> None:
+        """Select the weather entity and start following it."""
+        self._async_select_entity()
+        # Weather integrations may finish loading after this one
+        self._added_unsub = async_track_state_added_domain(
+            self.hass, WEATHER_DOMAIN, self._async_weather_added
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following weather state."""
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
+        if self._added_unsub:
+            self._added_unsub()
+            self._added_unsub = None
+
+    @callback
+    def _async_select_entity(self) -> None:
+        """Pick the weather entity to follow."""
+        entity_id = self._configured_entity_id
+        if not entity_id:
+            states = self.hass.states.async_all(WEATHER_DOMAIN)
+            if states:
+                entity_id = max(states, key=_score_weather_state).entity_id
+
+        if entity_id == self.entity_id:
+            return
+
+        if self._state_unsub:
+            self._state_unsub()
+            self._state_unsub = None
+        self.entity_id = entity_id
+        if entity_id:
+            self._state_unsub = async_track_state_change_event(
+                self.hass, [entity_id], self._async_weather_changed
+            )
+            _LOGGER.debug("Using %s for weather context", entity_id)
+        self._update_context(self.hass.states.get(entity_id) if entity_id else None)
+
+    @callback
+    def _async_weather_added(self, event: Event) -> None:
+        """Reconsider the entity when a weather entity appears."""
+        # A configured entity is followed by its state listener once it appears
+        if self._configured_entity_id:
+            return
+        current = self.hass.states.get(self.entity_id) if self.entity_id else None
+        new_state = event.data.get("new_state")
+        if current is None or (
+            new_state and _score_weather_state(new_state) > _score_weather_state(current)
+        ):
+            self._async_select_entity()
+
+    @callback
+    def _async_weather_changed(self, event: Event) -> None:
+        """Rebuild the context from the new weather state."""
+        self._update_context(event.data.get("new_state"))
+
+    def _update_context(self, state: Optional[State]) -> None:
+        """Build the context dict sent with doorbell events."""
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self._context = {}
+            return
+
+        context = {"weather_condition": state.state}
+        for attribute, key in WEATHER_ATTRIBUTES.items():
+            context[key] = state.attributes.get(attribute)
+        self._context = context
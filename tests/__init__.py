@@ -0,0 +1 @@
+"""Tests for the WhoRang AI Doorbell integration."""
@@ -0,0 +1,150 @@
+"""Fixtures for the WhoRang AI Doorbell integration tests.
+
+The tests cover the pure Python parts of the integration. They import
+the modules without running the package __init__, which pulls in most
+of Home Assistant, and when Home Assistant itself is not installed the
+few names those modules import are provided by minimal stand-ins.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+INTEGRATION_PATH = Path(__file__).parent.parent / "custom_components" / "whorang"
+
+
+def _install_homeassistant_stand_ins() -> None:
+    """Register stand-ins for the Home Assistant names the tested modules use."""
+
+    def module(name: str, **attributes: Any) -> types.ModuleType:
+        mod = types.ModuleType(name)
+        mod.__dict__.update(attributes)
+        sys.modules[name] = mod
+        return mod
+
+    class HomeAssistant:
+        """Stand-in for the type annotations."""
+
+    class State:
+        """Minimal state object."""
+
+        def __init__(self, entity_id: str, state: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+            self.entity_id = entity_id
+            self.state = state
+            self.attributes = attributes or {}
+
+    class Store:
+        """In-memory storage helper."""
+
+        def __init__(self, hass: Any, version: int, key: str) -> None:
+            self.key = key
+            self.data = hass.storage.get(key) if hasattr(hass, "storage") else None
+
+        async def async_load(self) -> Any:
+            return self.data
+
+        def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+            self.data = data_func()
+
+        async def async_save(self, data: Any) -> None:
+            self.data = data
+
+    def unavailable(*args: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError("Not available without Home Assistant")
+
+    module("homeassistant")
+    module(
+        "homeassistant.core",
+        CALLBACK_TYPE=Callable[[], None],
+        HomeAssistant=HomeAssistant,
+        State=State,
+        Event=object,
+        ServiceCall=object,
+        callback=lambda func: func,
+    )
+    module("homeassistant.const", STATE_ON="on", STATE_OFF="off")
+
+    class HomeAssistantError(Exception):
+        """Stand-in for the base Home Assistant error."""
+
+    module("homeassistant.exceptions", HomeAssistantError=HomeAssistantError)
+    class NoURLAvailableError(Exception):
+        """Stand-in for the network helper error."""
+
+    def get_url(hass: Any, **kwargs: Any) -> str:
+        raise NoURLAvailableError
+
+    module("homeassistant.components")
+    module("homeassistant.components.camera", async_get_image=unavailable)
+    module("homeassistant.components.http", HomeAssistantView=object)
+    module("homeassistant.helpers")
+    module("homeassistant.helpers.network", NoURLAvailableError=NoURLAvailableError, get_url=get_url)
+    module("homeassistant.helpers.storage", Store=Store)
+    module(
+        "homeassistant.helpers.event",
+        async_track_state_change_event=unavailable,
+        async_track_time_interval=unavailable,
+    )
+    module(
+        "homeassistant.helpers.entity_registry",
+        EVENT_ENTITY_REGISTRY_UPDATED="entity_registry_updated",
+        async_get=unavailable,
+    )
+    module("homeassistant.util", dt=types.SimpleNamespace())
+
+
+try:
+    import homeassistant.core  # noqa: F401
+except ImportError:
+    _install_homeassistant_stand_ins()
+
+# The integration package without its __init__
+if "custom_components.whorang" not in sys.modules:
+    for name, path in (
+        ("custom_components", INTEGRATION_PATH.parent),
+        ("custom_components.whorang", INTEGRATION_PATH),
+    ):
+        package = types.ModuleType(name)
+        package.__path__ = [str(path)]
+        sys.modules[name] = package
+
+
+class FakeHass:
+    """Just enough of a Home Assistant instance for the tested modules."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.data: Dict[str, Any] = {}
+        self.storage: Dict[str, Any] = {}
+        self.executor_jobs = 0
+        self.background_tasks: List[asyncio.Task] = []
+
+    async def async_add_executor_job(self, target: Callable, *args: Any) -> Any:
+        self.executor_jobs += 1
+        return await self.loop.run_in_executor(None, target, *args)
+
+    def async_create_task(self, target: Any, name: Optional[str] = None) -> asyncio.Task:
+        return self.loop.create_task(target)
+
+    def async_create_background_task(self, target: Any, name: str) -> asyncio.Task:
+        task = self.loop.create_task(target)
+        self.background_tasks.append(task)
+        return task
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine function with a fake hass on a fresh event loop."""
+
+    def runner(test: Callable[[FakeHass], Any]) -> Any:
+        async def main() -> Any:
+            return await test(FakeHass(asyncio.get_running_loop()))
+
+        return asyncio.run(main())
+
+    return runner
@@ -0,0 +1,99 @@
+"""Event loop blocking test for snapshot capture."""
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiohttp")
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from homeassistant.core import State  # noqa: E402
+
+from custom_components.whorang.camera_manager import CameraManager  # noqa: E402
+from custom_components.whorang.image_processing import optimize_snapshot  # noqa: E402
+from custom_components.whorang.snapshot_store import SnapshotStore  # noqa: E402
+from custom_components.whorang.snapshot_view import SnapshotBuffer  # noqa: E402
+
+CAMERA = "camera.front_door"
+CAPTURES = 5
+LAG_SAMPLE_INTERVAL = 0.001
+# A 4K frame takes well over this to decode and re-encode, so processing
+# it on the event loop fails the test while executor work stays far below
+MAX_LOOP_LAG_MS = 50.0
+
+
+def _large_frame() -> bytes:
+    """Return a 4K JPEG with enough detail to be expensive to process."""
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, 3840, dtype=np.float32)
+    pixels = np.broadcast_to(gradient[None, :, None], (2160, 3840, 3)).copy()
+    pixels += rng.normal(0, 24, pixels.shape).astype(np.float32)
+    output = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(output, "JPEG", quality=95)
+    return output.getvalue()
+
+
+async def _sample_loop_lag(samples: list, stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up a short sleep, in milliseconds."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append((time.perf_counter() - started - LAG_SAMPLE_INTERVAL) * 1000)
+
+
+def test_capture_does_not_block_event_loop(run, tmp_path):
+    """Processing, hashing and writing a large frame all stay off the event loop."""
+    frame = _large_frame()
+
+    async def test(hass):
+        hass.states = SimpleNamespace(get=lambda entity_id: State(entity_id, "idle"))
+        hass.config = SimpleNamespace(external_url=None, internal_url=None)
+        coordinator = SimpleNamespace(traces=SimpleNamespace(get=lambda correlation_id: None))
+
+        manager = CameraManager(hass, coordinator)
+        manager._buffer = SnapshotBuffer(max_bytes=64 * 1024 * 1024)
+        manager._store = SnapshotStore(hass, tmp_path, max_bytes=1 << 30, max_age_seconds=3600)
+        await manager._store.async_load()
+
+        async def get_camera_image(camera_entity):
+            return frame
+
+        manager._get_camera_image = get_camera_image
+
+        # Warm up the executor and the imaging libraries outside the measurement
+        await hass.async_add_executor_job(optimize_snapshot, frame, 1920, 90, 5 * 1024 * 1024)
+
+        per_capture = []
+        for _ in range(CAPTURES):
+            samples: list = []
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(_sample_loop_lag(samples, stop))
+            await asyncio.sleep(0)
+
+            snapshot = await manager.async_capture_snapshot(CAMERA, {"snapshot_delay": 0})
+            await asyncio.gather(*hass.background_tasks)
+            hass.background_tasks.clear()
+
+            stop.set()
+            await sampler
+            assert snapshot is not None
+            per_capture.append(max(samples))
+
+        started = time.perf_counter()
+        optimize_snapshot(frame, 1920, 90, 5 * 1024 * 1024)
+        inline_ms = (time.perf_counter() - started) * 1000
+
+        print(
+            f"\n{len(frame)} byte frame, max loop lag per capture: "
+            + ", ".join(f"{lag:.1f}" for lag in per_capture)
+            + f" ms (processing it on the loop would block for {inline_ms:.0f} ms)"
+        )
+        assert manager.get_statistics()["snapshots_taken"] == CAPTURES
+        assert max(per_capture) < MAX_LOOP_LAG_MS
+
+    run(test)
@@ -0,0 +1,226 @@
+"""Tests and a large registry benchmark for the doorbell detector."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from homeassistant.core import State
+
+from custom_components.whorang import doorbell_detector
+from custom_components.whorang.doorbell_detector import (
+    PAIRING_MIN_SCORE,
+    DoorbellDetector,
+    _pairing_tokens,
+    _score_tokens,
+    _TokenIndex,
+)
+from custom_components.whorang.tracing import DoorbellTraceBuffer
+
+
+def test_index_candidates_share_a_token():
+    """Only entities sharing a token are candidates."""
+    index = _TokenIndex()
+    index.add("camera.front_door")
+    index.add("camera.garage")
+
+    assert index.candidates(_pairing_tokens("binary_sensor.front_doorbell")) == {"camera.front_door"}
+    assert index.candidates(_pairing_tokens("binary_sensor.back_yard")) == set()
+
+
+def test_index_discard_drops_postings():
+    """A discarded entity is no longer a candidate."""
+    index = _TokenIndex()
+    tokens = index.add("camera.front_door")
+    index.discard("camera.front_door")
+
+    assert index.candidates(tokens) == set()
+    assert index.tokens("camera.front_door") == frozenset()
+    assert not index._postings
+
+
+def test_score_counts_shared_tokens():
+    """Shared words, brands and locations add their weights."""
+    doorbell = _pairing_tokens("binary_sensor.reolink_front_doorbell")
+    camera = _pairing_tokens("camera.reolink_front")
+    unrelated = _pairing_tokens("camera.garage")
+
+    assert _score_tokens(doorbell, camera) > PAIRING_MIN_SCORE
+    assert _score_tokens(doorbell, unrelated) == 0
+
+
+def _detector(hass, doorbells, cameras) -> DoorbellDetector:
+    """Return a detector with indexed doorbells and cameras."""
+    detector = DoorbellDetector(hass, coordinator=None)
+    for camera_id in cameras:
+        detector._detected_cameras[camera_id] = {"entity_id": camera_id}
+        detector._camera_index.add(camera_id)
+    for doorbell_id in doorbells:
+        detector._detected_doorbells[doorbell_id] = {"entity_id": doorbell_id}
+        detector._doorbell_index.add(doorbell_id)
+    return detector
+
+
+def test_doorbell_paired_with_best_camera(run):
+    """A doorbell pairs with the highest scoring camera sharing its tokens."""
+
+    async def test(hass):
+        detector = _detector(
+            hass,
+            ["binary_sensor.reolink_front_doorbell"],
+            ["camera.front_yard", "camera.reolink_front_doorbell", "camera.garage"],
+        )
+        detector._pair_doorbell("binary_sensor.reolink_front_doorbell")
+
+        pair = detector._doorbell_camera_pairs["binary_sensor.reolink_front_doorbell"]
+        assert pair["camera_entity"] == "camera.reolink_front_doorbell"
+
+    run(test)
+
+
+def test_removed_camera_repairs_doorbell(run):
+    """A doorbell that loses its camera pairs with the next best one."""
+
+    async def test(hass):
+        detector = _detector(
+            hass,
+            ["binary_sensor.reolink_front_doorbell"],
+            ["camera.reolink_front_doorbell", "camera.reolink_front"],
+        )
+        detector._pair_doorbell("binary_sensor.reolink_front_doorbell")
+
+        del detector._detected_cameras["camera.reolink_front_doorbell"]
+        detector._update_pairs_for_entity("camera.reolink_front_doorbell")
+
+        pair = detector._doorbell_camera_pairs["binary_sensor.reolink_front_doorbell"]
+        assert pair["camera_entity"] == "camera.reolink_front"
+
+    run(test)
+
+
+def test_no_pair_below_minimum_score(run):
+    """Cameras sharing too little with the doorbell are not paired."""
+
+    async def test(hass):
+        detector = _detector(hass, ["binary_sensor.doorbell"], ["camera.garage"])
+        detector._pair_doorbell("binary_sensor.doorbell")
+
+        assert "binary_sensor.doorbell" not in detector._doorbell_camera_pairs
+
+    run(test)
+
+
+def test_overflowed_trigger_closes_its_trace(run):
+    """A trigger dropped from the full queue does not leave its trace behind."""
+
+    async def test(hass):
+        detector = DoorbellDetector(hass, coordinator=SimpleNamespace(traces=DoorbellTraceBuffer()))
+        detector._trigger_queue.max_size = 1
+        motion = "binary_sensor.porch_motion"
+        detector._trigger_queue.async_submit(motion, State(motion, "on"), 75)
+        trace = detector.coordinator.traces.start("doorbell", motion)
+        detector._trigger_traces[motion] = (trace, time.monotonic())
+
+        detector._trigger_queue.async_submit("binary_sensor.doorbell", State("binary_sensor.doorbell", "on"), 100)
+
+        assert motion not in detector._trigger_traces
+        assert "dropped" in trace.milestones
+        assert "queue_wait" in trace.stages
+
+    run(test)
+
+
+REGISTRY_SIZE = 10_000
+HOUSES = 200
+REGISTRY_UPDATES = 1_000
+# Generous so slow CI hosts pass, both run in a fraction of this
+MAX_DISCOVERY_MS = 1000.0
+MAX_UPDATE_MS = 2.0
+
+
+def _registry_entry(entity_id: str) -> SimpleNamespace:
+    """Return an enabled entity registry entry."""
+    return SimpleNamespace(
+        entity_id=entity_id, disabled=False, name=None, device_class=None, original_device_class=None
+    )
+
+
+def _large_registry() -> SimpleNamespace:
+    """Return a registry of mostly unrelated entities with doorbells and cameras per house."""
+    entity_ids = []
+    for house in range(HOUSES):
+        entity_ids.append(f"binary_sensor.reolink_house{house}_doorbell")
+        entity_ids.append(f"camera.reolink_house{house}_doorbell")
+    domains = ("sensor", "light", "switch", "binary_sensor", "camera", "automation")
+    filler = 0
+    while len(entity_ids) < REGISTRY_SIZE:
+        domain = domains[filler % len(domains)]
+        entity_ids.append(f"{domain}.room{filler // len(domains)}_{domain}_{filler}")
+        filler += 1
+    return SimpleNamespace(
+        entities={entity_id: _registry_entry(entity_id) for entity_id in entity_ids},
+        async_get=lambda entity_id: _registry_entry(entity_id),
+    )
+
+
+def test_large_registry_discovery_and_updates(run, monkeypatch):
+    """Discovery over 10k entities and registry updates stay fast and pair correctly."""
+    registry = _large_registry()
+    monkeypatch.setattr(doorbell_detector, "async_get_entity_registry", lambda hass: registry)
+    monkeypatch.setattr(
+        doorbell_detector, "async_track_state_change_event", lambda hass, entity_ids, action: lambda: None
+    )
+
+    async def test(hass):
+        hass.states = SimpleNamespace(get=lambda entity_id: State(entity_id, "off"))
+        detector = DoorbellDetector(hass, coordinator=None)
+
+        started = time.perf_counter()
+        await detector._discover_entities()
+        discovery_ms = (time.perf_counter() - started) * 1000
+
+        pairs = detector._doorbell_camera_pairs
+        assert len(detector._detected_doorbells) == HOUSES
+        assert len(detector._detected_cameras) == HOUSES
+        assert all(
+            pair["camera_entity"] == doorbell_id.replace("binary_sensor.", "camera.")
+            for doorbell_id, pair in pairs.items()
+        )
+        assert len(pairs) == HOUSES
+
+        # Renames of unrelated entities, then of every camera and its doorbell
+        events = [
+            SimpleNamespace(data={
+                "action": "update",
+                "entity_id": f"sensor.renamed_{index}",
+                "old_entity_id": f"sensor.room{index}_sensor_{index * 6}",
+            })
+            for index in range(REGISTRY_UPDATES - 2 * HOUSES)
+        ]
+        for house in range(HOUSES):
+            for domain in ("camera", "binary_sensor"):
+                events.append(SimpleNamespace(data={
+                    "action": "update",
+                    "entity_id": f"{domain}.reolink_house{house}_doorbell_v2",
+                    "old_entity_id": f"{domain}.reolink_house{house}_doorbell",
+                }))
+        started = time.perf_counter()
+        for event in events:
+            detector._async_handle_registry_updated(event)
+        update_ms = (time.perf_counter() - started) * 1000 / len(events)
+
+        pairs = detector._doorbell_camera_pairs
+        assert len(detector._detected_cameras) == HOUSES
+        assert len(pairs) == HOUSES
+        assert all(
+            doorbell_id.endswith("_v2")
+            and pair["camera_entity"] == doorbell_id.replace("binary_sensor.", "camera.")
+            for doorbell_id, pair in pairs.items()
+        )
+        print(
+            f"\nDiscovery over {REGISTRY_SIZE} entities: {discovery_ms:.1f} ms, "
+            f"registry update: {update_ms:.3f} ms each"
+        )
+        assert discovery_ms < MAX_DISCOVERY_MS
+        assert update_ms < MAX_UPDATE_MS
+
+    run(test)
@@ -0,0 +1,135 @@
+"""Tests for the backend hub shared by config entries."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("websockets")
+
+from custom_components.whorang.const import DATA_BACKEND_HUBS  # noqa: E402
+from custom_components.whorang.hub import async_get_backend_hub  # noqa: E402
+
+
+class FakeClient:
+    """API client with the attributes the hub reads."""
+
+    def __init__(self, ollama_config=None) -> None:
+        self.base_url = "http://whorang:3001"
+        self.api_key = None
+        self.use_ssl = False
+        self.host = "whorang"
+        self.port = 3001
+        self.ollama_config = ollama_config or {"enabled": False}
+        self.request_metrics = None
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeCoordinator:
+    """Coordinator receiving data fetched for others."""
+
+    def __init__(self) -> None:
+        self.handed = []
+
+    async def async_handle_backend_data(self, backend_data) -> None:
+        self.handed.append(backend_data)
+
+
+def _hub_with_fetch(hass, results):
+    """Return a hub whose backend fetch waits for a gate and counts calls."""
+    hub = async_get_backend_hub(hass, FakeClient())
+    gate = asyncio.Event()
+
+    async def fetch():
+        await gate.wait()
+        results.append(len(results) + 1)
+        return {"fetch": len(results)}
+
+    hub._async_fetch_backend_data = fetch
+    return hub, gate
+
+
+def test_concurrent_refreshes_share_one_fetch(run):
+    """Coordinators refreshing at once make a single backend fetch."""
+
+    async def test(hass):
+        fetches = []
+        hub, gate = _hub_with_fetch(hass, fetches)
+        first, second = FakeCoordinator(), FakeCoordinator()
+        hub.async_add_coordinator(first)
+        hub.async_add_coordinator(second)
+
+        pending = [
+            asyncio.ensure_future(hub.async_fetch_data(first)),
+            asyncio.ensure_future(hub.async_fetch_data(second)),
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert await asyncio.gather(*pending) == [{"fetch": 1}, {"fetch": 1}]
+        assert fetches == [1]
+        assert not first.handed and not second.handed
+        assert hub.get_statistics()["shared_fetches"] == 1
+
+    run(test)
+
+
+def test_fetch_handed_to_other_coordinators(run):
+    """Data fetched for one coordinator is handed to the others."""
+
+    async def test(hass):
+        fetches = []
+        hub, gate = _hub_with_fetch(hass, fetches)
+        first, second = FakeCoordinator(), FakeCoordinator()
+        hub.async_add_coordinator(first)
+        hub.async_add_coordinator(second)
+        gate.set()
+
+        assert await hub.async_fetch_data(first) == {"fetch": 1}
+        await asyncio.sleep(0)
+
+        assert second.handed == [{"fetch": 1}]
+        assert not first.handed
+
+    run(test)
+
+
+def test_later_entry_client_merged_and_closed(run):
+    """A later entry on the same backend reuses the hub and its client."""
+
+    async def test(hass):
+        first_client = FakeClient()
+        hub = async_get_backend_hub(hass, first_client)
+        second_client = FakeClient({"enabled": True, "host": "ollama", "port": 11434})
+
+        assert async_get_backend_hub(hass, second_client) is hub
+        await asyncio.sleep(0)
+
+        assert hub.api_client is first_client
+        assert second_client.closed
+        assert first_client.ollama_config["enabled"]
+
+    run(test)
+
+
+def test_last_coordinator_closes_connection(run):
+    """The hub closes its client when the last coordinator leaves."""
+
+    async def test(hass):
+        client = FakeClient()
+        hub = async_get_backend_hub(hass, client)
+        first, second = FakeCoordinator(), FakeCoordinator()
+        hub.async_add_coordinator(first)
+        hub.async_add_coordinator(second)
+
+        await hub.async_remove_coordinator(first)
+        assert not client.closed
+        await hub.async_remove_coordinator(second)
+        assert client.closed
+        assert not hass.data[DATA_BACKEND_HUBS]
+
+    run(test)
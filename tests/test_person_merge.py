@@ -0,0 +1,130 @@
+"""Tests and a timing measurement for merging persons."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from custom_components.whorang.person_merge import async_merge_persons
+
+SOURCE_ID = 2
+TARGET_ID = 1
+BATCH_SIZE = 50
+MAX_CONCURRENCY = 4
+# Simulated round trip of one backend request
+REQUEST_LATENCY = 0.005
+
+
+class RouteMissing(Exception):
+    """Raised by the fake backend when it has no merge route."""
+
+
+class FakeBackend:
+    """Backend holding the faces of the source person, each request taking a round trip."""
+
+    def __init__(self, face_count: int, server_merge: bool) -> None:
+        self.faces: Dict[int, int] = {face_id: SOURCE_ID for face_id in range(1, face_count + 1)}
+        self.server_merge = server_merge
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.deleted: List[int] = []
+
+    async def _round_trip(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(REQUEST_LATENCY)
+        self.in_flight -= 1
+
+    async def request(self, method: str, endpoint: str, data: Any = None) -> Dict[str, Any]:
+        await self._round_trip()
+        if not self.server_merge:
+            raise RouteMissing(endpoint)
+        moved = [face_id for face_id, person_id in self.faces.items() if person_id == data["source_person_id"]]
+        for face_id in moved:
+            self.faces[face_id] = TARGET_ID
+        return {"success": True, "faces_moved": len(moved)}
+
+    async def get_person_faces(self, person_id: int) -> List[Dict[str, Any]]:
+        await self._round_trip()
+        return [{"id": face_id} for face_id, owner in self.faces.items() if owner == person_id]
+
+    async def bulk_assign_faces(self, face_ids: List[int], person_id: int) -> Dict[str, Any]:
+        await self._round_trip()
+        for face_id in face_ids:
+            self.faces[face_id] = person_id
+        return {"assignedCount": len(face_ids)}
+
+    async def delete_person(self, person_id: int) -> None:
+        await self._round_trip()
+        self.deleted.append(person_id)
+
+
+async def _merge(backend: FakeBackend, completed_face_ids=None, progress_callback=None) -> Dict[str, Any]:
+    return await async_merge_persons(
+        backend, backend.request, RouteMissing, SOURCE_ID, TARGET_ID,
+        BATCH_SIZE, MAX_CONCURRENCY, completed_face_ids, progress_callback,
+    )
+
+
+@pytest.mark.parametrize("face_count", [10, 100, 1000])
+def test_merge_timing(run, face_count):
+    """Both merge paths take a handful of round trips however many faces move."""
+
+    async def test(hass):
+        timings = {}
+        for server_merge in (True, False):
+            backend = FakeBackend(face_count, server_merge)
+            started = time.perf_counter()
+            result = await _merge(backend)
+            timings[server_merge] = (time.perf_counter() - started) * 1000
+
+            assert result["success"]
+            assert result["faces_moved"] == face_count
+            assert set(backend.faces.values()) == {TARGET_ID}
+            if server_merge:
+                assert backend.requests == 1
+            else:
+                batches = math.ceil(face_count / BATCH_SIZE)
+                # The failed merge, listing the faces, the batches and deleting the source
+                assert backend.requests == batches + 3
+                assert backend.max_in_flight <= MAX_CONCURRENCY
+                assert backend.deleted == [SOURCE_ID]
+
+        batch_rounds = math.ceil(math.ceil(face_count / BATCH_SIZE) / MAX_CONCURRENCY)
+        print(
+            f"\nMerging {face_count} faces: server {timings[True]:.1f} ms, "
+            f"bulk assign {timings[False]:.1f} ms ({batch_rounds} rounds of batches), "
+            f"one request per face would take {face_count * REQUEST_LATENCY * 1000:.0f} ms"
+        )
+        # Concurrent batches cost round trips per round, not per face or per batch
+        assert timings[False] < (batch_rounds + 3) * REQUEST_LATENCY * 1000 * 4
+
+    run(test)
+
+
+def test_bulk_merge_resumes_from_checkpoint(run):
+    """Faces recorded as moved by an interrupted merge are not sent again."""
+
+    async def test(hass):
+        backend = FakeBackend(120, server_merge=False)
+        done = list(range(1, 101))
+        for face_id in done:
+            backend.faces[face_id] = TARGET_ID
+        progress = []
+
+        result = await _merge(
+            backend, completed_face_ids=done,
+            progress_callback=lambda completed, total: progress.append((len(completed), total)),
+        )
+
+        assert result["success"]
+        assert result["faces_moved"] == 120
+        assert progress == [(120, 120)]
+        assert backend.requests == 4
+
+    run(test)
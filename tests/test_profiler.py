@@ -0,0 +1,26 @@
+"""Tests for the on-demand profiler."""
+from __future__ import annotations
+
+import cProfile
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.whorang.const import DATA_PROFILE_SESSION
+from custom_components.whorang.profiler import async_profile
+
+
+def test_profile_fails_while_another_profiler_runs(run):
+    """A running profiler fails the call before any hook is installed."""
+
+    async def test(hass):
+        other = cProfile.Profile()
+        other.enable()
+        try:
+            with pytest.raises(HomeAssistantError):
+                await async_profile(hass, 1, 20, "cumulative")
+        finally:
+            other.disable()
+        assert DATA_PROFILE_SESSION not in hass.data
+
+    run(test)
@@ -0,0 +1,176 @@
+"""Tests for the content-addressed snapshot store."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from custom_components.whorang.const import DATA_SNAPSHOT_STORE
+from custom_components.whorang.snapshot_store import (
+    SnapshotStore,
+    async_acquire_snapshot_store,
+    async_release_snapshot_store,
+)
+
+
+def _frame(marker: bytes, size: int = 10) -> bytes:
+    """Return distinct image bytes of a given size."""
+    return marker * size
+
+
+def test_duplicate_frame_shares_one_file(run, tmp_path):
+    """Storing a frame twice writes it once."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await store.async_load()
+
+        first = await store.async_put(_frame(b"a"))
+        second = await store.async_put(_frame(b"a"))
+
+        assert first == (first[0], False)
+        assert second == (first[0], True)
+        assert [path.name for path in tmp_path.glob("*.jpg")] == [first[0]]
+        stats = store.get_statistics()
+        assert stats["stored_snapshots"] == 1
+        assert stats["stored_bytes"] == 10
+        assert stats["duplicate_frames"] == 1
+
+    run(test)
+
+
+def test_concurrent_puts_of_a_frame_write_once(run, tmp_path):
+    """Puts racing on the same frame wait for the first write."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await store.async_load()
+
+        results = await asyncio.gather(*(store.async_put(_frame(b"a"), "digest") for _ in range(5)))
+
+        assert [duplicate for _, duplicate in results].count(False) == 1
+        assert store.get_statistics()["stored_bytes"] == 10
+        assert store.get_statistics()["duplicate_frames"] == 4
+
+    run(test)
+
+
+def test_least_recently_used_evicted_over_quota(run, tmp_path):
+    """Going over quota evicts the least recently stored or refreshed frame."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=25, max_age_seconds=3600)
+        await store.async_load()
+
+        first, _ = await store.async_put(_frame(b"a"))
+        second, _ = await store.async_put(_frame(b"b"))
+        # Refreshing the first frame makes the second the oldest
+        await store.async_put(_frame(b"a"))
+        third, _ = await store.async_put(_frame(b"c"))
+
+        assert store.contains(first)
+        assert not store.contains(second)
+        assert store.contains(third)
+        assert not store.path_for(second).exists()
+        assert store.get_statistics()["stored_bytes"] == 20
+        assert store.get_statistics()["evicted_snapshots"] == 1
+
+    run(test)
+
+
+def test_expired_frames_evicted(run, tmp_path):
+    """Frames older than the age limit are evicted."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await store.async_load()
+        filename, _ = await store.async_put(_frame(b"a"))
+
+        store.max_age_seconds = -1
+        assert await store.async_evict() == 1
+        assert not store.contains(filename)
+        assert not list(tmp_path.glob("*.jpg"))
+
+    run(test)
+
+
+def test_index_restored_without_rescan(run, tmp_path):
+    """A saved index is loaded instead of scanning the directory."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await store.async_load()
+        filename, _ = await store.async_put(_frame(b"a"))
+        await store.async_flush()
+        hass.storage[store._store.key] = store._store.data
+
+        restored = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await restored.async_load()
+
+        assert restored.contains(filename)
+        assert restored.get_statistics()["stored_bytes"] == 10
+
+    run(test)
+
+
+def test_entries_share_one_store(run, tmp_path):
+    """All entries use one store, flushed when the last releases it."""
+
+    async def test(hass):
+        first = await async_acquire_snapshot_store(hass, tmp_path, "first", 1000, 3600)
+        second = await async_acquire_snapshot_store(hass, tmp_path, "second", 2000, 3600)
+
+        assert first is second
+        assert first.max_bytes == 2000
+
+        await async_release_snapshot_store(hass, first, "first")
+        assert hass.data[DATA_SNAPSHOT_STORE] is first
+        await async_release_snapshot_store(hass, second, "second")
+        assert DATA_SNAPSHOT_STORE not in hass.data
+        assert first._store.data == {"entries": []}
+
+    run(test)
+
+
+def test_most_permissive_limits_apply(run, tmp_path):
+    """An entry lowering its limits does not shrink those of the others."""
+
+    async def test(hass):
+        store = await async_acquire_snapshot_store(hass, tmp_path, "first", 2000, 7200)
+        await async_acquire_snapshot_store(hass, tmp_path, "second", 1000, 3600)
+        assert (store.max_bytes, store.max_age_seconds) == (2000, 7200)
+
+        store.set_limits("first", 500, 60)
+        assert (store.max_bytes, store.max_age_seconds) == (1000, 3600)
+
+        await async_release_snapshot_store(hass, store, "second")
+        assert (store.max_bytes, store.max_age_seconds) == (500, 60)
+
+    run(test)
+
+
+def test_put_during_eviction_keeps_new_file(run, tmp_path):
+    """A frame stored again while its eviction is deleting it survives."""
+
+    async def test(hass):
+        store = SnapshotStore(hass, tmp_path, max_bytes=1000, max_age_seconds=3600)
+        await store.async_load()
+        filename, _ = await store.async_put(_frame(b"a"))
+
+        delete_files = store._delete_files
+
+        def slow_delete(filenames):
+            time.sleep(0.05)
+            delete_files(filenames)
+
+        store._delete_files = slow_delete
+        store.max_age_seconds = -1
+        eviction = asyncio.ensure_future(store.async_evict())
+        await asyncio.sleep(0.01)
+        store.max_age_seconds = 3600
+
+        assert await store.async_put(_frame(b"a")) == (filename, False)
+        assert await eviction == 1
+        assert store.contains(filename)
+        assert (tmp_path / filename).exists()
+
+    run(test)
@@ -0,0 +1,89 @@
+"""Tests and a concurrent fetch benchmark for the in-memory snapshot view."""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from http import HTTPStatus
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from custom_components.whorang.snapshot_view import (  # noqa: E402
+    SnapshotBuffer,
+    WhoRangSnapshotView,
+)
+
+CONCURRENT_FETCHES = 200
+FRAME_SIZE = 250_000
+# Generous so slow CI hosts pass, serving from memory is far below it
+MAX_AVG_FETCH_MS = 5.0
+
+
+def _signed_request(buffer: SnapshotBuffer, snapshot_id: str) -> SimpleNamespace:
+    """Return a request carrying the signed query of a snapshot."""
+    query = dict(parse_qsl(urlsplit(buffer.sign_path(snapshot_id)).query))
+    return SimpleNamespace(query=query)
+
+
+def test_concurrent_fetches_served_from_memory(run):
+    """Many backends fetching one snapshot at once are all served from memory."""
+
+    async def test(hass):
+        buffer = SnapshotBuffer()
+        frame = os.urandom(FRAME_SIZE)
+        buffer.put("snapshot", frame)
+        view = WhoRangSnapshotView(buffer)
+        request = _signed_request(buffer, "snapshot")
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(view.get(request, "snapshot") for _ in range(CONCURRENT_FETCHES))
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert all(response.status == HTTPStatus.OK for response in responses)
+        assert all(response.body == frame for response in responses)
+        assert buffer.get_statistics()["served"] == CONCURRENT_FETCHES
+        print(
+            f"\n{CONCURRENT_FETCHES} concurrent fetches of {FRAME_SIZE} bytes: "
+            f"{elapsed_ms:.1f} ms, {elapsed_ms / CONCURRENT_FETCHES:.3f} ms per fetch"
+        )
+        assert elapsed_ms / CONCURRENT_FETCHES < MAX_AVG_FETCH_MS
+
+    run(test)
+
+
+def test_invalid_token_rejected(run):
+    """Requests without a valid signature get nothing."""
+
+    async def test(hass):
+        buffer = SnapshotBuffer()
+        buffer.put("snapshot", b"frame")
+        view = WhoRangSnapshotView(buffer)
+        request = _signed_request(buffer, "snapshot")
+        request.query["token"] = "0" * 64
+
+        response = await view.get(request, "snapshot")
+        assert response.status == HTTPStatus.UNAUTHORIZED
+
+    run(test)
+
+
+def test_dropped_snapshot_not_found(run):
+    """A snapshot pushed out of the buffer is a miss."""
+
+    async def test(hass):
+        buffer = SnapshotBuffer(max_items=1)
+        buffer.put("old", b"old frame")
+        request = _signed_request(buffer, "old")
+        buffer.put("new", b"new frame")
+
+        response = await WhoRangSnapshotView(buffer).get(request, "old")
+        assert response.status == HTTPStatus.NOT_FOUND
+        assert buffer.get_statistics()["misses"] == 1
+
+    run(test)
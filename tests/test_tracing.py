@@ -0,0 +1,37 @@
+"""Tests for doorbell latency tracing."""
+from __future__ import annotations
+
+from custom_components.whorang.tracing import DoorbellTraceBuffer
+
+
+def test_backend_messages_find_trace_by_either_visitor_id():
+    """Messages using the event UUID or the row id find the trace."""
+    traces = DoorbellTraceBuffer()
+    trace = traces.start("doorbell", "binary_sensor.doorbell")
+    traces.link_visitor(trace, "0b7e-uuid", 42)
+
+    assert traces.find({"visitor_id": 42}) is trace
+    assert traces.find({"visitor_id": "0b7e-uuid"}) is trace
+    assert trace.as_dict()["visitor_id"] == "0b7e-uuid"
+
+
+def test_backend_messages_find_trace_by_correlation_id():
+    """Messages sent before the trace is linked find it by correlation id."""
+    traces = DoorbellTraceBuffer()
+    trace = traces.start("doorbell")
+
+    found = traces.find({"visitor_id": 7, "correlation_id": trace.correlation_id})
+    assert found is trace
+    found.mark("ai_complete")
+    assert trace.end_to_end_ms == trace.milestones["ai_complete"]
+
+
+def test_dropped_trace_unlinks_its_visitor_ids():
+    """Traces dropped from a full buffer are no longer found."""
+    traces = DoorbellTraceBuffer(max_traces=1)
+    first = traces.start("doorbell")
+    traces.link_visitor(first, "uuid", 1)
+    traces.start("doorbell")
+
+    assert traces.find({"visitor_id": 1}) is None
+    assert traces.find({"visitor_id": "uuid"}) is None
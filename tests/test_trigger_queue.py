@@ -0,0 +1,119 @@
+"""Tests for the doorbell trigger queue."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.core import State
+
+from custom_components.whorang.trigger_queue import (
+    RESULT_COALESCED,
+    RESULT_OVERFLOW,
+    RESULT_QUEUED,
+    DoorbellTriggerQueue,
+)
+
+PRESS = 100
+MOTION = 75
+
+
+def _state(entity_id: str, state: str = "on") -> State:
+    """Return a trigger state."""
+    return State(entity_id, state)
+
+
+def test_waiting_trigger_coalesced_with_latest_state(run):
+    """A second trigger for a waiting doorbell replaces its state."""
+
+    async def test(hass):
+        processed = []
+
+        async def handler(entity_id, state):
+            processed.append((entity_id, state.state))
+
+        queue = DoorbellTriggerQueue(hass, handler)
+        assert queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell", "on"), PRESS) == RESULT_QUEUED
+        assert queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell", "pressed"), PRESS) == RESULT_COALESCED
+
+        queue.async_start()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        await queue.async_stop()
+
+        assert processed == [("binary_sensor.doorbell", "pressed")]
+        stats = queue.get_statistics()
+        assert stats["triggers_queued"] == 1
+        assert stats["triggers_coalesced"] == 1
+        assert stats["triggers_processed"] == 1
+
+    run(test)
+
+
+def test_trigger_while_running_coalesced(run):
+    """A trigger for a doorbell whose pipeline runs is dropped."""
+
+    async def test(hass):
+        release = asyncio.Event()
+        processed = []
+
+        async def handler(entity_id, state):
+            processed.append(entity_id)
+            await release.wait()
+
+        queue = DoorbellTriggerQueue(hass, handler, workers=1)
+        queue.async_start()
+        queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell"), PRESS)
+        await asyncio.sleep(0)
+
+        assert queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell"), PRESS) == RESULT_COALESCED
+        release.set()
+        await asyncio.sleep(0)
+        await queue.async_stop()
+
+        assert processed == ["binary_sensor.doorbell"]
+        assert queue.get_statistics()["triggers_coalesced"] == 1
+
+    run(test)
+
+
+def test_higher_priority_processed_first(run):
+    """Doorbell presses are processed before motion triggers."""
+
+    async def test(hass):
+        processed = []
+
+        async def handler(entity_id, state):
+            processed.append(entity_id)
+
+        queue = DoorbellTriggerQueue(hass, handler, workers=1)
+        queue.async_submit("binary_sensor.porch_motion", _state("binary_sensor.porch_motion"), MOTION)
+        queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell"), PRESS)
+
+        queue.async_start()
+        for _ in range(4):
+            await asyncio.sleep(0)
+        await queue.async_stop()
+
+        assert processed == ["binary_sensor.doorbell", "binary_sensor.porch_motion"]
+
+    run(test)
+
+
+def test_full_queue_drops_lowest_priority(run):
+    """A full queue makes room for a press by dropping motion, not the reverse."""
+
+    async def test(hass):
+        async def handler(entity_id, state):
+            pass
+
+        dropped = []
+        queue = DoorbellTriggerQueue(hass, handler, max_size=1, on_drop=dropped.append)
+        queue.async_submit("binary_sensor.porch_motion", _state("binary_sensor.porch_motion"), MOTION)
+
+        assert queue.async_submit("binary_sensor.doorbell", _state("binary_sensor.doorbell"), PRESS) == RESULT_QUEUED
+        assert queue.async_submit("binary_sensor.gate_motion", _state("binary_sensor.gate_motion"), MOTION) == RESULT_OVERFLOW
+        assert queue._pending.keys() == {"binary_sensor.doorbell"}
+        assert queue.get_statistics()["triggers_overflowed"] == 2
+        # Only the trigger that was waiting is reported, the rejected one never queued
+        assert dropped == ["binary_sensor.porch_motion"]
+
+    run(test)
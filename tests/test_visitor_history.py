@@ -0,0 +1,28 @@
+"""Tests for the recent visitor image history."""
+from __future__ import annotations
+
+from custom_components.whorang.const import STORAGE_KEY_VISITOR_HISTORY
+from custom_components.whorang.visitor_history import VisitorImageHistory
+
+
+async def _no_image(image_url):
+    return None
+
+
+def test_entries_keep_separate_histories(run, tmp_path):
+    """Entries sharing a backend restore only their own visitors."""
+
+    async def test(hass):
+        hass.storage[f"{STORAGE_KEY_VISITOR_HISTORY}.first"] = {
+            "visitors": [{"visitor_id": "1", "image_url": "/uploads/1.jpg"}]
+        }
+        first = VisitorImageHistory(hass, _no_image, "first", thumbnail_dir=tmp_path / "first")
+        second = VisitorImageHistory(hass, _no_image, "second", thumbnail_dir=tmp_path / "second")
+        await first.async_load()
+        await second.async_load()
+
+        assert [visitor["visitor_id"] for visitor in first.get_visitors()] == ["1"]
+        assert second.get_visitors() == []
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["first", "second"]
+
+    run(test)
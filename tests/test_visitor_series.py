@@ -0,0 +1,74 @@
+"""Tests for the visitor event time series."""
+from __future__ import annotations
+
+from custom_components.whorang.const import STORAGE_KEY_VISITOR_SERIES
+from custom_components.whorang.visitor_series import (
+    LABEL_SERVICE_CALL,
+    LABEL_UNKNOWN,
+    VisitorTimeSeries,
+)
+
+NOW = 1_700_000_000.0
+
+
+def test_two_rings_in_window_count_two_visitors(run):
+    """Each backend visitor replaces its own pending service call."""
+
+    async def test(hass):
+        series = VisitorTimeSeries(hass, "entry")
+        series.async_record(NOW, LABEL_SERVICE_CALL)
+        series.async_record(NOW + 30, LABEL_SERVICE_CALL)
+
+        assert series.async_record(NOW + 2, LABEL_UNKNOWN, "first")
+        assert series.async_record(NOW + 32, LABEL_UNKNOWN, "second")
+
+        assert len(series) == 2
+        assert series._data_to_save()["timestamps"] == [NOW + 2, NOW + 32]
+
+    run(test)
+
+
+def test_visitor_outside_window_is_counted(run):
+    """A visitor long after a service call is not taken to be its visitor."""
+
+    async def test(hass):
+        series = VisitorTimeSeries(hass, "entry")
+        series.async_record(NOW, LABEL_SERVICE_CALL)
+
+        assert series.async_record(NOW + 600, LABEL_UNKNOWN, "later")
+        assert len(series) == 2
+        assert not series._provisional_slots
+
+    run(test)
+
+
+def test_replays_deduplicated_by_visitor_id(run):
+    """A visitor seen again is ignored, an older but new visitor is counted."""
+
+    async def test(hass):
+        series = VisitorTimeSeries(hass, "entry")
+        assert series.async_record(NOW, LABEL_UNKNOWN, "first")
+
+        assert not series.async_record(NOW, LABEL_UNKNOWN, "first")
+        # Delivered late, older than the newest event but never counted
+        assert series.async_record(NOW - 5, LABEL_UNKNOWN, "late")
+        assert len(series) == 2
+
+    run(test)
+
+
+def test_replay_after_restart_not_counted(run):
+    """Counted visitor ids are stored with the events."""
+
+    async def test(hass):
+        series = VisitorTimeSeries(hass, "entry")
+        series.async_record(NOW, LABEL_UNKNOWN, "first")
+        hass.storage[f"{STORAGE_KEY_VISITOR_SERIES}.entry"] = series._data_to_save()
+
+        restored = VisitorTimeSeries(hass, "entry")
+        await restored.async_load()
+
+        assert not restored.async_record(NOW, LABEL_UNKNOWN, "first")
+        assert len(restored) == 1
+
+    run(test)
@@ -97,9 +97,10 @@ class AnalysisController {
    * Process analysis directly (for programmatic calls)
    * @param {number} visitor_id - ID of visitor to analyze
    * @param {Object} aiTemplateConfig - AI template configuration
+   * @param {string|null} correlationId - Correlation id echoed in the WebSocket events
    * @returns {Promise<Object>} Analysis result
    */
-  async processAnalysisDirectly(visitor_id, aiTemplateConfig = null) {
+  async processAnalysisDirectly(visitor_id, aiTemplateConfig = null, correlationId = null) {
     const db = this.databaseManager.getDatabase();
     
     try {
@@ -128,7 +129,7 @@ class AnalysisController {
       console.log(`Processing direct analysis for visitor ${targetVisitor.id}`);
       
       // Process analysis using existing private method with AI template config
-      const result = await AnalysisController._processVisitorAnalysis(targetVisitor, aiTemplateConfig);
+      const result = await this._processVisitorAnalysis(targetVisitor, aiTemplateConfig, correlationId);
       
       return {
         success: true,
@@ -147,7 +148,7 @@ class AnalysisController {
    * Process AI analysis for a visitor
    * @private
    */
-  async _processVisitorAnalysis(visitor, aiTemplateConfig = null) {
+  async _processVisitorAnalysis(visitor, aiTemplateConfig = null, correlationId = null) {
     const db = this.databaseManager.getDatabase();
     
     try {
@@ -231,6 +232,7 @@ class AnalysisController {
           type: 'ai_analysis_complete',
           data: {
             visitor_id: visitor.id,
+            correlation_id: correlationId,
             ai_provider: aiProvider,
             faces_detected: analysisResults.faces_detected || 0,
             objects_detected: analysisResults.objects_detected?.length || 0,
@@ -272,6 +274,7 @@ class AnalysisController {
           type: 'ai_analysis_error',
           data: {
             visitor_id: visitor.id,
+            correlation_id: correlationId,
             error: error.message
           }
         });
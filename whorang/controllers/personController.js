@@ -135,6 +135,64 @@ class PersonController {
     }
   }
 
+  // Merge another person into this one in a single transaction
+  mergePerson(req, res) {
+    const db = this.databaseManager.getDatabase();
+    const targetId = parseInt(req.params.id);
+    const sourceId = parseInt(req.body.source_person_id);
+    
+    if (!sourceId) {
+      return res.status(400).json({ error: 'source_person_id is required' });
+    }
+    
+    if (sourceId === targetId) {
+      return res.status(400).json({ error: 'Source and target person must be different' });
+    }
+    
+    try {
+      const personStmt = db.prepare('SELECT * FROM persons WHERE id = ?');
+      if (!personStmt.get(targetId)) {
+        return res.status(404).json({ error: 'Target person not found' });
+      }
+      if (!personStmt.get(sourceId)) {
+        return res.status(404).json({ error: 'Source person not found' });
+      }
+      
+      const merge = db.transaction(() => {
+        const faces = db.prepare(`
+          UPDATE detected_faces 
+          SET person_id = ?, assigned_manually = 1, assigned_at = CURRENT_TIMESTAMP
+          WHERE person_id = ?
+        `).run(targetId, sourceId);
+        
+        const encodings = db.prepare('UPDATE face_encodings SET person_id = ? WHERE person_id = ?')
+          .run(targetId, sourceId);
+        
+        db.prepare('UPDATE person_visitor_events SET person_id = ? WHERE person_id = ?')
+          .run(targetId, sourceId);
+        
+        db.prepare('UPDATE persons SET updated_at = CURRENT_TIMESTAMP WHERE id = ?').run(targetId);
+        
+        db.prepare('DELETE FROM persons WHERE id = ?').run(sourceId);
+        
+        return { faces_moved: faces.changes, encodings_moved: encodings.changes };
+      });
+      
+      const result = merge();
+      
+      res.json({
+        success: true,
+        source_person_id: sourceId,
+        target_person_id: targetId,
+        ...result,
+        person: personStmt.get(targetId)
+      });
+    } catch (err) {
+      console.error('Error merging persons:', err);
+      res.status(500).json({ error: err.message });
+    }
+  }
+
   // Get person avatar (best quality face image)
   getPersonAvatar(req, res) {
     const db = this.databaseManager.getDatabase();
@@ -22,6 +22,7 @@ function createFacesRouter(dependencies) {
   router.post('/persons', personController.createPerson.bind(personController));
   router.put('/persons/:id', personController.updatePerson.bind(personController));
   router.delete('/persons/:id', personController.deletePerson.bind(personController));
+  router.post('/persons/:id/merge', personController.mergePerson.bind(personController));
 
   // Face recognition configuration routes
   router.get('/config', faceConfigController.getConfig.bind(faceConfigController));
@@ -1,3 +1,4 @@
+const path = require('path');
 const express = require('express');
 const multer = require('multer');
 const { v4: uuidv4 } = require('uuid');
@@ -7,6 +8,12 @@ const faceProcessingService = require('../services/faceProcessing');
 
 // Helper functions (remain at module level as they don't depend on router/upload state)
 
+// Correlation id of the Home Assistant trace, echoed in the WebSocket events
+function correlationIdFrom(req) {
+  const value = req.get('X-Correlation-ID') || (req.body && req.body.correlation_id);
+  return typeof value === 'string' && /^[\w-]{1,64}$/.test(value) ? value : null;
+}
+
 // Parse weather data from JSON string
 function parseWeatherData(weatherString) {
   if (!weatherString) return null;
@@ -37,19 +44,31 @@ function shouldAutoAnalyze() {
   return process.env.AUTO_ANALYSIS_ENABLED !== 'false';
 }
 
+// Public URL of a stored upload, relative to the directory served at /uploads
+function uploadedFileUrl(uploadsBasePath, filePath) {
+  const relativePath = path.relative(uploadsBasePath, filePath).split(path.sep).join('/');
+  return `/uploads/${relativePath}`;
+}
+
 /**
  * Creates and configures the webhook router and middleware.
- * This factory function ensures that multer is initialized with the correct,
- * dynamically provided path before any routes are defined.
+ * Uploaded snapshots are stored in the faces directory of the directory
+ * manager, which is served under /uploads.
  *
- * @param {string} uploadsPath - The absolute path for storing file uploads.
+ * @param {object} dependencies - Shared server dependencies (directoryManager, databaseManager, configManager).
  * @returns {{router: object, handleCustomWebhookPaths: Function}}
  */
-module.exports = (uploadsPath) => {
+module.exports = (dependencies) => {
+  const { directoryManager, databaseManager, configManager } = dependencies;
   const router = express.Router();
   
-  // Initialize multer with the dynamically provided uploads path
-  const upload = multer({ dest: uploadsPath });
+  // Resolve the directory per upload so the directory manager's fallback applies
+  const upload = multer({
+    storage: multer.diskStorage({
+      destination: (req, file, cb) => cb(null, directoryManager.getFacesPath()),
+      filename: (req, file, cb) => cb(null, `${uuidv4()}${path.extname(file.originalname || '') || '.jpg'}`)
+    })
+  });
 
   // Webhook handler function
   function handleWebhookEvent(req, res) {
@@ -60,6 +79,8 @@ module.exports = (uploadsPath) => {
       weather, 
       device_name,
       image_url,
+      // Short-lived download URL for the image, image_url is what gets stored
+      image_download_url,
       weather_temperature,
       weather_humidity,
       weather_condition,
@@ -94,7 +115,9 @@ module.exports = (uploadsPath) => {
       timestamp: new Date().toISOString(),
       ai_message,
       ai_title: ai_title || null,
-      image_url: req.file ? `/uploads/${req.file.filename}` : (image_url || '/placeholder.svg'),
+      image_url: req.file
+        ? uploadedFileUrl(directoryManager.getEffectiveBasePath(), req.file.path)
+        : (image_url || '/placeholder.svg'),
       location,
       weather: finalWeatherCondition || weather || null,
       weather_temperature: finalWeatherTemp,
@@ -137,10 +160,14 @@ module.exports = (uploadsPath) => {
         newEvent.device_name, newEvent.weather_wind_speed, newEvent.weather_pressure
       );
       
-      const eventWithId = { ...newEvent, id: info.lastInsertRowid };
+      const correlationId = correlationIdFrom(req);
+      const eventWithId = { ...newEvent, id: info.lastInsertRowid, correlation_id: correlationId };
       
       // Process face detection in the background
-      const fullImageUrl = req.protocol + '://' + req.get('host') + eventWithId.image_url;
+      const fullImageUrl = image_download_url
+        || (/^https?:\/\//.test(eventWithId.image_url)
+          ? eventWithId.image_url
+          : req.protocol + '://' + req.get('host') + eventWithId.image_url);
       faceProcessingService.queueForProcessing(eventWithId.id, fullImageUrl)
         .then(result => console.log('Face processing queued for visitor:', eventWithId.id, result))
         .catch(error => console.error('Face processing queue error:', error));
@@ -153,7 +180,8 @@ module.exports = (uploadsPath) => {
         const aiTemplateConfig = {
           ai_prompt_template: ai_prompt_template || 'professional',
           custom_ai_prompt: custom_ai_prompt || '',
-          enable_weather_context: enable_weather_context !== false
+          // Multipart uploads send booleans as strings
+          enable_weather_context: enable_weather_context !== false && enable_weather_context !== 'false'
         };
         
         console.log('Using AI template configuration:', aiTemplateConfig);
@@ -166,6 +194,7 @@ module.exports = (uploadsPath) => {
               type: 'analysis_started',
               data: { 
                 visitor_id: eventWithId.id,
+                correlation_id: correlationId,
                 image_url: fullImageUrl,
                 timestamp: new Date().toISOString(),
                 ai_template: aiTemplateConfig.ai_prompt_template
@@ -174,7 +203,9 @@ module.exports = (uploadsPath) => {
             
             const AnalysisController = require('../controllers/analysisController');
             const analysisController = new AnalysisController(databaseManager, configManager, broadcast);
-            const result = await analysisController.processAnalysisDirectly(eventWithId.id, aiTemplateConfig);
+            const result = await analysisController.processAnalysisDirectly(
+              eventWithId.id, aiTemplateConfig, correlationId
+            );
             
             console.log('Automatic analysis completed for visitor:', eventWithId.id);
             
@@ -183,6 +214,7 @@ module.exports = (uploadsPath) => {
               type: 'analysis_complete',
               data: {
                 visitor_id: eventWithId.id,
+                correlation_id: correlationId,
                 analysis: result.analysis || 'Analysis completed',
                 confidence: result.confidence || 0,
                 faces_detected: result.faces_detected || 0,
@@ -201,6 +233,7 @@ module.exports = (uploadsPath) => {
               type: 'analysis_error',
               data: {
                 visitor_id: eventWithId.id,
+                correlation_id: correlationId,
                 error: error.message,
                 timestamp: new Date().toISOString()
               }